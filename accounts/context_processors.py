@@ -0,0 +1,11 @@
+from django.conf import settings
+
+
+def fragment_cache(request):
+    """Version that cached template fragments (the role sidebars) are keyed on."""
+    return {"fragment_version": settings.TEMPLATE_FRAGMENT_VERSION}
+
+
+def live_updates(request):
+    """Whether pages should open the live-update stream (ASGI deployments only)."""
+    return {"live_updates": settings.LIVE_UPDATES}
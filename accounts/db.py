@@ -0,0 +1,39 @@
+"""
+Write transactions that take SQLite's write lock up front.
+
+SQLITE_PRODUCTION_OPTIONS leaves transactions DEFERRED, so atomic() blocks
+that only read never queue behind the writer. A DEFERRED transaction that
+reads and then writes has to upgrade its lock half-way, and in WAL mode that
+fails at once with "database is locked" when another writer committed in
+between, whatever busy_timeout says. Wrap such blocks in ``write_atomic``
+instead: on SQLite the outermost one begins with BEGIN IMMEDIATE and waits
+its turn on busy_timeout. It is plain atomic() elsewhere and when nested.
+
+    with write_atomic():
+        if JobPosting.objects.open().filter(pk=pk).exists():
+            Application.objects.create(...)
+"""
+from contextlib import contextmanager
+
+from django.db import transaction
+
+
+@contextmanager
+def write_atomic(using=None):
+    connection = transaction.get_connection(using)
+    if connection.vendor != 'sqlite' or connection.in_atomic_block:
+        with transaction.atomic(using=using):
+            yield
+        return
+    # Connecting (or reconnecting) sets transaction_mode from the settings,
+    # so connect before saving and overriding it.
+    connection.ensure_connection()
+    mode = connection.transaction_mode
+    connection.transaction_mode = 'IMMEDIATE'
+    try:
+        # The SQLite backend issues BEGIN on entering the outermost block.
+        with transaction.atomic(using=using):
+            connection.transaction_mode = mode
+            yield
+    finally:
+        connection.transaction_mode = mode
@@ -0,0 +1,50 @@
+"""
+Keep a local SQLite read replica in sync with the primary.
+
+    python manage.py sync_replica           # copy once
+    python manage.py sync_replica --loop    # copy every --interval seconds
+
+Uses SQLite's online backup API. The primary stays writable during the
+copy, and readers of the replica wait on its busy timeout while pages are
+replaced. The replica lags by at most one interval plus the copy time, so
+keep REPLICA_PIN_SECONDS above that. Stand-in for real replication in
+development and tests only.
+"""
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.replicas import replica_alias
+
+
+class Command(BaseCommand):
+    help = "Copy the primary SQLite database into the replica alias with the backup API."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep copying.")
+        parser.add_argument("--interval", type=float, default=2.0, help="Seconds between copies in --loop mode.")
+        parser.add_argument("--pages", type=int, default=1024, help="Pages copied per backup step.")
+
+    def handle(self, *args, loop, interval, pages, **options):
+        alias = replica_alias()
+        if alias is None:
+            raise CommandError(f"No {settings.REPLICA_DATABASE!r} database configured.")
+        primary, replica = settings.DATABASES["default"], settings.DATABASES[alias]
+        for config in (primary, replica):
+            if config["ENGINE"] != "django.db.backends.sqlite3":
+                raise CommandError("sync_replica only copies SQLite databases.")
+        while True:
+            started = time.perf_counter()
+            source = sqlite3.connect(primary["NAME"])
+            target = sqlite3.connect(replica["NAME"], timeout=20)
+            try:
+                source.backup(target, pages=pages)
+            finally:
+                target.close()
+                source.close()
+            self.stdout.write(f"Replica synced in {(time.perf_counter() - started) * 1000:.0f} ms")
+            if not loop:
+                break
+            time.sleep(interval)
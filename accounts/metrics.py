@@ -0,0 +1,207 @@
+"""
+Per-view performance metrics, exposed at ``/metrics`` in Prometheus text
+format.
+
+``MetricsMiddleware`` times each request and labels it with the resolved
+URL name. It collects:
+- the latency histogram;
+- response status classes;
+- response bytes;
+- SQL query count and time, through ``execute_wrapper`` on every database
+  connection;
+- template render time, from wrapping the Django template backend's
+  ``render``.
+
+Aggregates live in this process behind one lock, so a scrape shows what
+this worker served. Scrape each worker, or run the single ASGI worker that
+live updates already need. Per request, the cost is a few clock reads and
+one locked dict update; METRICS_ENABLED = False removes the middleware
+entirely. Only METRICS_ALLOWED_IPS may fetch ``/metrics``.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import Http404, HttpResponse
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNRESOLVED = '<unresolved>'
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_current = ContextVar('metrics_request', default=None)
+
+
+class _RequestStats:
+    __slots__ = ('queries', 'sql_seconds', 'template_seconds')
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.template_seconds = 0.0
+
+
+class _ViewStats:
+    __slots__ = ('buckets', 'count', 'latency', 'queries', 'sql_seconds', 'template_seconds', 'bytes', 'statuses')
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.latency = 0.0
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.template_seconds = 0.0
+        self.bytes = 0
+        self.statuses = {}
+
+
+def _label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def observe(self, view, latency, request_stats, size, status):
+        status_class = f"{status // 100}xx"
+        with self._lock:
+            stats = self._views.get(view)
+            if stats is None:
+                stats = self._views[view] = _ViewStats()
+            stats.buckets[bisect_left(LATENCY_BUCKETS, latency)] += 1
+            stats.count += 1
+            stats.latency += latency
+            stats.queries += request_stats.queries
+            stats.sql_seconds += request_stats.sql_seconds
+            stats.template_seconds += request_stats.template_seconds
+            stats.bytes += size
+            stats.statuses[status_class] = stats.statuses.get(status_class, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+    def render(self):
+        with self._lock:
+            views = sorted(self._views.items())
+            snapshot = [
+                (view, list(s.buckets), s.count, s.latency, s.queries, s.sql_seconds, s.template_seconds,
+                 s.bytes, sorted(s.statuses.items()))
+                for view, s in views
+            ]
+        lines = [
+            '# HELP cpms_request_duration_seconds Request latency by view.',
+            '# TYPE cpms_request_duration_seconds histogram',
+        ]
+        for view, buckets, count, latency, *_ in snapshot:
+            label = _label(view)
+            cumulative = 0
+            for bound, hits in zip(LATENCY_BUCKETS, buckets):
+                cumulative += hits
+                lines.append(f'cpms_request_duration_seconds_bucket{{view="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'cpms_request_duration_seconds_bucket{{view="{label}",le="+Inf"}} {count}')
+            lines.append(f'cpms_request_duration_seconds_sum{{view="{label}"}} {latency:.6f}')
+            lines.append(f'cpms_request_duration_seconds_count{{view="{label}"}} {count}')
+        counters = [
+            ('cpms_responses_total', 'Responses by view and status class.', None),
+            ('cpms_db_queries_total', 'SQL queries run by view.', 4),
+            ('cpms_db_query_seconds_total', 'Time spent in SQL by view.', 5),
+            ('cpms_template_render_seconds_total', 'Time spent rendering templates by view.', 6),
+            ('cpms_response_bytes_total', 'Response body bytes by view (streaming responses excluded).', 7),
+        ]
+        for name, help_text, index in counters:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} counter')
+            for row in snapshot:
+                label = _label(row[0])
+                if index is None:
+                    for status_class, hits in row[8]:
+                        lines.append(f'{name}{{view="{label}",status="{status_class}"}} {hits}')
+                else:
+                    value = row[index]
+                    value = f'{value:.6f}' if isinstance(value, float) else value
+                    lines.append(f'{name}{{view="{label}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+
+def _time_query(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.sql_seconds += time.perf_counter() - started
+
+
+_instrumented = False
+
+
+def _instrument_templates():
+    global _instrumented
+    if _instrumented:
+        return
+    from django.template.backends.django import Template
+
+    original = Template.render
+
+    @wraps(original)
+    def render(self, context=None, request=None):
+        stats = _current.get()
+        if stats is None:
+            return original(self, context, request)
+        started = time.perf_counter()
+        try:
+            return original(self, context, request)
+        finally:
+            stats.template_seconds += time.perf_counter() - started
+
+    Template.render = render
+    _instrumented = True
+
+
+class MetricsMiddleware:
+    """Record per-view metrics; list it first so the latency covers the whole stack."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        _instrument_templates()
+
+    def __call__(self, request):
+        stats = _RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(_time_query))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        latency = time.perf_counter() - started
+        match = request.resolver_match
+        view = match.view_name if match else UNRESOLVED
+        if view != 'metrics':
+            size = 0 if response.streaming else len(response.content)
+            REGISTRY.observe(view, latency, stats, size, response.status_code)
+        return response
+
+
+def metrics_view(request):
+    if request.META.get('REMOTE_ADDR') not in getattr(settings, 'METRICS_ALLOWED_IPS', ()):
+        raise Http404
+    return HttpResponse(REGISTRY.render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,133 @@
+"""
+Per-view rate limiting for expensive endpoints.
+
+RATE_LIMITS maps a URL name to the rates allowed per signed-in user and
+per client IP:
+
+    RATE_LIMITS = {
+        'student:job_detail': {'methods': ['POST'], 'user': '10/m', 'ip': '60/m'},
+        'student:job_search': {'params': ['search'], 'user': '30/m'},
+    }
+
+``methods`` and ``params`` (any of these query parameters non-empty)
+narrow which requests count. Each bucket holds up to N tokens and refills
+N per period. The shared cache only offers atomic ``incr``, not
+compare-and-set, so the bucket is kept as two adjacent fixed-window
+counters. The previous window's count is weighted by how much of it still
+overlaps the sliding period. That keeps every check to a single atomic
+increment per bucket plus one ``get_many``, and it is safe across workers
+when RATE_LIMIT_CACHE is a shared backend (Redis, Memcached). Requests
+over the limit get ``429 Too Many Requests`` with ``Retry-After``. They are
+not counted, so a client that backs off is let through as soon as the
+window allows.
+"""
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.shortcuts import render
+
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+KEY_PREFIX = 'rl'
+
+
+def parse_rate(rate):
+    """'10/m' -> (10, 60)."""
+    count, _, period = rate.partition('/')
+    return int(count), PERIODS[period]
+
+
+def _compile(config):
+    rules = {}
+    for view_name, rule in config.items():
+        rules[view_name] = {
+            'methods': frozenset(method.upper() for method in rule.get('methods', ())),
+            'params': tuple(rule.get('params', ())),
+            'scopes': [(scope, *parse_rate(rule[scope])) for scope in ('user', 'ip') if rule.get(scope)],
+        }
+    return rules
+
+
+def client_ip(request):
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _hit(cache, key, ttl):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        if cache.add(key, 1, ttl):
+            return 1
+        return cache.incr(key)
+
+
+def check(cache, buckets, now=None):
+    """Count one request against each (key, limit, period) bucket.
+
+    Returns 0 if the request is allowed, otherwise the seconds to wait.
+    """
+    now = now or time.time()
+    windows = []
+    for key, limit, period in buckets:
+        window, elapsed = divmod(now, period)
+        window = int(window)
+        windows.append((f"{key}:{window}", f"{key}:{window - 1}", limit, period, elapsed / period))
+    previous = cache.get_many([prev_key for _, prev_key, _, _, _ in windows])
+    counted = []
+    retry_after = 0
+    for current_key, prev_key, limit, period, fraction in windows:
+        current = _hit(cache, current_key, period * 2)
+        counted.append(current_key)
+        prev = previous.get(prev_key, 0)
+        if prev * (1 - fraction) + current <= limit:
+            continue
+        if current > limit or not prev:
+            wait = (1 - fraction) * period
+        else:
+            # The previous window's weight has to decay until this request fits.
+            wait = ((1 - (limit - current) / prev) - fraction) * period
+        retry_after = max(retry_after, math.ceil(wait), 1)
+    if retry_after:
+        for key in counted:
+            cache.decr(key)
+    return retry_after
+
+
+class RateLimitMiddleware:
+    """Apply RATE_LIMITS by URL name; place after AuthenticationMiddleware."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.rules = _compile(getattr(settings, 'RATE_LIMITS', {}))
+        self.cache = caches[getattr(settings, 'RATE_LIMIT_CACHE', 'default')]
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_name = request.resolver_match.view_name
+        rule = self.rules.get(view_name)
+        if rule is None:
+            return None
+        if rule['methods'] and request.method not in rule['methods']:
+            return None
+        if rule['params'] and not any(request.GET.get(param) for param in rule['params']):
+            return None
+        buckets = []
+        for scope, limit, period in rule['scopes']:
+            if scope == 'user':
+                if not request.user.is_authenticated:
+                    continue
+                ident = request.user.pk
+            else:
+                ident = client_ip(request)
+            buckets.append((f"{KEY_PREFIX}:{view_name}:{scope}:{ident}", limit, period))
+        if not buckets:
+            return None
+        retry_after = check(self.cache, buckets)
+        if not retry_after:
+            return None
+        response = render(request, 'errors/429.html', {'retry_after': retry_after}, status=429)
+        response['Retry-After'] = str(retry_after)
+        return response
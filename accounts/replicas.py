@@ -0,0 +1,111 @@
+"""
+Read-replica routing for read-heavy views.
+
+Views opt in with ``@read_replica``. Their ORM reads go to the
+REPLICA_DATABASE alias, and all writes go to the primary. Routing is
+lag-aware:
+
+* once a request writes anything (``ReplicaPinMiddleware`` watches the
+  primary's INSERT/UPDATE/DELETE statements), the rest of it reads from
+  the primary;
+* the middleware also sets a short-lived cookie after any request that
+  wrote (or used an unsafe method), so for the next REPLICA_PIN_SECONDS the
+  same client keeps reading its own writes from the primary. Keep it above
+  the replica's usual lag.
+
+Sessions always come from the primary, so a fresh login is never lost to
+a stale replica. Without a replica alias in DATABASES everything stays on
+the primary. Locally, a second SQLite file kept current with
+``manage.py sync_replica --loop`` (SQLite's online backup API) stands in
+for a real replica.
+
+Querysets outside decorated views can be sent to the replica explicitly:
+``Application.objects.using(read_alias())``.
+"""
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PIN_COOKIE = 'cpms_primary'
+PRIMARY_ONLY_APPS = {'sessions'}
+SAFE_METHODS = {'GET', 'HEAD', 'OPTIONS', 'TRACE'}
+WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+_replica_reads = ContextVar('replica_reads', default=False)
+_pinned = ContextVar('replica_pinned', default=False)
+_wrote = ContextVar('replica_wrote', default=False)
+
+
+def replica_alias():
+    """The configured replica alias, or None when there is no replica."""
+    alias = getattr(settings, 'REPLICA_DATABASE', None)
+    return alias if alias and alias in settings.DATABASES else None
+
+
+def read_alias():
+    """Alias to read from right now: the replica unless this request is pinned to the primary."""
+    alias = replica_alias()
+    return alias if alias and not _pinned.get() else DEFAULT_DB_ALIAS
+
+
+def read_replica(view_func):
+    """Serve this view's reads from the replica (when there is one and the client is not pinned)."""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        token = _replica_reads.set(True)
+        try:
+            return view_func(request, *args, **kwargs)
+        finally:
+            _replica_reads.reset(token)
+    return wrapper
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if not _replica_reads.get() or _pinned.get() or model._meta.app_label in PRIMARY_ONLY_APPS:
+            return None
+        return replica_alias()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        # The replica is a copy of the primary, never migrated on its own.
+        return False if db == replica_alias() else None
+
+
+def _track_writes(execute, sql, params, many, context):
+    # Read your own writes: after any write, the rest of the request reads from the primary.
+    if sql.startswith(WRITE_STATEMENTS):
+        _pinned.set(True)
+        _wrote.set(True)
+    return execute(sql, params, many, context)
+
+
+class ReplicaPinMiddleware:
+    """Pin clients that just wrote to the primary for REPLICA_PIN_SECONDS."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if replica_alias() is None:
+            return self.get_response(request)
+        pinned = _pinned.set(PIN_COOKIE in request.COOKIES)
+        wrote = _wrote.set(False)
+        try:
+            with connections[DEFAULT_DB_ALIAS].execute_wrapper(_track_writes):
+                response = self.get_response(request)
+            pin = _wrote.get() or request.method not in SAFE_METHODS
+        finally:
+            _pinned.reset(pinned)
+            _wrote.reset(wrote)
+        if pin:
+            seconds = getattr(settings, 'REPLICA_PIN_SECONDS', 5)
+            response.set_cookie(PIN_COOKIE, '1', max_age=seconds, httponly=True, samesite='Lax')
+        return response
@@ -0,0 +1,173 @@
+"""
+Production static files: content-hashed names, precompressed variants and
+in-process serving with long-lived caching.
+
+``CompressedManifestStaticFilesStorage`` is Django's manifest storage
+(``site.css`` -> ``site.4f1c2a9b.css``, with references inside CSS
+rewritten). It also writes ``.gz`` and, when the optional ``brotli``
+package is installed, ``.br`` next to every text asset during
+``collectstatic``, so nothing is compressed per request.
+
+``StaticFilesMiddleware`` serves STATIC_ROOT directly from the
+application process when STATIC_SERVE is on, so no separate web server
+is needed. It indexes the collected files once at startup. Each request
+gets the smallest variant the client accepts (br, then gzip, then the
+file itself). Hashed names are sent with ``Cache-Control: immutable``
+for a year, because a changed file gets a new name. The unhashed
+originals are sent with a short max-age and an ETag. Run
+``collectstatic`` before starting workers; files added later are only
+seen after a restart.
+"""
+import gzip
+import mimetypes
+import os
+from email.utils import formatdate
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse, HttpResponseNotAllowed
+
+try:
+    import brotli
+except ImportError:  # optional: without it only gzip variants are written
+    brotli = None
+
+COMPRESSIBLE = ('.css', '.js', '.mjs', '.map', '.svg', '.json', '.txt', '.html', '.xml', '.ico')
+MIN_SIZE = 200
+# Keep a variant only when it saves at least this fraction of the original.
+MIN_SAVING = 0.05
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'public, max-age=60'
+
+
+def _compress(data):
+    yield '.gz', gzip.compress(data, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield '.br', brotli.compress(data, quality=11)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def post_process(self, paths, dry_run=False, **options):
+        hashed = []
+        for name, hashed_name, processed in super().post_process(paths, dry_run, **options):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed.append(hashed_name)
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        # Hashed names are content-addressed, so existing variants are still current.
+        for name in dict.fromkeys(hashed):
+            self._write_variants(name, skip_existing=True)
+        for name in paths:
+            self._write_variants(name, skip_existing=False)
+
+    def _write_variants(self, name, skip_existing):
+        if not name.endswith(COMPRESSIBLE) or not self.exists(name):
+            return
+        path = self.path(name)
+        if skip_existing and os.path.exists(path + '.gz'):
+            return
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < MIN_SIZE:
+            return
+        for suffix, compressed in _compress(data):
+            if len(compressed) <= len(data) * (1 - MIN_SAVING):
+                with open(path + suffix, 'wb') as f:
+                    f.write(compressed)
+            elif os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+class _StaticFile:
+    __slots__ = ('path', 'size', 'content_type', 'etag', 'last_modified', 'cache_control', 'variants')
+
+    def __init__(self, path, stat, immutable, variants):
+        self.path = path
+        self.size = stat.st_size
+        self.content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        if self.content_type.startswith('text/') or self.content_type == 'application/json':
+            self.content_type += '; charset=utf-8'
+        # Weak, so it stays valid whichever encoding is sent.
+        self.etag = f'W/"{int(stat.st_mtime):x}-{stat.st_size:x}"'
+        self.last_modified = formatdate(stat.st_mtime, usegmt=True)
+        self.cache_control = IMMUTABLE if immutable else REVALIDATE
+        self.variants = variants
+
+
+def _accepted_encodings(header):
+    accepted = set()
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        q = params.strip()
+        if q.startswith('q=') and q[2:].strip() in ('0', '0.0', '0.00', '0.000'):
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+
+class StaticFilesMiddleware:
+    """Serve collected static files; list it right after SecurityMiddleware."""
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'STATIC_SERVE', False) or not settings.STATIC_ROOT:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.prefix = '/' + settings.STATIC_URL.lstrip('/')
+        self.files = self._index(str(settings.STATIC_ROOT))
+
+    def _index(self, root):
+        hashed = set(CompressedManifestStaticFilesStorage(location=root).hashed_files.values())
+        files = {}
+        for directory, _, names in os.walk(root):
+            present = set(names)
+            for name in names:
+                if name.endswith(('.gz', '.br')) and name[:-3] in present:
+                    continue
+                path = os.path.join(directory, name)
+                relative = os.path.relpath(path, root).replace(os.sep, '/')
+                variants = [
+                    (encoding, path + suffix, os.path.getsize(path + suffix))
+                    for encoding, suffix in ENCODINGS if name + suffix in present
+                ]
+                files[relative] = _StaticFile(path, os.stat(path), relative in hashed, variants)
+        return files
+
+    def __call__(self, request):
+        if not request.path_info.startswith(self.prefix):
+            return self.get_response(request)
+        static_file = self.files.get(request.path_info[len(self.prefix):])
+        if static_file is None:
+            return self.get_response(request)
+        if request.method not in ('GET', 'HEAD'):
+            return HttpResponseNotAllowed(['GET', 'HEAD'])
+        return self._serve(request, static_file)
+
+    def _serve(self, request, static_file):
+        if static_file.etag in request.META.get('HTTP_IF_NONE_MATCH', ''):
+            response = HttpResponse(status=304)
+        else:
+            path, size, encoding = static_file.path, static_file.size, None
+            accepted = _accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+            for variant_encoding, variant_path, variant_size in static_file.variants:
+                if variant_encoding in accepted:
+                    path, size, encoding = variant_path, variant_size, variant_encoding
+                    break
+            if request.method == 'HEAD':
+                response = HttpResponse(content_type=static_file.content_type)
+                response['Content-Length'] = size
+            else:
+                # Read the whole file: a streamed file iterator is synchronous, which
+                # Django buffers under ASGI anyway, with a warning per request.
+                with open(path, 'rb') as f:
+                    response = HttpResponse(f.read(), content_type=static_file.content_type)
+            if encoding:
+                response['Content-Encoding'] = encoding
+            response['Last-Modified'] = static_file.last_modified
+        if static_file.variants:
+            response['Vary'] = 'Accept-Encoding'
+        response['ETag'] = static_file.etag
+        response['Cache-Control'] = static_file.cache_control
+        return response
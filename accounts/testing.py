@@ -0,0 +1,323 @@
+"""
+Query budgets for portal views.
+
+``QueryBudgetMixin`` requests every named URL of one portal namespace,
+first with 10 rows behind each list the portal shows and again with
+1,000. Every view must have an entry in ``budgets``. The test fails if a
+view runs more queries than its budget, or runs a different number of
+queries at the two sizes; either one usually means a missing
+``select_related``/``prefetch_related`` (an N+1). The failure message groups the
+SQL of the larger run by call site: the template line or the innermost
+project code that issued it.
+
+    class StudentQueryBudgetTests(QueryBudgetMixin, TestCase):
+        namespace = 'student'
+        budgets = {'student:dashboard': 14, ...}
+
+Pages are requested cold (the cache is cleared first), so cached fragments
+do not hide their queries. ``bench_urls`` uses the same URL table.
+"""
+import sys
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.urls import get_resolver, reverse
+from django.utils import timezone
+
+from accounts import metrics, replicas
+from accounts.models import Profile
+from recruiter_portal.models import ApiToken, WebhookEndpoint
+from student_portal import ical
+from student_portal.models import (
+    Announcement, Application, Certification, Document, Interview, JobPosting, Message, MockInterview,
+    Notification, NotificationArchive, PortfolioItem, PracticeTest, Resume, SavedJob, Skill, SkillGapAnalysis,
+    StudentProfile, Thread, ThreadParticipant,
+)
+from student_portal.threads import snippet, thread_key
+
+NAMESPACES = ('student', 'tpo', 'recruiter')
+SKIP = {
+    'student:event_stream': 'long-lived event stream',
+    'recruiter:review_next': 'POST only',
+    'recruiter:api_jobs_import': 'POST only',
+}
+SKIP_SUFFIXES = ('_delete', '_revoke')
+
+
+def skip_reason(name):
+    """Why a URL is not requested by GET, or None."""
+    if name in SKIP:
+        return SKIP[name]
+    return 'destructive' if name.endswith(SKIP_SUFFIXES) else None
+
+
+def portal_urls(namespace):
+    """(URL name, parameter names) for each named URL in a portal namespace."""
+    for pattern in get_resolver().namespace_dict[namespace][1].url_patterns:
+        if getattr(pattern, 'name', None):
+            yield f"{namespace}:{pattern.name}", list(pattern.pattern.converters)
+
+
+def url_arguments(users):
+    """URL kwargs per view name, taken from the given student's, recruiter's and TPO's own data."""
+    student = StudentProfile.objects.get(user=users['student'])
+    application = Application.objects.filter(student=student).order_by('pk').first()
+    job = (
+        JobPosting.objects.filter(posted_by=users['recruiter'])
+        .annotate(n=Count('applications')).order_by('-n', 'pk').first()
+    )
+    job_applications = job.applications.order_by('pk') if job else Application.objects.none()
+    job_application = job_applications.first()
+    # Rescheduling an existing interview is the page's usual use.
+    interview_application = job_applications.filter(interview__isnull=False).first() or job_application
+    resume = student.resumes.order_by('pk').first()
+    thread = ThreadParticipant.objects.filter(user=users['student']).order_by('pk').first()
+    open_job = JobPosting.objects.open().order_by('pk').first() or JobPosting.objects.order_by('pk').first()
+    return {
+        'student:resume_edit': resume and {'pk': resume.pk},
+        'student:job_detail': open_job and {'pk': open_job.pk},
+        'student:application_detail': application and {'pk': application.pk},
+        'student:message_thread': thread and {'pk': thread.thread_id},
+        'student:calendar_feed': {'token': ical.get_or_create_feed(users['student']).token},
+        'tpo:student_detail': {'pk': student.pk},
+        'tpo:application_detail': application and {'pk': application.pk},
+        'recruiter:job_detail': job and {'pk': job.pk},
+        'recruiter:job_edit': job and {'pk': job.pk},
+        'recruiter:application_list': job and {'job_pk': job.pk},
+        'recruiter:application_detail': job_application and {'pk': job_application.pk},
+        'recruiter:schedule_interview': interview_application and {'pk': interview_application.pk},
+    }
+
+
+def create_portal_users():
+    """A student, a recruiter with one posting and a TPO, keyed by role."""
+    users = {}
+    for role in NAMESPACES:
+        users[role] = User.objects.create_user(f"budget_{role}", f"budget_{role}@example.edu")
+        Profile.objects.filter(user=users[role]).update(role=role)
+    student = StudentProfile.objects.create(
+        user=users['student'], enrollment_number='BUDGET0', branch='CSE', year='4th', cgpa=Decimal('8.50'),
+        graduation_year=2026,
+    )
+    Resume.objects.create(student=student, title='Campus Resume', content='Python, SQL', is_default=True)
+    JobPosting.objects.create(
+        title='Software Engineer', company_name='Acme', description='Build things.', requirements='Python',
+        posted_by=users['recruiter'], application_deadline=timezone.now() + timedelta(days=30),
+    )
+    subject = 'Your application'
+    thread = Thread.objects.create(key=thread_key(users['student'].pk, users['recruiter'].pk, subject), subject=subject)
+    ThreadParticipant.objects.bulk_create(
+        [ThreadParticipant(thread=thread, user=users[role]) for role in ('student', 'recruiter')]
+    )
+    return users
+
+
+def add_rows(users, n):
+    """Add n rows behind every list the three portals show to these users."""
+    student_user, recruiter, tpo = users['student'], users['recruiter'], users['tpo']
+    student = student_user.student_profile
+    now = timezone.now()
+    start = User.objects.count()
+
+    # Other students, each applying to (and interviewing for) the recruiter's first posting.
+    others = User.objects.bulk_create([User(username=f"budget_{start + i}") for i in range(n)])
+    Profile.objects.bulk_create([Profile(user=user, role=Profile.Role.STUDENT) for user in others])
+    profiles = StudentProfile.objects.bulk_create([
+        StudentProfile(user=user, enrollment_number=f"BUDGET{start + i}", branch='CSE', year='4th',
+                       cgpa=Decimal('7.50'), graduation_year=2026)
+        for i, user in enumerate(others)
+    ])
+    Skill.objects.bulk_create([Skill(student=profile, name='Python') for profile in profiles])
+    first_job = JobPosting.objects.filter(posted_by=recruiter).order_by('pk').first()
+    applications = Application.objects.bulk_create([Application(student=profile, job=first_job) for profile in profiles])
+
+    # New postings by the recruiter; the student applies to, saves and interviews for each.
+    jobs = JobPosting.objects.bulk_create([
+        JobPosting(title=f"Engineer {start + i}", company_name='Acme', description='Build things.',
+                   requirements='Python', posted_by=recruiter, application_deadline=now + timedelta(days=30))
+        for i in range(n)
+    ])
+    resume = student.resumes.order_by('pk').first()
+    own = Application.objects.bulk_create([Application(student=student, job=job, resume=resume) for job in jobs])
+    SavedJob.objects.bulk_create([SavedJob(student=student, job=job) for job in jobs])
+    Interview.objects.bulk_create([
+        Interview(application=application, scheduled_at=now + timedelta(days=7), status='scheduled')
+        for application in applications + own
+    ])
+
+    # The student's own records.
+    Skill.objects.bulk_create([Skill(student=student, name=f"Skill {start + i}") for i in range(n)])
+    Certification.objects.bulk_create([Certification(student=student, name=f"Cert {i}", issuer='Acme') for i in range(n)])
+    Resume.objects.bulk_create([Resume(student=student, title=f"Resume {i}", content='Python') for i in range(n)])
+    PortfolioItem.objects.bulk_create([PortfolioItem(student=student, title=f"Project {i}", description='A project') for i in range(n)])
+    Document.objects.bulk_create([
+        Document(student=student, name=f"Document {i}", document_type='other', file=f"student_documents/budget/{i}.pdf")
+        for i in range(n)
+    ])
+    SkillGapAnalysis.objects.bulk_create([
+        SkillGapAnalysis(student=student, required_skill=f"Skill {i}", required_level='advanced') for i in range(n)
+    ])
+    MockInterview.objects.bulk_create([MockInterview(student=student) for _ in range(n)])
+    PracticeTest.objects.bulk_create([PracticeTest(title=f"Test {i}", test_type='aptitude') for i in range(n)])
+
+    # Conversations: n new threads, and n more messages in the first one.
+    subjects = [f"Application {start + i}" for i in range(n)]
+    threads = Thread.objects.bulk_create([
+        Thread(key=thread_key(student_user.pk, recruiter.pk, subject), subject=subject, last_message_at=now,
+               last_snippet=snippet('Hello'), last_sender=recruiter)
+        for subject in subjects
+    ])
+    ThreadParticipant.objects.bulk_create([
+        ThreadParticipant(thread=thread, user=user, last_message_at=now, unread_count=1)
+        for thread in threads for user in (student_user, recruiter)
+    ])
+    first_thread = Thread.objects.filter(participants__user=student_user).order_by('pk').first()
+    Message.objects.bulk_create(
+        [Message(thread=thread, sender=recruiter, recipient=student_user, subject=thread.subject, body='Hello')
+         for thread in threads]
+        + [Message(thread=first_thread, sender=sender, recipient=recipient, subject=first_thread.subject, body='Hello')
+           for sender, recipient in [(recruiter, student_user), (student_user, recruiter)] * (n // 2)]
+    )
+
+    for user in (student_user, recruiter, tpo):
+        Notification.objects.bulk_create([
+            Notification(user=user, title=f"Update {i}", message='Something changed.', notification_type='reminder')
+            for i in range(n)
+        ])
+    NotificationArchive.objects.bulk_create([
+        NotificationArchive(user=student_user, title=f"Update {i}", message='Old news.', notification_type='reminder',
+                            created_at=now - timedelta(days=100))
+        for i in range(n)
+    ])
+    Announcement.objects.bulk_create([
+        Announcement(title=f"Announcement {i}", message='Placement drive.', created_by=tpo) for i in range(n)
+    ])
+    for i in range(n):
+        ApiToken.issue(recruiter, f"Token {start + i}")
+    WebhookEndpoint.objects.bulk_create([
+        WebhookEndpoint(user=recruiter, url=f"https://ats.example.com/hooks/{start + i}") for i in range(n)
+    ])
+
+
+# The metrics and replica execute wrappers sit between the ORM and the database.
+_IGNORED_FILES = {__file__, metrics.__file__, replicas.__file__}
+
+
+def _call_site():
+    """The innermost project frame and/or template line on the current stack."""
+    root = str(settings.BASE_DIR)
+    frame = sys._getframe(2)
+    site = []
+    while frame is not None:
+        code = frame.f_code
+        if code.co_name == 'render_annotated' and code.co_filename.endswith('template/base.py'):
+            node = frame.f_locals.get('self')
+            origin, token = getattr(node, 'origin', None), getattr(node, 'token', None)
+            if origin is not None and token is not None:
+                site.append(f"{origin.template_name}:{token.lineno}")
+                break
+        filename = code.co_filename
+        if (not site and filename.startswith(root) and 'site-packages' not in filename
+                and filename not in _IGNORED_FILES):
+            site.append(f"{filename[len(root) + 1:]}:{frame.f_lineno} in {code.co_name}")
+        frame = frame.f_back
+    return ' <- '.join(site) or '<django>'
+
+
+class QueryLog:
+    """Execute wrapper recording each query's SQL and call site."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((sql, _call_site()))
+        return execute(sql, params, many, context)
+
+    def __len__(self):
+        return len(self.queries)
+
+    def by_site(self):
+        grouped = defaultdict(list)
+        for sql, site in self.queries:
+            grouped[site].append(sql)
+        return grouped
+
+
+def budget_report(name, budget, small, large, small_rows, large_rows):
+    """Failure message: counts, then the larger run's SQL grouped by call site, growing sites first."""
+    lines = [
+        f"{name} ran {len(large)} queries with {large_rows} rows "
+        f"({len(small)} with {small_rows} rows; budget {'not set' if budget is None else budget})."
+    ]
+    before = small.by_site()
+    after = large.by_site()
+    sites = sorted(after, key=lambda site: (len(before.get(site, ())) == len(after[site]), -len(after[site]), site))
+    for site in sites:
+        statements = after[site]
+        lines.append(f"  {len(before.get(site, ())):>5} -> {len(statements):<5} {site}")
+        for sql in dict.fromkeys(statements):
+            lines.append(f"                 {sql[:300]}")
+            break
+    return '\n'.join(lines)
+
+
+class QueryBudgetMixin:
+    """Mix into a TestCase; set ``namespace`` and a ``budgets`` entry for every URL in it."""
+
+    namespace = None
+    budgets = {}
+    small_rows = 10
+    large_rows = 1000
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.users = create_portal_users()
+        add_rows(cls.users, cls.small_rows)
+
+    def _requests(self):
+        arguments = url_arguments(self.users)
+        _, api_key = ApiToken.issue(self.users['recruiter'], 'budget')
+        requests = []
+        for name, params in portal_urls(self.namespace):
+            if skip_reason(name):
+                continue
+            kwargs = arguments.get(name) if params else {}
+            self.assertIsNotNone(kwargs, f"No URL arguments for {name}; add them to url_arguments().")
+            headers = {'HTTP_AUTHORIZATION': f"Bearer {api_key}"} if ':api_' in name else {}
+            requests.append((name, reverse(name, kwargs=kwargs), headers))
+        return requests
+
+    def _record(self, client, requests):
+        logs = {}
+        for name, path, headers in requests:
+            client.get(path, **headers)
+            cache.clear()
+            log = QueryLog()
+            with connection.execute_wrapper(log):
+                response = client.get(path, **headers)
+            self.assertLess(response.status_code, 500, f"{name} ({path}) failed")
+            logs[name] = log
+        return logs
+
+    def test_query_budgets(self):
+        client = Client()
+        client.force_login(self.users[self.namespace])
+        requests = self._requests()
+        with self.settings(RATE_LIMITS={}):
+            small = self._record(client, requests)
+            add_rows(self.users, self.large_rows - self.small_rows)
+            large = self._record(client, requests)
+        for name, _, _ in requests:
+            with self.subTest(view=name):
+                budget = self.budgets.get(name)
+                if budget is None or len(large[name]) > budget or len(large[name]) != len(small[name]):
+                    self.fail(budget_report(name, budget, small[name], large[name], self.small_rows, self.large_rows))
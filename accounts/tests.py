@@ -1,3 +1,361 @@
-from django.test import TestCase
+import gzip
+import importlib
+import os
+import re
+import shutil
+import tempfile
+import warnings
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from config import settings as development, settings_production as production
+from student_portal.models import Application
+
+from . import metrics, ratelimit, replicas, staticfiles
+from .db import write_atomic
+
+
+class RateLimitCheckTests(TestCase):
+    """Sliding-window buckets built from two fixed-window counters."""
+
+    def setUp(self):
+        self.cache = caches['default']
+        self.cache.clear()
+        self.bucket = [('rl:test:ip:1.2.3.4', 2, 60)]
+
+    def test_requests_over_the_limit_wait_for_the_window(self):
+        now = 6000.0  # the start of a minute window
+        self.assertEqual(ratelimit.check(self.cache, self.bucket, now), 0)
+        self.assertEqual(ratelimit.check(self.cache, self.bucket, now + 10), 0)
+        self.assertEqual(ratelimit.check(self.cache, self.bucket, now + 15), 45)
+        # The refused request was not counted, so the next window starts from two.
+        self.assertEqual(self.cache.get('rl:test:ip:1.2.3.4:100'), 2)
+
+    def test_previous_window_weight_decays(self):
+        now = 6000.0
+        ratelimit.check(self.cache, self.bucket, now)
+        ratelimit.check(self.cache, self.bucket, now)
+        # Half-way into the next window the old two count as one, leaving room for one more.
+        self.assertEqual(ratelimit.check(self.cache, self.bucket, now + 90), 0)
+        # A second one has to wait until the old window no longer overlaps at all.
+        self.assertEqual(ratelimit.check(self.cache, self.bucket, now + 90), 30)
+
+    def test_any_exhausted_bucket_refuses_and_nothing_is_counted(self):
+        buckets = [('rl:test:user:1', 1, 60), ('rl:test:ip:1.2.3.4', 5, 60)]
+        self.assertEqual(ratelimit.check(self.cache, buckets, 6000.0), 0)
+        self.assertEqual(ratelimit.check(self.cache, buckets, 6030.0), 30)
+        self.assertEqual(self.cache.get('rl:test:ip:1.2.3.4:100'), 1)
+
+
+@override_settings(RATE_LIMITS={'login': {'methods': ['POST'], 'ip': '2/m'}})
+class RateLimitMiddlewareTests(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.addCleanup(caches['default'].clear)
+
+    def login(self):
+        return self.client.post(reverse('login'), {'username': 'nobody', 'password': 'wrong'})
+
+    def test_limit_answers_429_with_retry_after(self):
+        self.assertEqual(self.login().status_code, 200)
+        self.assertEqual(self.login().status_code, 200)
+        response = self.login()
+        self.assertEqual(response.status_code, 429)
+        self.assertTrue(1 <= int(response['Retry-After']) <= 60)
+        self.assertContains(response, 'Too many requests', status_code=429)
+        self.assertTemplateUsed(response, 'errors/429.html')
+
+    def test_unlisted_methods_are_not_counted(self):
+        for _ in range(3):
+            self.assertEqual(self.client.get(reverse('login')).status_code, 200)
+        self.assertEqual(self.login().status_code, 200)
+
+
+class WriteAtomicTests(TransactionTestCase):
+    def begins(self, queries):
+        return [q['sql'] for q in queries if q['sql'].startswith('BEGIN')]
+
+    def test_outermost_block_begins_immediate_and_restores_the_mode(self):
+        mode = connection.transaction_mode
+        with CaptureQueriesContext(connection) as queries:
+            with write_atomic():
+                User.objects.create_user('writer')
+                with write_atomic():
+                    User.objects.create_user('nested')
+            with transaction.atomic():
+                User.objects.count()
+        self.assertEqual(self.begins(queries), ['BEGIN IMMEDIATE', 'BEGIN'])
+        self.assertEqual(connection.transaction_mode, mode)
+        self.assertEqual(User.objects.count(), 2)
+
+    def test_closed_connection_reconnects_before_overriding_the_mode(self):
+        # The test database is in memory, where close() is ignored, so use a file.
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        fresh = type(connections['default'])(
+            {**connection.settings_dict, 'NAME': os.path.join(directory, 'db.sqlite3')}, alias='fresh',
+        )
+        sql = []
+
+        def record(execute, statement, params, many, context):
+            sql.append(statement)
+            return execute(statement, params, many, context)
+
+        # CaptureQueriesContext would connect up front; an execute wrapper does not.
+        with mock.patch.object(transaction, 'get_connection', return_value=fresh), fresh.execute_wrapper(record):
+            fresh.close()
+            with write_atomic():
+                fresh.cursor().execute('CREATE TABLE t (x integer)')
+            fresh.close()
+            with write_atomic():
+                fresh.cursor().execute('INSERT INTO t VALUES (1)')
+            fresh.close()
+        self.assertEqual([statement for statement in sql if statement.startswith('BEGIN')], ['BEGIN IMMEDIATE'] * 2)
+        self.assertIsNone(fresh.transaction_mode)
+
+
+@override_settings(REPLICA_PIN_SECONDS=7)
+class ReplicaRouterTests(TestCase):
+    """Decorated views read from the replica until the request or the client has written."""
+
+    def setUp(self):
+        self.router = replicas.ReplicaRouter()
+        self.factory = RequestFactory()
+
+    def with_replica(self):
+        patcher = mock.patch.object(replicas, 'replica_alias', return_value='replica')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def serve(self, request, write=False):
+        """Run a @read_replica view behind the middleware; return (response, read aliases before/after writing)."""
+        seen = []
+
+        @replicas.read_replica
+        def view(request):
+            seen.append(self.router.db_for_read(Application))
+            if write:
+                User.objects.create_user('replica_writer')
+                seen.append(self.router.db_for_read(Application))
+            return HttpResponse()
+
+        return replicas.ReplicaPinMiddleware(view)(request), seen
+
+    def test_reads_in_decorated_views_go_to_the_replica(self):
+        self.with_replica()
+        self.assertIsNone(self.router.db_for_read(Application))
+        routed = replicas.read_replica(lambda request, model: self.router.db_for_read(model))
+        self.assertEqual(routed(None, Application), 'replica')
+        self.assertIsNone(routed(None, Session))
+        self.assertEqual(self.router.db_for_write(Application), 'default')
+        self.assertFalse(self.router.allow_migrate('replica', 'student_portal'))
+
+    def test_write_pins_the_rest_of_the_request_and_the_client(self):
+        self.with_replica()
+        response, seen = self.serve(self.factory.get('/'), write=True)
+        self.assertEqual(seen, ['replica', None])
+        self.assertEqual(response.cookies[replicas.PIN_COOKIE]['max-age'], 7)
+
+    def test_read_only_get_leaves_the_client_unpinned(self):
+        self.with_replica()
+        response, seen = self.serve(self.factory.get('/'))
+        self.assertEqual(seen, ['replica'])
+        self.assertNotIn(replicas.PIN_COOKIE, response.cookies)
+
+    def test_unsafe_method_pins_even_without_a_write(self):
+        self.with_replica()
+        response, _ = self.serve(self.factory.post('/'))
+        self.assertIn(replicas.PIN_COOKIE, response.cookies)
+
+    def test_pinned_client_reads_the_primary(self):
+        self.with_replica()
+        request = self.factory.get('/')
+        request.COOKIES[replicas.PIN_COOKIE] = '1'
+        _, seen = self.serve(request)
+        self.assertEqual(seen, [None])
+
+    def test_without_a_replica_everything_stays_on_the_primary(self):
+        self.assertIsNone(replicas.replica_alias())
+        self.assertEqual(replicas.read_alias(), 'default')
+        response, seen = self.serve(self.factory.get('/'), write=True)
+        self.assertEqual(seen, [None, None])
+        self.assertNotIn(replicas.PIN_COOKIE, response.cookies)
+
+
+class ProductionSettingsTests(TestCase):
+    """config.settings_production layers its changes over copies of the development settings."""
+
+    def test_templates_use_cached_loaders(self):
+        options = production.TEMPLATES[0]['OPTIONS']
+        self.assertFalse(production.TEMPLATES[0]['APP_DIRS'])
+        self.assertEqual(options['loaders'][0][0], 'django.template.loaders.cached.Loader')
+        self.assertTrue(development.TEMPLATES[0]['APP_DIRS'])
+        self.assertNotIn('loaders', development.TEMPLATES[0]['OPTIONS'])
+
+    def test_debug_is_off_and_hosts_come_from_the_environment(self):
+        self.addCleanup(importlib.reload, production)
+        with mock.patch.dict(os.environ, {'DJANGO_ALLOWED_HOSTS': 'placements.example.edu, .cpms.example.edu'}):
+            importlib.reload(production)
+        self.assertFalse(production.DEBUG)
+        self.assertEqual(production.ALLOWED_HOSTS, ['placements.example.edu', '.cpms.example.edu'])
+        with mock.patch.dict(os.environ, {'DJANGO_ALLOWED_HOSTS': ''}):
+            importlib.reload(production)
+        self.assertEqual(production.ALLOWED_HOSTS, [])
+
+
+# One sample line of the Prometheus text format: name, optional escaped labels, value.
+LABEL = r'[a-zA-Z_]+="(?:[^"\\\n]|\\[\\"n])*"'
+SAMPLE = re.compile(rf'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{{{LABEL}(?:,{LABEL})*\}})? \S+$')
+
+
+class MetricsTests(TestCase):
+    """Per-view aggregates and their Prometheus text exposition."""
+
+    def setUp(self):
+        metrics.REGISTRY.reset()
+        self.addCleanup(metrics.REGISTRY.reset)
+
+    def stats(self, queries=0, sql_seconds=0.0, template_seconds=0.0):
+        request_stats = metrics._RequestStats()
+        request_stats.queries, request_stats.sql_seconds = queries, sql_seconds
+        request_stats.template_seconds = template_seconds
+        return request_stats
+
+    def samples(self, text):
+        """Sample lines as {'name{labels}': value}, checking the exposition grammar on the way."""
+        samples, typed = {}, set()
+        self.assertTrue(text.endswith('\n'))
+        for line in text.splitlines():
+            if line.startswith('# TYPE '):
+                typed.add(line.split()[2])
+                continue
+            if line.startswith('#'):
+                self.assertRegex(line, r'^# HELP [a-z_]+ .+$')
+                continue
+            self.assertRegex(line, SAMPLE)
+            series, value = line.rsplit(' ', 1)
+            name = series.split('{')[0]
+            if name.startswith('cpms_request_duration_seconds_'):
+                name = 'cpms_request_duration_seconds'
+            self.assertIn(name, typed)
+            samples[series] = float(value)
+        return samples
+
+    def test_histogram_and_counters(self):
+        metrics.REGISTRY.observe('student:job_search', 0.02, self.stats(3, 0.004, 0.01), 1000, 200)
+        metrics.REGISTRY.observe('student:job_search', 0.7, self.stats(5, 0.3, 0.2), 500, 503)
+        samples = self.samples(metrics.REGISTRY.render())
+        view = 'view="student:job_search"'
+        buckets = [
+            samples[f'cpms_request_duration_seconds_bucket{{{view},le="{bound}"}}'] for bound in metrics.LATENCY_BUCKETS
+        ]
+        self.assertEqual(buckets, sorted(buckets))
+        self.assertEqual(samples[f'cpms_request_duration_seconds_bucket{{{view},le="0.025"}}'], 1)
+        self.assertEqual(samples[f'cpms_request_duration_seconds_bucket{{{view},le="1.0"}}'], 2)
+        self.assertEqual(samples[f'cpms_request_duration_seconds_bucket{{{view},le="+Inf"}}'], 2)
+        self.assertEqual(samples[f'cpms_request_duration_seconds_count{{{view}}}'], 2)
+        self.assertAlmostEqual(samples[f'cpms_request_duration_seconds_sum{{{view}}}'], 0.72)
+        self.assertEqual(samples[f'cpms_responses_total{{{view},status="2xx"}}'], 1)
+        self.assertEqual(samples[f'cpms_responses_total{{{view},status="5xx"}}'], 1)
+        self.assertEqual(samples[f'cpms_db_queries_total{{{view}}}'], 8)
+        self.assertAlmostEqual(samples[f'cpms_db_query_seconds_total{{{view}}}'], 0.304)
+        self.assertAlmostEqual(samples[f'cpms_template_render_seconds_total{{{view}}}'], 0.21)
+        self.assertEqual(samples[f'cpms_response_bytes_total{{{view}}}'], 1500)
+
+    def test_label_values_are_escaped(self):
+        metrics.REGISTRY.observe('odd"view\\name', 0.001, self.stats(), 0, 200)
+        samples = self.samples(metrics.REGISTRY.render())
+        self.assertIn('cpms_db_queries_total{view="odd\\"view\\\\name"}', samples)
+
+    def test_requests_are_recorded_and_scraped_from_allowed_addresses(self):
+        self.client.get(reverse('login'))
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response['Content-Type'], metrics.CONTENT_TYPE)
+        samples = self.samples(response.content.decode())
+        self.assertEqual(samples['cpms_request_duration_seconds_count{view="login"}'], 1)
+        self.assertGreater(samples['cpms_template_render_seconds_total{view="login"}'], 0)
+        self.assertNotIn('cpms_request_duration_seconds_count{view="metrics"}', samples)
+        self.assertEqual(self.client.get(reverse('metrics'), REMOTE_ADDR='203.0.113.9').status_code, 404)
+
+
+class StaticFilesTests(TestCase):
+    """collectstatic with the production storage, served by StaticFilesMiddleware."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, root)
+        settings_override = override_settings(
+            STATIC_ROOT=root,
+            STATIC_SERVE=True,
+            STORAGES={
+                'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+                'staticfiles': {'BACKEND': 'accounts.staticfiles.CompressedManifestStaticFilesStorage'},
+            },
+        )
+        settings_override.enable()
+        cls.addClassCleanup(settings_override.disable)
+        call_command('collectstatic', interactive=False, verbosity=0)
+        cls.hashed = staticfiles.CompressedManifestStaticFilesStorage(location=root).stored_name('css/site.css')
+        with open(os.path.join(root, 'css', 'site.css'), 'rb') as f:
+            cls.original = f.read()
+
+    def get(self, name, **headers):
+        return self.client.get(f'/static/{name}', **headers)
+
+    def test_hashed_name_is_immutable(self):
+        self.assertNotEqual(self.hashed, 'css/site.css')
+        response = self.get(self.hashed)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], staticfiles.IMMUTABLE)
+        self.assertEqual(response['Content-Type'], 'text/css; charset=utf-8')
+
+    def test_unhashed_name_revalidates(self):
+        response = self.get('css/site.css')
+        self.assertEqual(response['Cache-Control'], staticfiles.REVALIDATE)
+        self.assertEqual(response.content, self.original)
+        response = self.get('css/site.css', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['Cache-Control'], staticfiles.REVALIDATE)
+
+    def test_accept_encoding_picks_the_variant(self):
+        response = self.get(self.hashed, HTTP_ACCEPT_ENCODING='br;q=1.0, gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertNotIn('Content-Disposition', response)
+        self.assertEqual(gzip.decompress(response.content), self.original)
+        for header in ('', 'gzip;q=0', 'identity'):
+            with self.subTest(accept_encoding=header):
+                response = self.get(self.hashed, HTTP_ACCEPT_ENCODING=header)
+                self.assertNotIn('Content-Encoding', response)
+                self.assertEqual(response['Vary'], 'Accept-Encoding')
+                self.assertEqual(response.content, self.original)
+
+    def test_head_sends_the_variant_length(self):
+        response = self.client.head(f'/static/{self.hashed}', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertLess(int(response['Content-Length']), len(self.original))
+
+    async def test_asgi_serves_without_a_sync_iterator(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            response = await self.async_client.get(f'/static/{self.hashed}', headers={'accept-encoding': 'gzip'})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.streaming)
+        self.assertEqual([str(w.message) for w in caught if 'StreamingHttpResponse' in str(w.message)], [])
+        self.assertEqual(gzip.decompress(response.content), self.original)
+
+    def test_unknown_files_and_other_methods(self):
+        self.assertEqual(self.get('css/missing.css').status_code, 404)
+        self.assertEqual(self.get(f'{self.hashed}.gz').status_code, 404)
+        self.assertEqual(self.client.post(f'/static/{self.hashed}').status_code, 405)
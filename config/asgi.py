@@ -3,6 +3,11 @@ ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve the site through this entry point (e.g. ``uvicorn config.asgi:application``)
+with LIVE_UPDATES on, so the live-update stream at /student/events/ runs as
+an async view; see student_portal/live.py. Live events are delivered in-process, so use a
+single worker process.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -44,11 +44,15 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'accounts.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'accounts.staticfiles.StaticFilesMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'accounts.ratelimit.RateLimitMiddleware',
+    'accounts.replicas.ReplicaPinMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -65,11 +69,17 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'accounts.context_processors.fragment_cache',
+                'accounts.context_processors.live_updates',
             ],
         },
     },
 ]
 
+# Key for {% cache %} fragments that only change with the code (the role
+# sidebars). Bump it when editing them so a shared cache drops the old markup.
+TEMPLATE_FRAGMENT_VERSION = 1
+
 WSGI_APPLICATION = 'config.wsgi.application'
 
 
@@ -83,6 +93,40 @@ DATABASES = {
     }
 }
 
+# SQLite tuning for production, applied to every new connection; enabled by
+# config/settings_production.py. WAL lets readers run alongside the single
+# writer, and busy_timeout makes writers queue instead of failing with "database
+# is locked". Transactions stay DEFERRED: IMMEDIATE would take the write lock at
+# every BEGIN, serializing read-only atomic() blocks behind the writer too.
+# Compare with `manage.py bench_sqlite`.
+SQLITE_PRODUCTION_OPTIONS = {
+    'init_command': (
+        'PRAGMA journal_mode=WAL;'
+        'PRAGMA busy_timeout=20000;'
+        'PRAGMA synchronous=NORMAL;'
+        'PRAGMA mmap_size=268435456;'
+        'PRAGMA cache_size=-65536;'
+        'PRAGMA temp_store=MEMORY;'
+    ),
+}
+
+# Read replica for views marked @read_replica (accounts/replicas.py); unused
+# until a 'replica' alias exists. To try it locally, add
+#     DATABASES['replica'] = {
+#         'ENGINE': 'django.db.backends.sqlite3',
+#         'NAME': BASE_DIR / 'db-replica.sqlite3',
+#         'TEST': {'MIRROR': 'default'},
+#     }
+# and keep the copy fresh with `manage.py sync_replica --loop`.
+DATABASE_ROUTERS = ['accounts.replicas.ReplicaRouter']
+REPLICA_DATABASE = 'replica'
+REPLICA_PIN_SECONDS = 5
+
+# Per-view latency/SQL/template metrics at /metrics (accounts/metrics.py),
+# readable only from these addresses.
+METRICS_ENABLED = True
+METRICS_ALLOWED_IPS = ['127.0.0.1', '::1']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -120,10 +164,47 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+# Serve STATIC_ROOT from the app process (accounts/staticfiles.py); the
+# production profile turns it on together with hashed, precompressed files.
+STATIC_SERVE = False
 
 MEDIA_URL = 'media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Email (notification digests). Development prints messages to the console;
+# point EMAIL_BACKEND/EMAIL_HOST at an SMTP server in production.
+EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+DEFAULT_FROM_EMAIL = 'CPMS <no-reply@cpms.local>'
+
+# Live updates over Server-Sent Events (student_portal/live.py). The stream is an
+# endless async view, so only turn this on when serving through config.asgi: a
+# WSGI worker would be tied up for as long as each browser stays connected.
+LIVE_UPDATES = False
+
+# Surge-mode application intake (student_portal/intake.py). Applies to jobs whose
+# deadline is less than this many hours away are logged to APPLICATION_INTAKE_DIR
+# and committed in batches by `manage.py commit_applications`; 0 turns it off.
+APPLICATION_SURGE_HOURS = 0
+APPLICATION_INTAKE_DIR = BASE_DIR / 'intake'
+
+# Application webhooks (recruiter_portal/webhooks.py) only go to https URLs that
+# resolve to public addresses. Turn this on to test against an ATS on localhost.
+WEBHOOK_ALLOW_PRIVATE_URLS = False
+
+# Rate limits for expensive views, by URL name (accounts/ratelimit.py). Counters
+# live in RATE_LIMIT_CACHE; use a shared cache (Redis/Memcached) with several workers.
+# Per-IP limits are loose because a whole campus can sit behind a few NAT addresses.
+RATE_LIMIT_CACHE = 'default'
+RATE_LIMITS = {
+    'login': {'methods': ['POST'], 'ip': '20/m'},
+    'student:job_detail': {'methods': ['POST'], 'user': '10/m', 'ip': '600/m'},
+    'student:document_upload': {'methods': ['POST'], 'user': '10/m', 'ip': '600/m'},
+    'student:job_search': {'params': ['search'], 'user': '30/m', 'ip': '600/m'},
+    'tpo:reports': {'user': '20/m'},
+    'tpo:report_placement_pdf': {'user': '5/m'},
+}
+
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'home'
 LOGOUT_REDIRECT_URL = 'login'
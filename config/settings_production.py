@@ -0,0 +1,40 @@
+"""
+Production profile: the development settings plus the tuned SQLite
+connection options, compiled templates kept in memory (cached loaders,
+without the development autoreload checks), hashed, precompressed
+static files served by the app itself, and live updates, which need the
+ASGI server below. DEBUG is off; list the served host names in
+DJANGO_ALLOWED_HOSTS (comma-separated).
+
+    export DJANGO_SETTINGS_MODULE=config.settings_production DJANGO_ALLOWED_HOSTS=placements.example.edu
+    python manage.py collectstatic --noinput
+    uvicorn config.asgi:application
+"""
+import copy
+import os
+
+from .settings import *  # noqa: F401,F403
+from .settings import DATABASES, SQLITE_PRODUCTION_OPTIONS, TEMPLATES
+
+DEBUG = False
+ALLOWED_HOSTS = [host.strip() for host in os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(',') if host.strip()]
+
+# Copies, so importing both settings modules leaves config.settings untouched.
+DATABASES = copy.deepcopy(DATABASES)
+DATABASES['default']['OPTIONS'] = dict(SQLITE_PRODUCTION_OPTIONS)
+
+TEMPLATES = copy.deepcopy(TEMPLATES)
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'accounts.staticfiles.CompressedManifestStaticFilesStorage'},
+}
+STATIC_SERVE = True
+LIVE_UPDATES = True
@@ -19,6 +19,8 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
+from accounts.metrics import metrics_view
+
 urlpatterns = [
     path('', include('accounts.urls')),
     path('student/', include('student_portal.urls')),
@@ -26,6 +28,7 @@ urlpatterns = [
     path('recruiter/', include('recruiter_portal.urls')),
     path('accounts/', include('django.contrib.auth.urls')),
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
 ]
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -1,3 +1,25 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import ApiToken, OutboxEvent, WebhookEndpoint
+
+
+@admin.register(ApiToken)
+class ApiTokenAdmin(admin.ModelAdmin):
+    list_display = ["user", "name", "prefix", "can_import_jobs", "created_at", "last_used_at"]
+    search_fields = ["user__username", "name"]
+    readonly_fields = ["key_hash", "prefix", "created_at", "last_used_at"]
+
+
+@admin.register(WebhookEndpoint)
+class WebhookEndpointAdmin(admin.ModelAdmin):
+    list_display = ["user", "url", "is_active", "last_success_at", "last_error"]
+    list_filter = ["is_active"]
+    search_fields = ["user__username", "url"]
+    readonly_fields = ["secret", "created_at", "last_success_at", "last_error"]
+
+
+@admin.register(OutboxEvent)
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ["event_type", "endpoint", "status", "attempts", "next_attempt_at", "created_at"]
+    list_filter = ["status", "event_type"]
+    raw_id_fields = ["endpoint"]
@@ -0,0 +1,240 @@
+"""
+JSON API for ATS integrations.
+
+Authenticate with ``Authorization: Bearer <key>`` (or ``Token <key>``) using
+a key issued from the recruiter portal. Every endpoint is scoped to the
+token owner's job postings. The read endpoints support:
+
+- ``?fields=a,b`` to project only some fields (the SELECT is narrowed too),
+- ``?cursor=<next_cursor>&limit=N`` keyset pagination in id order,
+- ``ETag`` / ``If-None-Match`` so an unchanged page answers 304.
+
+Rows are serialized straight from ``.values()`` projections. The one write
+endpoint, ``jobs/import/``, takes the same rows as the portal's bulk
+import and reports per-row errors. It only accepts tokens issued with
+``can_import_jobs`` (others get 403), so tokens handed out for read sync
+cannot create postings. It is CSRF-exempt because it never reads the
+session cookie.
+"""
+import base64
+import hashlib
+import json
+from datetime import timedelta
+from functools import wraps
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST, require_safe
+
+from accounts.models import Profile
+from student_portal.models import Application, Interview, JobPosting
+
+from . import bulk
+from .models import ApiToken
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+LAST_USED_RESOLUTION = timedelta(minutes=5)
+
+# Public field name -> ORM path, per resource.
+JOB_FIELDS = {
+    "id": "id",
+    "title": "title",
+    "company_name": "company_name",
+    "description": "description",
+    "requirements": "requirements",
+    "location": "location",
+    "salary_range": "salary_range",
+    "min_cgpa": "min_cgpa",
+    "eligibility_criteria": "eligibility_criteria",
+    "job_type": "job_type",
+    "posted_at": "posted_at",
+    "application_deadline": "application_deadline",
+    "is_active": "is_active",
+}
+APPLICATION_FIELDS = {
+    "id": "id",
+    "job_id": "job_id",
+    "job_title": "job__title",
+    "status": "status",
+    "cover_letter": "cover_letter",
+    "applied_at": "applied_at",
+    "updated_at": "updated_at",
+    "student_id": "student_id",
+    "student_username": "student__user__username",
+    "student_email": "student__user__email",
+    "student_first_name": "student__user__first_name",
+    "student_last_name": "student__user__last_name",
+    "student_branch": "student__branch",
+    "student_cgpa": "student__cgpa",
+    "student_graduation_year": "student__graduation_year",
+}
+INTERVIEW_FIELDS = {
+    "id": "id",
+    "application_id": "application_id",
+    "job_id": "application__job_id",
+    "student_username": "application__student__user__username",
+    "scheduled_at": "scheduled_at",
+    "location": "location",
+    "meeting_link": "meeting_link",
+    "notes": "notes",
+    "status": "status",
+    "created_at": "created_at",
+}
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def _error(message, status):
+    return JsonResponse({"error": message}, status=status)
+
+
+def _authenticate(request):
+    header = request.headers.get("Authorization", "")
+    scheme, _, key = header.partition(" ")
+    if scheme.lower() not in ("bearer", "token") or not key.strip():
+        return None
+    token = (
+        ApiToken.objects.select_related("user__profile")
+        .filter(key_hash=ApiToken.hash_key(key.strip()), user__is_active=True)
+        .first()
+    )
+    if token is None or getattr(token.user.profile, "role", None) != Profile.Role.RECRUITER:
+        return None
+    now = timezone.now()
+    if token.last_used_at is None or now - token.last_used_at > LAST_USED_RESOLUTION:
+        ApiToken.objects.filter(pk=token.pk).update(last_used_at=now)
+    return token
+
+
+def api_token_required(view_func):
+    """Decorator: authenticate the API token; expose it as request.api_token and its owner as request.api_user."""
+    @wraps(view_func)
+    def wrapper(request: HttpRequest, *args, **kwargs):
+        token = _authenticate(request)
+        if token is None:
+            response = _error("Invalid or missing API token.", 401)
+            response["WWW-Authenticate"] = 'Bearer realm="cpms"'
+            return response
+        request.api_token = token
+        request.api_user = token.user
+        try:
+            return view_func(request, *args, **kwargs)
+        except ApiError as exc:
+            return _error(str(exc), exc.status)
+    return wrapper
+
+
+def _selected_fields(request, field_map):
+    requested = [f.strip() for f in request.GET.get("fields", "").split(",") if f.strip()]
+    if not requested:
+        return list(field_map)
+    unknown = [f for f in requested if f not in field_map]
+    if unknown:
+        raise ApiError(f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(field_map)}")
+    return requested
+
+
+def _decode_cursor(value):
+    if not value:
+        return 0
+    try:
+        return int(base64.urlsafe_b64decode(value.encode() + b"==").decode())
+    except (ValueError, UnicodeDecodeError):
+        raise ApiError("Invalid cursor.")
+
+
+def _encode_cursor(pk):
+    return base64.urlsafe_b64encode(str(pk).encode()).decode().rstrip("=")
+
+
+def _limit(request):
+    try:
+        limit = int(request.GET.get("limit", DEFAULT_LIMIT))
+    except ValueError:
+        raise ApiError("limit must be an integer.")
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def _page_response(request, queryset, field_map):
+    """Project, paginate by id and serialize ``queryset``; answer 304 when the page is unchanged."""
+    fields = _selected_fields(request, field_map)
+    after = _decode_cursor(request.GET.get("cursor"))
+    limit = _limit(request)
+    paths = [field_map[f] for f in fields]
+    rows = list(
+        queryset.filter(pk__gt=after).order_by("pk").values_list("pk", *paths)[: limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    payload = {
+        "results": [dict(zip(fields, row[1:])) for row in rows],
+        "next_cursor": _encode_cursor(rows[-1][0]) if has_more else None,
+    }
+    body = json.dumps(payload, cls=DjangoJSONEncoder, separators=(",", ":")).encode()
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(body, content_type="application/json")
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ["Authorization"])
+    return response
+
+
+@require_safe
+@api_token_required
+def jobs(request: HttpRequest) -> HttpResponse:
+    qs = JobPosting.objects.filter(posted_by=request.api_user)
+    if "is_active" in request.GET:
+        qs = qs.filter(is_active=request.GET["is_active"].lower() in ("1", "true", "yes"))
+    return _page_response(request, qs, JOB_FIELDS)
+
+
+@require_safe
+@api_token_required
+def applications(request: HttpRequest) -> HttpResponse:
+    qs = Application.objects.filter(job__posted_by=request.api_user)
+    if request.GET.get("job"):
+        try:
+            qs = qs.filter(job_id=int(request.GET["job"]))
+        except ValueError:
+            raise ApiError("job must be an integer id.")
+    if request.GET.get("status"):
+        qs = qs.filter(status=request.GET["status"])
+    return _page_response(request, qs, APPLICATION_FIELDS)
+
+
+@require_safe
+@api_token_required
+def interviews(request: HttpRequest) -> HttpResponse:
+    qs = Interview.objects.filter(application__job__posted_by=request.api_user)
+    if request.GET.get("status"):
+        qs = qs.filter(status=request.GET["status"])
+    return _page_response(request, qs, INTERVIEW_FIELDS)
+
+
+@csrf_exempt
+@require_POST
+@api_token_required
+def jobs_import(request: HttpRequest) -> HttpResponse:
+    """POST a JSON list of job objects (or {"jobs": [...]}); valid rows are created, invalid ones reported."""
+    if not request.api_token.can_import_jobs:
+        raise ApiError("This token is read-only; issue one with job import enabled.", 403)
+    try:
+        rows = bulk.parse_json(request.body.decode("utf-8"))
+        created, row_errors = bulk.import_job_postings(rows, request.api_user)
+    except (bulk.BulkImportError, UnicodeDecodeError) as exc:
+        raise ApiError(str(exc))
+    return JsonResponse(
+        {"created": [job.pk for job in created], "errors": row_errors},
+        status=201 if created else 400,
+    )
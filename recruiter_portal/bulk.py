@@ -0,0 +1,97 @@
+"""
+Bulk job posting import for recruiters.
+
+Rows come from an uploaded CSV/JSON file or a JSON request body. Every row is
+validated with JobPostingForm; valid rows are inserted with a single
+bulk_create inside one transaction and invalid rows are reported back with
+their row number instead of aborting the batch.
+"""
+import csv
+import io
+import json
+
+from django.db import transaction
+
+from student_portal.models import JobPosting
+
+from .forms import JobPostingForm
+
+MAX_ROWS = 5000
+BATCH_SIZE = 500
+# is_active spellings seen in spreadsheets, compared stripped and lowercased.
+FALSE_VALUES = {"0", "no", "n", "false", "f", "off", "inactive"}
+TRUE_VALUES = {"1", "yes", "y", "true", "t", "on", "active"}
+
+
+class BulkImportError(ValueError):
+    """Raised when an import file cannot be parsed at all."""
+
+
+def parse_rows(uploaded_file):
+    """Read a CSV or JSON upload into a list of dicts."""
+    raw = uploaded_file.read()
+    try:
+        text = raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise BulkImportError("File must be UTF-8 encoded.")
+    name = (getattr(uploaded_file, "name", "") or "").lower()
+    if name.endswith(".json") or text.lstrip().startswith(("[", "{")):
+        return parse_json(text)
+    return list(csv.DictReader(io.StringIO(text)))
+
+
+def parse_json(text):
+    """Accept either a list of rows or {"jobs": [...]}."""
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as exc:
+        raise BulkImportError(f"Invalid JSON: {exc}")
+    if isinstance(data, dict):
+        data = data.get("jobs")
+    if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+        raise BulkImportError("JSON must be a list of job objects.")
+    return data
+
+
+def _form_data(row):
+    data = {key.strip(): ("" if value is None else value) for key, value in row.items() if key}
+    if not data.get("job_type"):
+        data["job_type"] = JobPosting._meta.get_field("job_type").default
+    # Checkbox semantics would treat a missing column as "inactive"; bulk
+    # imports default to active unless told otherwise.
+    if str(data.get("is_active", "")).strip() == "":
+        data["is_active"] = "true"
+    elif isinstance(data["is_active"], str):
+        value = data["is_active"].strip().lower()
+        if value in FALSE_VALUES:
+            data["is_active"] = "false"
+        elif value in TRUE_VALUES:
+            data["is_active"] = "true"
+    return data
+
+
+def import_job_postings(rows, user):
+    """
+    Validate and insert rows for ``user``.
+
+    Returns (created_jobs, errors) where errors is a list of
+    {"row": <1-based row number>, "errors": {field: [messages]}}.
+    """
+    if len(rows) > MAX_ROWS:
+        raise BulkImportError(f"At most {MAX_ROWS} rows can be imported at once.")
+
+    jobs = []
+    errors = []
+    for number, row in enumerate(rows, start=1):
+        form = JobPostingForm(data=_form_data(row))
+        if form.is_valid():
+            job = form.save(commit=False)
+            job.posted_by = user
+            jobs.append(job)
+        else:
+            errors.append({"row": number, "errors": {field: list(msgs) for field, msgs in form.errors.items()}})
+
+    if jobs:
+        with transaction.atomic():
+            jobs = JobPosting.objects.bulk_create(jobs, batch_size=BATCH_SIZE)
+    return jobs, errors
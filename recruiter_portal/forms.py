@@ -6,6 +6,8 @@ from django.utils import timezone
 
 from student_portal.models import JobPosting, Application, Interview
 
+from .models import ApiToken, WebhookEndpoint
+
 
 class JobPostingForm(forms.ModelForm):
     """Create/Edit job posting."""
@@ -46,6 +48,15 @@ class JobPostingForm(forms.ModelForm):
         return value
 
 
+class JobImportForm(forms.Form):
+    """Upload a CSV or JSON file of job postings."""
+
+    file = forms.FileField(
+        help_text="CSV with a header row, or a JSON list of objects, using the job posting field names.",
+        widget=forms.FileInput(attrs={"class": "form-control", "accept": ".csv,.json"}),
+    )
+
+
 class ApplicationStatusForm(forms.ModelForm):
     """Update application status (shortlist, reject, etc.)."""
 
@@ -68,3 +79,25 @@ class InterviewScheduleForm(forms.ModelForm):
             "notes": forms.Textarea(attrs={"class": "form-control", "rows": 3}),
             "status": forms.Select(attrs={"class": "form-select"}),
         }
+
+
+class ApiTokenForm(forms.ModelForm):
+    """Name a new API token for an ATS integration, and choose whether it may import jobs."""
+
+    class Meta:
+        model = ApiToken
+        fields = ["name", "can_import_jobs"]
+        labels = {"can_import_jobs": "Can import job postings"}
+        widgets = {
+            "name": forms.TextInput(attrs={"class": "form-control", "placeholder": "e.g. Greenhouse sync"}),
+            "can_import_jobs": forms.CheckboxInput(attrs={"class": "form-check-input"}),
+        }
+
+
+class WebhookEndpointForm(forms.ModelForm):
+    """Register an ATS URL for application webhooks."""
+
+    class Meta:
+        model = WebhookEndpoint
+        fields = ["url"]
+        widgets = {"url": forms.URLInput(attrs={"class": "form-control", "placeholder": "https://ats.example.com/hooks/cpms"})}
@@ -0,0 +1,54 @@
+"""
+Measure bulk job import throughput.
+
+    python manage.py bench_job_import --rows 1000
+
+Everything runs inside a transaction that is rolled back, so the database is
+left untouched.
+"""
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from recruiter_portal import bulk
+
+
+class Command(BaseCommand):
+    help = "Benchmark bulk job posting import (rolled back afterwards)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--invalid-every", type=int, default=0, help="Make every Nth row invalid.")
+
+    def handle(self, *args, rows, invalid_every, **options):
+        User = get_user_model()
+        data = [
+            {
+                "title": f"Software Engineer {i}",
+                "company_name": "Benchmark Corp",
+                "description": "Role variant for the placement drive.",
+                "requirements": "Python, SQL",
+                "location": "Bengaluru",
+                "salary_range": "8-12 LPA",
+                "min_cgpa": "7.00",
+                "job_type": "full_time",
+            }
+            for i in range(rows)
+        ]
+        if invalid_every:
+            for row in data[::invalid_every]:
+                row["title"] = ""
+
+        with transaction.atomic():
+            user = User.objects.create_user(username="__bench_job_import__")
+            start = time.perf_counter()
+            created, errors = bulk.import_job_postings(data, user)
+            elapsed = time.perf_counter() - start
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"{rows} rows: {len(created)} created, {len(errors)} rejected in {elapsed * 1000:.1f} ms "
+            f"({rows / elapsed:.0f} rows/s)"
+        )
@@ -0,0 +1,41 @@
+"""
+Webhook worker: deliver due outbox events to recruiter endpoints.
+
+    python manage.py deliver_webhooks           # deliver what is due now
+    python manage.py deliver_webhooks --loop    # keep polling
+
+Connections are kept alive and reused across batches while the worker runs.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from recruiter_portal import webhooks
+
+
+class Command(BaseCommand):
+    help = "Send pending application webhook events in signed batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=webhooks.BATCH_SIZE)
+        parser.add_argument("--loop", action="store_true", help="Keep polling for due events.")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds between polls in --loop mode.")
+
+    def handle(self, *args, batch_size, loop, interval, **options):
+        total_delivered = total_failed = 0
+        pool = webhooks.ConnectionPool()
+        try:
+            while True:
+                delivered, failed = webhooks.deliver_due(pool=pool, batch_size=batch_size)
+                total_delivered += delivered
+                total_failed += failed
+                if delivered or failed:
+                    self.stdout.write(f"Delivered {delivered} event(s), {failed} given up")
+                    if delivered:
+                        continue
+                if not loop:
+                    break
+                time.sleep(interval)
+        finally:
+            pool.close()
+        self.stdout.write(f"Done: {total_delivered} event(s) delivered, {total_failed} given up.")
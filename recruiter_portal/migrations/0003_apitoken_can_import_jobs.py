@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-19 15:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruiter_portal', '0002_webhooks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apitoken',
+            name='can_import_jobs',
+            field=models.BooleanField(default=False, help_text='Allow creating job postings through the API'),
+        ),
+    ]
@@ -1,3 +1,95 @@
+import hashlib
+import secrets
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class ApiToken(models.Model):
+    """Bearer token for the ATS integration API; only a hash of the key is stored.
+
+    Tokens read by default. Creating job postings through jobs/import/ needs
+    a token issued with ``can_import_jobs``.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="api_tokens")
+    name = models.CharField(max_length=100, help_text="e.g. Greenhouse sync")
+    can_import_jobs = models.BooleanField(default=False, help_text="Allow creating job postings through the API")
+    key_hash = models.CharField(max_length=64, unique=True)
+    prefix = models.CharField(max_length=8)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        return f"{self.user.username} - {self.name} ({self.prefix}…)"
+
+    @staticmethod
+    def hash_key(key: str) -> str:
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    @classmethod
+    def issue(cls, user, name: str, can_import_jobs: bool = False):
+        """Create a token and return (token, raw_key); the raw key is not recoverable later."""
+        key = secrets.token_urlsafe(32)
+        token = cls.objects.create(
+            user=user, name=name, can_import_jobs=can_import_jobs, key_hash=cls.hash_key(key), prefix=key[:8],
+        )
+        return token, key
+
+
+class WebhookEndpoint(models.Model):
+    """ATS URL that receives signed application events for the owner's job postings"""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="webhook_endpoints")
+    url = models.URLField(max_length=500)
+    secret = models.CharField(max_length=64, default=secrets.token_hex, editable=False)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_success_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.CharField(max_length=255, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        return f"{self.user.username} - {self.url}"
+
+    def clean(self):
+        from .webhooks import UnsafeWebhookURL, check_url
+
+        if self.url:
+            try:
+                check_url(self.url)
+            except UnsafeWebhookURL as exc:
+                raise ValidationError({"url": str(exc)})
+
+
+class OutboxEvent(models.Model):
+    """Application event written in the same transaction as the change, delivered later by the worker"""
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        DELIVERED = "delivered", "Delivered"
+        FAILED = "failed", "Failed"
+
+    endpoint = models.ForeignKey(WebhookEndpoint, on_delete=models.CASCADE, related_name="events")
+    event_type = models.CharField(max_length=50)
+    payload = models.JSONField()
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["pk"]
+        indexes = [
+            models.Index(fields=["next_attempt_at"], condition=Q(status="pending"), name="outbox_due_idx"),
+        ]
 
-# Create your models here.
+    def __str__(self) -> str:
+        return f"{self.event_type} -> {self.endpoint.url} ({self.status})"
@@ -0,0 +1,121 @@
+"""
+"Review next" work queue for recruiter teams.
+
+A reviewer claims an unreviewed (status "applied") application by setting a
+time-limited lease with a conditional UPDATE: the row is only taken if nobody
+holds an unexpired lease on it, so two reviewers can never claim the same
+application and no lock is held between requests. Leases that run out are
+simply claimable again.
+
+A team often shares the one recruiter account that posted the job, so the
+lease belongs to a reviewer key kept in each browser session
+(``reviewer_key``) rather than to the user. ``review_claimed_by`` only
+records which account holds it, for display.
+"""
+import random
+import uuid
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+
+from student_portal.models import Application
+
+LEASE = timedelta(minutes=10)
+# Reviewers try a random pick among the oldest few candidates so a team
+# hitting "review next" together does not all race for the same row.
+CANDIDATES = 10
+ATTEMPTS = 5
+SESSION_KEY = "review_queue_reviewer"
+
+
+def reviewer_key(request):
+    """This browser session's reviewer identity, created on first use."""
+    key = request.session.get(SESSION_KEY)
+    if not key:
+        key = request.session[SESSION_KEY] = uuid.uuid4().hex
+    return key
+
+
+def _unleased(now):
+    return Q(review_lease_expires_at__isnull=True) | Q(review_lease_expires_at__lte=now)
+
+
+def held_by(job, key, now=None):
+    """The application on ``job`` the reviewer currently holds a live lease on, if any."""
+    now = now or timezone.now()
+    return (
+        Application.objects.filter(
+            job=job, status="applied", review_claim_key=key, review_lease_expires_at__gt=now
+        )
+        .order_by("applied_at")
+        .first()
+    )
+
+
+def claim_next(job, user, key, lease=LEASE):
+    """Claim (or re-extend) the next unreviewed application on ``job`` for reviewer ``key`` of ``user``."""
+    now = timezone.now()
+    current = held_by(job, key, now)
+    if current is not None:
+        renew(current, key, lease)
+        return current
+    for _ in range(ATTEMPTS):
+        candidates = list(
+            Application.objects.filter(job=job, status="applied")
+            .filter(_unleased(now))
+            .order_by("applied_at", "pk")
+            .values_list("pk", flat=True)[:CANDIDATES]
+        )
+        if not candidates:
+            return None
+        random.shuffle(candidates)
+        for pk in candidates:
+            claimed = (
+                Application.objects.filter(pk=pk, status="applied")
+                .filter(_unleased(now))
+                .update(review_claimed_by=user, review_claim_key=key, review_lease_expires_at=now + lease)
+            )
+            if claimed:
+                return Application.objects.get(pk=pk)
+        now = timezone.now()
+    return None
+
+
+def renew(application, key, lease=LEASE):
+    """Extend the reviewer's lease; returns False if it was lost to someone else."""
+    now = timezone.now()
+    return bool(
+        Application.objects.filter(pk=application.pk, review_claim_key=key, review_lease_expires_at__gt=now)
+        .update(review_lease_expires_at=now + lease)
+    )
+
+
+def release(application, key):
+    """Drop the reviewer's lease (after a decision, or to skip the application)."""
+    Application.objects.filter(pk=application.pk, review_claim_key=key).update(
+        review_claimed_by=None, review_claim_key="", review_lease_expires_at=None
+    )
+
+
+def holds(application, key, now=None):
+    """Whether reviewer ``key`` holds a live lease on ``application``."""
+    now = now or timezone.now()
+    return bool(
+        application.review_claim_key == key
+        and application.review_lease_expires_at
+        and application.review_lease_expires_at > now
+    )
+
+
+def locked_by_other(application, key, now=None):
+    """The account of another reviewer holding a live lease on ``application``, or None."""
+    now = now or timezone.now()
+    if (
+        application.review_claimed_by_id
+        and application.review_claim_key != key
+        and application.review_lease_expires_at
+        and application.review_lease_expires_at > now
+    ):
+        return application.review_claimed_by
+    return None
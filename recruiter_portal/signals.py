@@ -0,0 +1,32 @@
+from django.db.models.signals import post_init, post_save
+from django.dispatch import receiver
+
+from student_portal.models import Application
+
+from . import webhooks
+
+
+@receiver(post_init, sender=Application)
+def application_loaded(sender, instance, **kwargs):
+    # Remember the status as loaded, so a save can tell whether it changed without
+    # a SELECT. A deferred status is unknown (None) and never reported as changed.
+    instance._webhook_status = instance.__dict__.get("status")
+
+
+@receiver(post_save, sender=Application)
+def application_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and "status" not in update_fields):
+        return
+    previous, instance._webhook_status = instance._webhook_status, instance.status
+    if not created and previous in (None, instance.status):
+        return
+    # Only creates and status changes look up endpoints, so other saves cost nothing.
+    endpoints = webhooks.endpoints_for_job(instance.job_id)
+    if not endpoints:
+        return
+    if created:
+        webhooks.record(endpoints, webhooks.APPLICATION_CREATED, webhooks.application_payload(instance))
+    else:
+        webhooks.record(
+            endpoints, webhooks.APPLICATION_STATUS_CHANGED, webhooks.application_payload(instance, previous)
+        )
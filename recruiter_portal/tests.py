@@ -1,3 +1,427 @@
-from django.test import TestCase
+import hmac
+import json
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Profile
+from accounts.testing import QueryBudgetMixin
+from student_portal.models import Application, JobPosting, StudentProfile
+
+from . import webhooks
+from .forms import WebhookEndpointForm
+from .models import ApiToken, OutboxEvent, WebhookEndpoint
+
+
+def create_recruiter(username):
+    user = User.objects.create_user(username)
+    Profile.objects.filter(user=user).update(role=Profile.Role.RECRUITER)
+    return user
+
+
+def create_job(user, title="Engineer", **fields):
+    return JobPosting.objects.create(
+        title=title, company_name="Acme", description="d", requirements="r", posted_by=user, **fields,
+    )
+
+
+class ReviewQueueTests(TestCase):
+    """Leases belong to a reviewer session, so a team sharing one account splits the queue."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = create_recruiter("shared_team")
+        cls.job = create_job(cls.recruiter)
+        cls.applications = [
+            Application.objects.create(
+                student=StudentProfile.objects.create(user=User.objects.create_user(f"applicant{n}")), job=cls.job,
+            )
+            for n in range(3)
+        ]
+
+    def reviewer(self):
+        client = Client()
+        client.force_login(self.recruiter)
+        return client
+
+    def review_next(self, client):
+        response = client.post(reverse("recruiter:review_next", args=[self.job.pk]))
+        self.assertEqual(response.status_code, 302)
+        return response.url
+
+    def test_concurrent_reviewers_on_one_account_get_different_applications(self):
+        first, second = self.reviewer(), self.reviewer()
+        self.assertNotEqual(self.review_next(first), self.review_next(second))
+        self.assertEqual(Application.objects.exclude(review_claim_key="").values("review_claim_key").distinct().count(), 2)
+
+    def test_review_next_again_keeps_the_held_application(self):
+        client = self.reviewer()
+        self.assertEqual(self.review_next(client), self.review_next(client))
+
+    def test_leased_application_is_locked_for_other_sessions(self):
+        first, second = self.reviewer(), self.reviewer()
+        url = self.review_next(first)
+        response = second.get(url)
+        self.assertContains(response, "Another reviewer on this account is reviewing this application")
+        response = second.post(url, {"update_status": "1", "status": "rejected"}, follow=True)
+        self.assertContains(response, "Another reviewer on this account is reviewing this application right now.")
+        self.assertFalse(Application.objects.filter(status="rejected").exists())
+        self.assertContains(first.get(url), "You are reviewing this application")
+
+    def test_expired_lease_is_reclaimed(self):
+        Application.objects.exclude(pk=self.applications[0].pk).update(status="shortlisted")
+        first, second = self.reviewer(), self.reviewer()
+        url = self.review_next(first)
+        self.assertEqual(self.review_next(second), reverse("recruiter:application_list", args=[self.job.pk]))
+        Application.objects.filter(pk=self.applications[0].pk).update(
+            review_lease_expires_at=timezone.now() - timedelta(seconds=1),
+        )
+        self.assertEqual(self.review_next(second), url)
+        response = first.post(url, {"update_status": "1", "status": "rejected"}, follow=True)
+        self.assertContains(response, "Another reviewer on this account is reviewing this application right now.")
+
+    def test_decision_releases_the_lease_and_claims_the_next(self):
+        client = self.reviewer()
+        url = self.review_next(client)
+        next_url = client.post(url, {"review_next": "1", "status": "shortlisted"}).url
+        self.assertNotEqual(next_url, url)
+        decided = Application.objects.get(status="shortlisted")
+        self.assertEqual((decided.review_claim_key, decided.review_lease_expires_at), ("", None))
+
+
+class ReadApiTests(TestCase):
+    """Cursor pagination, sparse fields, conditional GETs and token scoping."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = create_recruiter("ats_owner")
+        _, cls.key = ApiToken.issue(cls.recruiter, "ats")
+        cls.jobs = [create_job(cls.recruiter, f"Job {n}") for n in range(5)]
+        cls.foreign_job = create_job(create_recruiter("competitor"), "Not yours")
+        student = StudentProfile.objects.create(user=User.objects.create_user("candidate"), branch="CSE")
+        Application.objects.create(student=student, job=cls.jobs[0])
+        Application.objects.create(student=student, job=cls.foreign_job)
+
+    def get(self, name, key=None, **params):
+        return self.client.get(reverse(f"recruiter:{name}"), params, HTTP_AUTHORIZATION=f"Bearer {key or self.key}")
+
+    def test_cursor_walks_every_row_once(self):
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2, "fields": "id"}
+            if cursor:
+                params["cursor"] = cursor
+            body = self.get("api_jobs", **params).json()
+            seen += [row["id"] for row in body["results"]]
+            cursor = body["next_cursor"]
+            if cursor is None:
+                break
+        self.assertEqual(seen, [job.pk for job in self.jobs])
+
+    def test_invalid_paging_parameters(self):
+        self.assertEqual(self.get("api_jobs", cursor="!!!").status_code, 400)
+        self.assertEqual(self.get("api_jobs", limit="ten").status_code, 400)
+        self.assertEqual(len(self.get("api_jobs", limit=0).json()["results"]), 1)
+
+    def test_sparse_fields_narrow_the_select(self):
+        with CaptureQueriesContext(connection) as queries:
+            body = self.get("api_jobs", fields="id,title").json()
+        self.assertEqual(body["results"][0], {"id": self.jobs[0].pk, "title": "Job 0"})
+        select = [q["sql"] for q in queries if "student_portal_jobposting" in q["sql"]][-1]
+        self.assertNotIn('"description"', select)
+        response = self.get("api_jobs", fields="id,salary")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Unknown field(s): salary", response.json()["error"])
+
+    def test_unchanged_page_answers_304(self):
+        response = self.get("api_jobs")
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+        etag = response["ETag"]
+        response = self.client.get(
+            reverse("recruiter:api_jobs"), HTTP_AUTHORIZATION=f"Bearer {self.key}", HTTP_IF_NONE_MATCH=etag,
+        )
+        self.assertEqual(response.status_code, 304)
+        JobPosting.objects.filter(pk=self.jobs[1].pk).update(title="Renamed")
+        response = self.client.get(
+            reverse("recruiter:api_jobs"), HTTP_AUTHORIZATION=f"Bearer {self.key}", HTTP_IF_NONE_MATCH=etag,
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_results_are_scoped_to_the_token_owner(self):
+        job_ids = [row["id"] for row in self.get("api_jobs", fields="id").json()["results"]]
+        self.assertNotIn(self.foreign_job.pk, job_ids)
+        applications = self.get("api_applications", fields="job_id,student_branch").json()["results"]
+        self.assertEqual(applications, [{"job_id": self.jobs[0].pk, "student_branch": "CSE"}])
+
+    def test_only_recruiter_tokens_authenticate(self):
+        user = User.objects.create_user("not_a_recruiter")
+        _, key = ApiToken.issue(user, "x")
+        self.assertEqual(self.get("api_jobs", key=key).status_code, 401)
+        self.assertEqual(self.get("api_jobs", key="made-up").status_code, 401)
+
+
+class JobImportApiTests(TestCase):
+    """POST /api/v1/jobs/import/: token auth, per-row errors, partial success."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = create_recruiter("importer")
+        _, cls.key = ApiToken.issue(cls.recruiter, "ats", can_import_jobs=True)
+        cls.url = reverse("recruiter:api_jobs_import")
+
+    def setUp(self):
+        # The endpoint must work without a CSRF token, as an ATS never has one.
+        self.client = Client(enforce_csrf_checks=True)
+
+    def post(self, payload, key=None):
+        body = payload if isinstance(payload, str) else json.dumps(payload)
+        return self.client.post(
+            self.url, body, content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {key or self.key}",
+        )
+
+    def row(self, **overrides):
+        return {"title": "Engineer", "company_name": "Acme", "description": "d", "requirements": "r", **overrides}
+
+    def test_requires_token(self):
+        response = self.client.post(self.url, json.dumps([self.row()]), content_type="application/json")
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json(), {"error": "Invalid or missing API token."})
+
+    def test_session_login_is_not_enough(self):
+        self.client.force_login(self.recruiter)
+        response = self.client.post(self.url, json.dumps([self.row()]), content_type="application/json")
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(JobPosting.objects.exists())
+
+    def test_creates_rows_for_token_owner(self):
+        response = self.post({"jobs": [self.row(), self.row(title="Analyst")]})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["errors"], [])
+        self.assertEqual(len(response.json()["created"]), 2)
+        self.assertEqual(
+            sorted(JobPosting.objects.filter(posted_by=self.recruiter).values_list("title", flat=True)),
+            ["Analyst", "Engineer"],
+        )
+
+    def test_read_only_token_cannot_import(self):
+        _, key = ApiToken.issue(self.recruiter, "read sync")
+        response = self.post([self.row()], key=key)
+        self.assertEqual(response.status_code, 403)
+        self.assertIn("read-only", response.json()["error"])
+        self.assertFalse(JobPosting.objects.exists())
+
+    def test_is_active_spellings(self):
+        values = ["No", "N", "FALSE ", " 0", "off", "Yes", " TRUE", "1", ""]
+        response = self.post([self.row(title=f"Job {n}", is_active=value) for n, value in enumerate(values)])
+        self.assertEqual(response.status_code, 201)
+        active = dict(JobPosting.objects.values_list("title", "is_active"))
+        self.assertEqual([active[f"Job {n}"] for n in range(len(values))], [False] * 5 + [True] * 4)
+
+    def test_partial_failure_reports_row_numbers(self):
+        response = self.post([self.row(), self.row(title=""), self.row(min_cgpa="high")])
+        self.assertEqual(response.status_code, 201)
+        body = response.json()
+        self.assertEqual(len(body["created"]), 1)
+        self.assertEqual([error["row"] for error in body["errors"]], [2, 3])
+        self.assertIn("title", body["errors"][0]["errors"])
+        self.assertIn("min_cgpa", body["errors"][1]["errors"])
+        self.assertEqual(JobPosting.objects.count(), 1)
+
+    def test_all_rows_invalid_is_400(self):
+        response = self.post([self.row(company_name="")])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["created"], [])
+        self.assertEqual(response.json()["errors"][0]["row"], 1)
+        self.assertFalse(JobPosting.objects.exists())
+
+    def test_malformed_body_is_400(self):
+        response = self.post("{not json")
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(response.json()["error"].startswith("Invalid JSON"))
+        response = self.post({"jobs": "nope"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_get_is_not_allowed(self):
+        response = self.client.get(self.url, HTTP_AUTHORIZATION=f"Bearer {self.key}")
+        self.assertEqual(response.status_code, 405)
+
+
+class FakeATS:
+    """A local HTTP server standing in for an ATS; records each request and answers with ``status``."""
+
+    def __init__(self, status=200):
+        self.status = status
+        self.requests = []
+        ats = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                ats.requests.append((dict(self.headers), body))
+                self.send_response(ats.status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/hooks"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@override_settings(WEBHOOK_ALLOW_PRIVATE_URLS=True)
+class WebhookDeliveryTests(TestCase):
+    """Outbox rows per Application change, signed batched delivery, backoff and giving up."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recruiter = create_recruiter("hooked")
+        cls.job = create_job(cls.recruiter)
+        cls.student = StudentProfile.objects.create(user=User.objects.create_user("hook_applicant"))
+
+    def setUp(self):
+        self.ats = FakeATS()
+        self.addCleanup(self.ats.close)
+        self.pool = webhooks.ConnectionPool(timeout=5)
+        self.addCleanup(self.pool.close)
+        self.endpoint = WebhookEndpoint.objects.create(user=self.recruiter, url=self.ats.url)
+
+    def apply_and_shortlist(self):
+        application = Application.objects.create(student=self.student, job=self.job)
+        application.status = "shortlisted"
+        application.save()
+        return application
+
+    def test_batch_is_signed_and_delivered_once(self):
+        application = self.apply_and_shortlist()
+        self.assertEqual(webhooks.deliver_due(pool=self.pool), (2, 0))
+        self.assertEqual(webhooks.deliver_due(pool=self.pool), (0, 0))
+        self.assertEqual(len(self.ats.requests), 1)
+        headers, body = self.ats.requests[0]
+        expected = webhooks.sign(self.endpoint.secret, headers["X-CPMS-Timestamp"], body)
+        self.assertTrue(hmac.compare_digest(headers["X-CPMS-Signature"], expected))
+        events = json.loads(body)["events"]
+        self.assertEqual([e["type"] for e in events], [webhooks.APPLICATION_CREATED, webhooks.APPLICATION_STATUS_CHANGED])
+        self.assertEqual(events[1]["data"]["application_id"], application.pk)
+        self.assertEqual((events[1]["data"]["previous_status"], events[1]["data"]["status"]), ("applied", "shortlisted"))
+
+    def test_failure_backs_off_then_gives_up(self):
+        self.ats.status = 500
+        self.apply_and_shortlist()
+        now = timezone.now()
+        self.assertEqual(webhooks.deliver_due(now=now, pool=self.pool), (0, 0))
+        self.assertEqual(set(OutboxEvent.objects.values_list("attempts", flat=True)), {1})
+        for event in OutboxEvent.objects.all():
+            self.assertTrue(now + timedelta(seconds=24) <= event.next_attempt_at <= now + timedelta(seconds=36))
+        self.endpoint.refresh_from_db()
+        self.assertEqual(self.endpoint.last_error, "HTTP 500")
+        self.assertEqual(webhooks.deliver_due(now=now, pool=self.pool), (0, 0))
+        self.assertEqual(len(self.ats.requests), 1)
+
+        OutboxEvent.objects.update(attempts=webhooks.MAX_ATTEMPTS - 1, next_attempt_at=now)
+        self.assertEqual(webhooks.deliver_due(now=now, pool=self.pool), (0, 2))
+        self.assertEqual(set(OutboxEvent.objects.values_list("status", flat=True)), {OutboxEvent.Status.FAILED})
+
+    def test_backoff_doubles_up_to_the_cap(self):
+        with mock.patch("recruiter_portal.webhooks.random.uniform", return_value=1):
+            self.assertEqual(webhooks.backoff(1), webhooks.BACKOFF_BASE)
+            self.assertEqual(webhooks.backoff(4), webhooks.BACKOFF_BASE * 8)
+            self.assertEqual(webhooks.backoff(20), webhooks.BACKOFF_MAX)
+
+    def test_saves_that_keep_the_status_look_up_nothing(self):
+        application = Application.objects.create(student=self.student, job=self.job)
+        with CaptureQueriesContext(connection) as queries:
+            application.cover_letter = "Updated"
+            application.save()
+        self.assertFalse([q for q in queries if "webhookendpoint" in q["sql"] or q["sql"].startswith("SELECT")])
+        self.assertEqual(OutboxEvent.objects.count(), 1)
+
+    def test_no_endpoint_no_events(self):
+        self.endpoint.delete()
+        self.apply_and_shortlist()
+        self.assertFalse(OutboxEvent.objects.exists())
+
+
+class WebhookURLTests(TestCase):
+    """Endpoint URLs must be https on public addresses, at save time and at delivery."""
+
+    def form(self, url):
+        return WebhookEndpointForm(data={"url": url})
+
+    def test_form_rejects_plain_http_and_private_addresses(self):
+        for url in ("http://8.8.8.8/hooks", "https://127.0.0.1/hooks", "https://10.1.2.3/", "https://[::1]/",
+                    "https://169.254.169.254/latest/meta-data/"):
+            with self.subTest(url=url):
+                self.assertIn("url", self.form(url).errors)
+        self.assertTrue(self.form("https://8.8.8.8/hooks").is_valid())
+
+    def test_hostname_resolving_to_a_private_address_is_refused(self):
+        private = [(2, 1, 6, "", ("192.168.0.10", 443))]
+        with mock.patch("recruiter_portal.webhooks.socket.getaddrinfo", return_value=private):
+            self.assertIn("non-public address", self.form("https://ats.example.com/hooks").errors["url"][0])
+            # Checked again when the worker connects, in case DNS changed after registration.
+            with self.assertRaises(webhooks.UnsafeWebhookURL):
+                webhooks.ConnectionPool().post("https://ats.example.com/hooks", b"{}", {})
+
+    def test_delivery_refuses_an_unsafe_stored_url(self):
+        ats = FakeATS()
+        self.addCleanup(ats.close)
+        endpoint = WebhookEndpoint.objects.create(user=create_recruiter("legacy"), url=ats.url)
+        OutboxEvent.objects.create(endpoint=endpoint, event_type=webhooks.APPLICATION_CREATED, payload={})
+        self.assertEqual(webhooks.deliver_due(), (0, 0))
+        self.assertEqual(ats.requests, [])
+        endpoint.refresh_from_db()
+        self.assertTrue(endpoint.last_error.startswith("Refused: "))
+
+
+class ApiTokenPageTests(TestCase):
+    def test_import_scope_is_chosen_when_issuing(self):
+        recruiter = create_recruiter("token_owner")
+        self.client.force_login(recruiter)
+        self.client.post(reverse("recruiter:api_tokens"), {"name": "sync"})
+        response = self.client.post(reverse("recruiter:api_tokens"), {"name": "import", "can_import_jobs": "on"})
+        self.assertContains(response, "Read, import jobs")
+        self.assertContains(response, "Read-only")
+        self.assertEqual(
+            dict(ApiToken.objects.filter(user=recruiter).values_list("name", "can_import_jobs")),
+            {"sync": False, "import": True},
+        )
+
+
+class RecruiterQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Queries per recruiter page and API endpoint; each must stay the same from 10 to 1,000 rows."""
+    namespace = "recruiter"
+    budgets = {
+        "recruiter:dashboard": 11,
+        "recruiter:job_list": 5,
+        "recruiter:job_create": 3,
+        "recruiter:job_import": 3,
+        "recruiter:job_detail": 6,
+        "recruiter:job_edit": 4,
+        "recruiter:application_list": 6,
+        "recruiter:application_detail": 10,
+        "recruiter:schedule_interview": 10,
+        "recruiter:talent_pool": 3,
+        "recruiter:api_tokens": 4,
+        "recruiter:webhook_list": 4,
+        "recruiter:api_jobs": 2,
+        "recruiter:api_applications": 2,
+        "recruiter:api_interviews": 2,
+    }
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from . import views
+from . import api, views
 
 app_name = "recruiter"
 
@@ -8,10 +8,21 @@ urlpatterns = [
     path("", views.dashboard, name="dashboard"),
     path("jobs/", views.job_list, name="job_list"),
     path("jobs/create/", views.job_create, name="job_create"),
+    path("jobs/import/", views.job_import, name="job_import"),
+    path("api-tokens/", views.api_tokens, name="api_tokens"),
+    path("api-tokens/<int:pk>/revoke/", views.api_token_revoke, name="api_token_revoke"),
+    path("webhooks/", views.webhook_list, name="webhook_list"),
+    path("webhooks/<int:pk>/delete/", views.webhook_delete, name="webhook_delete"),
+    path("api/v1/jobs/", api.jobs, name="api_jobs"),
+    path("api/v1/jobs/import/", api.jobs_import, name="api_jobs_import"),
+    path("api/v1/applications/", api.applications, name="api_applications"),
+    path("api/v1/interviews/", api.interviews, name="api_interviews"),
     path("jobs/<int:pk>/", views.job_detail, name="job_detail"),
     path("jobs/<int:pk>/edit/", views.job_edit, name="job_edit"),
     path("jobs/<int:pk>/delete/", views.job_delete, name="job_delete"),
+    path("talent-pool/", views.talent_pool_search, name="talent_pool"),
     path("jobs/<int:job_pk>/applications/", views.application_list, name="application_list"),
+    path("jobs/<int:job_pk>/review-next/", views.review_next, name="review_next"),
     path("applications/<int:pk>/", views.application_detail, name="application_detail"),
     path("applications/<int:pk>/schedule-interview/", views.schedule_interview, name="schedule_interview"),
 ]
@@ -5,13 +5,27 @@ Role check: only users with Profile.role == RECRUITER.
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
+from django.db.models import Count, Q
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
 
+from accounts.db import write_atomic
 from accounts.models import Profile
+from student_portal import ical, resume_text
 from student_portal.models import JobPosting, Application, Interview
+from tpo_portal.talent_pool import talent_pool_context
 
-from .forms import ApplicationStatusForm, InterviewScheduleForm, JobPostingForm
+from . import bulk, review_queue
+from .forms import (
+    ApiTokenForm,
+    ApplicationStatusForm,
+    InterviewScheduleForm,
+    JobImportForm,
+    JobPostingForm,
+    WebhookEndpointForm,
+)
+from .models import ApiToken, OutboxEvent, WebhookEndpoint
 
 
 def _recruiter_required(view_func):
@@ -41,11 +55,13 @@ def dashboard(request: HttpRequest) -> HttpResponse:
 
     recent_applications = applications.select_related("student__user", "job").order_by("-applied_at")[:5]
     recent_jobs = jobs.order_by("-posted_at")[:5]
+    feed = ical.get_or_create_feed(request.user)
 
     context = {
         "stats": stats,
         "recent_applications": recent_applications,
         "recent_jobs": recent_jobs,
+        "calendar_feed_url": request.build_absolute_uri(reverse("student:calendar_feed", args=[feed.token])),
     }
     return render(request, "recruiter_portal/dashboard.html", context)
 
@@ -54,7 +70,6 @@ def dashboard(request: HttpRequest) -> HttpResponse:
 @_recruiter_required
 def job_list(request: HttpRequest) -> HttpResponse:
     """List recruiter's job postings with search and pagination."""
-    from django.db.models import Q
 
     qs = JobPosting.objects.filter(posted_by=request.user).order_by("-posted_at")
     search = request.GET.get("search", "").strip()
@@ -84,6 +99,33 @@ def job_create(request: HttpRequest) -> HttpResponse:
     return render(request, "recruiter_portal/job_form.html", {"form": form, "title": "Create Job Posting"})
 
 
+@login_required
+@_recruiter_required
+def job_import(request: HttpRequest) -> HttpResponse:
+    """Bulk-create job postings from an uploaded CSV/JSON file."""
+    created = None
+    row_errors = []
+    if request.method == "POST":
+        form = JobImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            try:
+                rows = bulk.parse_rows(form.cleaned_data["file"])
+                created, row_errors = bulk.import_job_postings(rows, request.user)
+            except bulk.BulkImportError as exc:
+                messages.error(request, str(exc))
+            else:
+                if created:
+                    messages.success(request, f"Imported {len(created)} job posting(s).")
+                if row_errors:
+                    messages.warning(request, f"{len(row_errors)} row(s) were skipped; see details below.")
+        else:
+            messages.error(request, "Please choose a file to import.")
+    else:
+        form = JobImportForm()
+    context = {"form": form, "created": created, "row_errors": row_errors}
+    return render(request, "recruiter_portal/job_import.html", context)
+
+
 @login_required
 @_recruiter_required
 def job_detail(request: HttpRequest, pk: int) -> HttpResponse:
@@ -129,6 +171,13 @@ def job_delete(request: HttpRequest, pk: int) -> HttpResponse:
     return render(request, "recruiter_portal/job_confirm_delete.html", {"job": job})
 
 
+@login_required
+@_recruiter_required
+def talent_pool_search(request: HttpRequest) -> HttpResponse:
+    """Search the campus talent pool (read-only; counts and matching students)."""
+    return render(request, "recruiter_portal/talent_pool.html", talent_pool_context(request))
+
+
 @login_required
 @_recruiter_required
 def application_list(request: HttpRequest, job_pk: int) -> HttpResponse:
@@ -138,29 +187,46 @@ def application_list(request: HttpRequest, job_pk: int) -> HttpResponse:
     status_filter = request.GET.get("status")
     if status_filter:
         applications = applications.filter(status=status_filter)
+    keywords = request.GET.get("q", "").strip()
+    if keywords:
+        applications = resume_text.filter_by_keywords(applications, keywords)
     paginator = Paginator(applications, 15)
     page_obj = paginator.get_page(request.GET.get("page"))
     context = {
         "job": job,
         "page_obj": page_obj,
         "status_filter": status_filter,
+        "keywords": keywords,
     }
     return render(request, "recruiter_portal/application_list.html", context)
 
 
 @login_required
 @_recruiter_required
+@write_atomic()
 def application_detail(request: HttpRequest, pk: int) -> HttpResponse:
     """View application and update status / schedule interview."""
-    application = get_object_or_404(Application, pk=pk, job__posted_by=request.user)
+    application = get_object_or_404(
+        Application.objects.select_related("review_claimed_by"), pk=pk, job__posted_by=request.user
+    )
     interview = getattr(application, "interview", None)
+    reviewer_key = review_queue.reviewer_key(request)
+    reviewer = review_queue.locked_by_other(application, reviewer_key)
 
     if request.method == "POST":
-        if "update_status" in request.POST:
+        updating = "update_status" in request.POST or "review_next" in request.POST
+        if updating and reviewer:
+            name = "Another reviewer on this account" if reviewer == request.user else reviewer.username
+            messages.error(request, f"{name} is reviewing this application right now.")
+            return redirect("recruiter:application_detail", pk=pk)
+        if updating:
             form = ApplicationStatusForm(request.POST, instance=application)
             if form.is_valid():
                 form.save()
+                review_queue.release(application, reviewer_key)
                 messages.success(request, "Application status updated.")
+                if "review_next" in request.POST:
+                    return _redirect_to_next_review(request, application.job)
                 return redirect("recruiter:application_detail", pk=pk)
         elif "schedule_interview" in request.POST and interview:
             form = InterviewScheduleForm(request.POST, instance=interview)
@@ -187,12 +253,33 @@ def application_detail(request: HttpRequest, pk: int) -> HttpResponse:
         "interview": interview,
         "form": form,
         "interview_form": interview_form,
+        "reviewer": reviewer,
+        "holds_lease": review_queue.holds(application, reviewer_key),
     }
     return render(request, "recruiter_portal/application_detail.html", context)
 
 
+def _redirect_to_next_review(request: HttpRequest, job: JobPosting) -> HttpResponse:
+    application = review_queue.claim_next(job, request.user, review_queue.reviewer_key(request))
+    if application is None:
+        messages.info(request, "No unreviewed applications left for this job.")
+        return redirect("recruiter:application_list", job_pk=job.pk)
+    return redirect("recruiter:application_detail", pk=application.pk)
+
+
+@login_required
+@_recruiter_required
+def review_next(request: HttpRequest, job_pk: int) -> HttpResponse:
+    """Claim the next unreviewed application for this job (time-limited lease) and open it."""
+    job = get_object_or_404(JobPosting, pk=job_pk, posted_by=request.user)
+    if request.method != "POST":
+        return redirect("recruiter:application_list", job_pk=job.pk)
+    return _redirect_to_next_review(request, job)
+
+
 @login_required
 @_recruiter_required
+@write_atomic()
 def schedule_interview(request: HttpRequest, pk: int) -> HttpResponse:
     """Standalone page to schedule interview for an application."""
     application = get_object_or_404(Application, pk=pk, job__posted_by=request.user)
@@ -208,3 +295,69 @@ def schedule_interview(request: HttpRequest, pk: int) -> HttpResponse:
     else:
         form = InterviewScheduleForm(instance=interview)
     return render(request, "recruiter_portal/schedule_interview.html", {"form": form, "application": application})
+
+
+@login_required
+@_recruiter_required
+def api_tokens(request: HttpRequest) -> HttpResponse:
+    """List and create API tokens for the ATS integration API."""
+    new_key = None
+    if request.method == "POST":
+        form = ApiTokenForm(request.POST)
+        if form.is_valid():
+            token, new_key = ApiToken.issue(
+                request.user, form.cleaned_data["name"], can_import_jobs=form.cleaned_data["can_import_jobs"]
+            )
+            messages.success(request, f"Token \"{token.name}\" created. Copy it now; it will not be shown again.")
+            form = ApiTokenForm()
+    else:
+        form = ApiTokenForm()
+    context = {
+        "form": form,
+        "tokens": ApiToken.objects.filter(user=request.user),
+        "new_key": new_key,
+    }
+    return render(request, "recruiter_portal/api_tokens.html", context)
+
+
+@login_required
+@_recruiter_required
+def api_token_revoke(request: HttpRequest, pk: int) -> HttpResponse:
+    """Delete an API token."""
+    token = get_object_or_404(ApiToken, pk=pk, user=request.user)
+    if request.method == "POST":
+        token.delete()
+        messages.success(request, "Token revoked.")
+    return redirect("recruiter:api_tokens")
+
+
+@login_required
+@_recruiter_required
+def webhook_list(request: HttpRequest) -> HttpResponse:
+    """Register ATS webhook endpoints and see their delivery state."""
+    if request.method == "POST":
+        form = WebhookEndpointForm(request.POST)
+        if form.is_valid():
+            endpoint = form.save(commit=False)
+            endpoint.user = request.user
+            endpoint.save()
+            messages.success(request, "Webhook endpoint added.")
+            return redirect("recruiter:webhook_list")
+    else:
+        form = WebhookEndpointForm()
+    endpoints = WebhookEndpoint.objects.filter(user=request.user).annotate(
+        pending=Count("events", filter=Q(events__status=OutboxEvent.Status.PENDING)),
+        failed=Count("events", filter=Q(events__status=OutboxEvent.Status.FAILED)),
+    )
+    return render(request, "recruiter_portal/webhooks.html", {"form": form, "endpoints": endpoints})
+
+
+@login_required
+@_recruiter_required
+def webhook_delete(request: HttpRequest, pk: int) -> HttpResponse:
+    """Remove a webhook endpoint and its undelivered events."""
+    endpoint = get_object_or_404(WebhookEndpoint, pk=pk, user=request.user)
+    if request.method == "POST":
+        endpoint.delete()
+        messages.success(request, "Webhook endpoint removed.")
+    return redirect("recruiter:webhook_list")
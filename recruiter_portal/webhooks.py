@@ -0,0 +1,281 @@
+"""
+Application webhooks through a transactional outbox.
+
+Signal handlers write an OutboxEvent per active endpoint of the job owner
+in the same transaction as the Application change, so an event exists if
+and only if the change committed, and the request never waits on a remote
+ATS. ``deliver_due`` (run by ``manage.py deliver_webhooks``) then sends each
+endpoint's due events as one batched POST over pooled keep-alive
+connections:
+
+    POST <url>
+    Content-Type: application/json
+    X-CPMS-Timestamp: <unix seconds>
+    X-CPMS-Signature: sha256=<hex HMAC-SHA256 of "<timestamp>." + body, keyed with the endpoint secret>
+
+    {"events": [{"id": 1, "type": "application.created", "created_at": "...", "data": {...}}, ...]}
+
+A 2xx response marks the batch delivered. Anything else pushes all of the
+endpoint's pending events back with exponential backoff, which keeps them in
+order, and an event that has failed MAX_ATTEMPTS times is given up on.
+
+Endpoint URLs are recruiter input, so they must be https and resolve only to
+public addresses (``check_url``). That is checked when an endpoint is saved
+and again on every connect, against the addresses actually dialled, so a DNS
+record changed after registration cannot point the worker at an internal
+service. ``settings.WEBHOOK_ALLOW_PRIVATE_URLS`` lifts both rules for local
+testing.
+"""
+import hashlib
+import hmac
+import http.client
+import ipaddress
+import json
+import random
+import socket
+import time
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.utils import timezone
+
+from accounts.db import write_atomic
+
+from .models import OutboxEvent, WebhookEndpoint
+
+APPLICATION_CREATED = "application.created"
+APPLICATION_STATUS_CHANGED = "application.status_changed"
+
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 8
+BACKOFF_BASE = timedelta(seconds=30)
+BACKOFF_MAX = timedelta(hours=6)
+TIMEOUT = 10
+USER_AGENT = "CPMS-Webhooks/1"
+
+
+class UnsafeWebhookURL(ValueError):
+    """An endpoint URL the worker must not post to."""
+
+
+def _allow_private():
+    return getattr(settings, "WEBHOOK_ALLOW_PRIVATE_URLS", False)
+
+
+def public_addresses(host, port):
+    """Resolve ``host`` to getaddrinfo() entries, raising UnsafeWebhookURL unless every address is public."""
+    try:
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    except (socket.gaierror, UnicodeError) as exc:
+        raise UnsafeWebhookURL(f"Cannot resolve {host}: {exc}") from exc
+    if _allow_private():
+        return infos
+    for info in infos:
+        address = ipaddress.ip_address(info[4][0].split("%")[0])
+        if not address.is_global or address.is_multicast:
+            raise UnsafeWebhookURL(f"{host} resolves to a non-public address ({address}).")
+    return infos
+
+
+def check_url(url):
+    """Raise UnsafeWebhookURL unless ``url`` is https on a host with only public addresses."""
+    parts = urlsplit(url)
+    if parts.scheme != "https" and not (_allow_private() and parts.scheme == "http"):
+        raise UnsafeWebhookURL("Webhook URLs must use https.")
+    try:
+        host, port = parts.hostname, parts.port
+    except ValueError as exc:
+        raise UnsafeWebhookURL(str(exc)) from exc
+    if not host:
+        raise UnsafeWebhookURL("Webhook URL has no host.")
+    public_addresses(host, port or (443 if parts.scheme == "https" else 80))
+
+
+def _connect_public(address, timeout=socket._GLOBAL_DEFAULT_TIMEOUT, source_address=None, **kwargs):
+    """socket.create_connection() that only dials the checked addresses, so DNS is resolved once per connect."""
+    host, port = address
+    error = None
+    for family, type_, proto, _, sockaddr in public_addresses(host, port):
+        sock = socket.socket(family, type_, proto)
+        try:
+            if timeout is not socket._GLOBAL_DEFAULT_TIMEOUT:
+                sock.settimeout(timeout)
+            if source_address:
+                sock.bind(source_address)
+            sock.connect(sockaddr)
+            return sock
+        except OSError as exc:
+            sock.close()
+            error = exc
+    raise error or OSError(f"No addresses for {host}")
+
+
+class _PublicHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._create_connection = _connect_public
+
+
+class _PublicHTTPSConnection(http.client.HTTPSConnection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._create_connection = _connect_public
+
+
+# ---- writing (inside the caller's transaction) ----
+
+def endpoints_for_job(job_id):
+    return list(
+        WebhookEndpoint.objects.filter(user__job_postings=job_id, is_active=True).values_list("pk", flat=True)
+    )
+
+
+def application_payload(application, previous_status=None):
+    student = application.student
+    return {
+        "application_id": application.pk,
+        "job_id": application.job_id,
+        "job_title": application.job.title,
+        "status": application.status,
+        "previous_status": previous_status,
+        "student_username": student.user.username,
+        "student_email": student.user.email,
+        "applied_at": application.applied_at,
+        "updated_at": application.updated_at,
+    }
+
+
+def record(endpoint_ids, event_type, payload):
+    """Add one outbox row per endpoint; call inside the transaction that made the change."""
+    data = json.loads(json.dumps(payload, cls=DjangoJSONEncoder))
+    OutboxEvent.objects.bulk_create(
+        [OutboxEvent(endpoint_id=pk, event_type=event_type, payload=data) for pk in endpoint_ids]
+    )
+
+
+# ---- delivery (worker) ----
+
+def sign(secret, timestamp, body):
+    digest = hmac.new(secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+def backoff(attempts):
+    delay = min(BACKOFF_BASE * (2 ** max(attempts - 1, 0)), BACKOFF_MAX)
+    return delay * random.uniform(0.8, 1.2)
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections reused across batches, one per (scheme, host, port)."""
+
+    def __init__(self, timeout=TIMEOUT):
+        self.timeout = timeout
+        self._connections = {}
+
+    def _connection(self, scheme, netloc):
+        key = (scheme, netloc)
+        if key not in self._connections:
+            cls = _PublicHTTPSConnection if scheme == "https" else _PublicHTTPConnection
+            self._connections[key] = cls(netloc, timeout=self.timeout)
+        return key, self._connections[key]
+
+    def post(self, url, body, headers):
+        """POST and return the response status; raises OSError/HTTPException on transport errors."""
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        for retry in (True, False):
+            key, connection = self._connection(parts.scheme, parts.netloc)
+            try:
+                connection.request("POST", path, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                if response.will_close:
+                    self._drop(key)
+                return response.status
+            except (OSError, http.client.HTTPException):
+                self._drop(key)
+                # A kept-alive connection may have been closed by the server; try once on a fresh one.
+                if not retry:
+                    raise
+
+    def _drop(self, key):
+        connection = self._connections.pop(key, None)
+        if connection is not None:
+            connection.close()
+
+    def close(self):
+        for key in list(self._connections):
+            self._drop(key)
+
+
+def _send(pool, endpoint, events):
+    body = json.dumps(
+        {
+            "events": [
+                {"id": event.pk, "type": event.event_type, "created_at": event.created_at, "data": event.payload}
+                for event in events
+            ]
+        },
+        cls=DjangoJSONEncoder,
+        separators=(",", ":"),
+    ).encode()
+    timestamp = str(int(time.time()))
+    headers = {
+        "Content-Type": "application/json",
+        "User-Agent": USER_AGENT,
+        "X-CPMS-Timestamp": timestamp,
+        "X-CPMS-Signature": sign(endpoint.secret, timestamp, body),
+    }
+    try:
+        check_url(endpoint.url)
+        status = pool.post(endpoint.url, body, headers)
+    except UnsafeWebhookURL as exc:
+        return f"Refused: {exc}"
+    except (OSError, http.client.HTTPException) as exc:
+        return f"{type(exc).__name__}: {exc}"
+    return None if 200 <= status < 300 else f"HTTP {status}"
+
+
+def deliver_due(now=None, pool=None, batch_size=BATCH_SIZE):
+    """Send one batch per endpoint with due events; return (delivered, failed) event counts."""
+    now = now or timezone.now()
+    due = OutboxEvent.objects.filter(status=OutboxEvent.Status.PENDING, next_attempt_at__lte=now)
+    endpoint_ids = set(due.values_list("endpoint_id", flat=True))
+    if not endpoint_ids:
+        return 0, 0
+    own_pool = pool is None
+    pool = pool or ConnectionPool()
+    delivered = failed = 0
+    try:
+        for endpoint in WebhookEndpoint.objects.filter(pk__in=endpoint_ids):
+            events = list(due.filter(endpoint=endpoint).order_by("pk")[:batch_size])
+            if not events:
+                continue
+            ids = [event.pk for event in events]
+            error = _send(pool, endpoint, events)
+            with write_atomic():
+                if error is None:
+                    delivered += OutboxEvent.objects.filter(pk__in=ids).update(
+                        status=OutboxEvent.Status.DELIVERED, delivered_at=timezone.now(), attempts=F("attempts") + 1,
+                    )
+                    WebhookEndpoint.objects.filter(pk=endpoint.pk).update(last_success_at=timezone.now(), last_error="")
+                    continue
+                OutboxEvent.objects.filter(pk__in=ids).update(attempts=F("attempts") + 1)
+                failed += OutboxEvent.objects.filter(pk__in=ids, attempts__gte=MAX_ATTEMPTS).update(
+                    status=OutboxEvent.Status.FAILED
+                )
+                # Hold back every pending event of the endpoint so delivery stays in order.
+                attempts = max(event.attempts for event in events) + 1
+                OutboxEvent.objects.filter(endpoint=endpoint, status=OutboxEvent.Status.PENDING).update(
+                    next_attempt_at=now + backoff(attempts)
+                )
+                WebhookEndpoint.objects.filter(pk=endpoint.pk).update(last_error=error[:255])
+    finally:
+        if own_pool:
+            pool.close()
+    return delivered, failed
@@ -0,0 +1,64 @@
+// Live badges and dashboard panels fed by the Server-Sent Events stream.
+(function () {
+  var script = document.currentScript;
+  var url = script && script.dataset.streamUrl;
+  if (!url || !window.EventSource) {
+    return;
+  }
+
+  function setCounts(unread) {
+    document.querySelectorAll("[data-live-count]").forEach(function (badge) {
+      var count = unread[badge.dataset.liveCount] || 0;
+      badge.textContent = count > 99 ? "99+" : String(count);
+      badge.classList.toggle("d-none", count === 0);
+    });
+  }
+
+  function prependNotification(data) {
+    var feed = document.querySelector('[data-live-feed="notifications"]');
+    if (!feed) {
+      return;
+    }
+    var empty = feed.querySelector("[data-live-empty]");
+    if (empty) {
+      empty.remove();
+    }
+    var item = document.createElement("div");
+    item.className = "list-group-item border-0 px-0 py-2";
+    var row = document.createElement("div");
+    row.className = "d-flex align-items-start";
+    var icon = document.createElement("i");
+    icon.className = "bi bi-bell-fill text-primary me-2 mt-1";
+    var body = document.createElement("div");
+    body.className = "flex-grow-1";
+    var title = document.createElement("h6");
+    title.className = "mb-1 fw-semibold";
+    title.textContent = data.title;
+    var text = document.createElement("p");
+    text.className = "text-secondary small mb-0";
+    text.textContent = data.message;
+    var when = document.createElement("small");
+    when.className = "text-muted";
+    when.textContent = "just now";
+    body.append(title, text, when);
+    row.append(icon, body);
+    item.append(row);
+    feed.prepend(item);
+    while (feed.children.length > 5) {
+      feed.lastElementChild.remove();
+    }
+  }
+
+  var source = new EventSource(url);
+  source.addEventListener("counts", function (event) {
+    setCounts(JSON.parse(event.data).unread);
+  });
+  source.addEventListener("notification", function (event) {
+    var data = JSON.parse(event.data);
+    setCounts(data.unread);
+    prependNotification(data);
+  });
+  source.addEventListener("message", function (event) {
+    setCounts(JSON.parse(event.data).unread);
+  });
+})();
@@ -0,0 +1,40 @@
+// Search-as-you-type suggestions for the message recipient field.
+(function () {
+  var script = document.currentScript;
+  var input = document.querySelector('input[list="recipient-options"]');
+  var options = document.getElementById("recipient-options");
+  if (!script || !input || !options) {
+    return;
+  }
+  var url = script.dataset.searchUrl;
+  var timer = null;
+  var controller = null;
+
+  function render(results) {
+    options.replaceChildren.apply(options, results.map(function (row) {
+      var option = document.createElement("option");
+      option.value = row.username;
+      option.label = [row.name, row.role].filter(Boolean).join(" · ");
+      return option;
+    }));
+  }
+
+  input.addEventListener("input", function () {
+    clearTimeout(timer);
+    var term = input.value.trim();
+    if (!term) {
+      render([]);
+      return;
+    }
+    timer = setTimeout(function () {
+      if (controller) {
+        controller.abort();
+      }
+      controller = new AbortController();
+      fetch(url + "?q=" + encodeURIComponent(term), { signal: controller.signal, credentials: "same-origin" })
+        .then(function (response) { return response.json(); })
+        .then(function (data) { render(data.results); })
+        .catch(function () {});
+    }, 150);
+  });
+})();
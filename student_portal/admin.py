@@ -1,8 +1,12 @@
 from django.contrib import admin
+
+from . import skills
 from .models import (
     StudentProfile, Skill, Certification, Resume, PortfolioItem,
     Document, JobPosting, Application, SavedJob, Interview,
-    Message, Notification, SkillGapAnalysis, PracticeTest, MockInterview
+    Message, Notification, SkillGapAnalysis, PracticeTest, MockInterview,
+    CalendarFeed, CanonicalSkill, SkillAlias, ResumeText, Thread, ThreadParticipant, Announcement,
+    NotificationArchive, DigestPreference, EmailDelivery,
 )
 
 
@@ -15,8 +19,27 @@ class StudentProfileAdmin(admin.ModelAdmin):
 
 @admin.register(Skill)
 class SkillAdmin(admin.ModelAdmin):
-    list_display = ['student', 'name', 'proficiency_level']
+    list_display = ['student', 'name', 'canonical', 'proficiency_level']
     list_filter = ['proficiency_level']
+    raw_id_fields = ['canonical']
+
+    def save_model(self, request, obj, form, change):
+        # A renamed skill is re-resolved like SkillForm does, unless the canonical link was also edited.
+        if 'name' in form.changed_data and 'canonical' not in form.changed_data:
+            obj.canonical = skills.resolve(obj.name)
+        super().save_model(request, obj, form, change)
+
+
+class SkillAliasInline(admin.TabularInline):
+    model = SkillAlias
+    extra = 1
+
+
+@admin.register(CanonicalSkill)
+class CanonicalSkillAdmin(admin.ModelAdmin):
+    list_display = ['name', 'key']
+    search_fields = ['name', 'aliases__alias']
+    inlines = [SkillAliasInline]
 
 
 @admin.register(Certification)
@@ -30,10 +53,24 @@ class ResumeAdmin(admin.ModelAdmin):
     list_filter = ['is_default']
 
 
+@admin.register(ResumeText)
+class ResumeTextAdmin(admin.ModelAdmin):
+    list_display = ['resume', 'error', 'extracted_at']
+    search_fields = ['resume__title', 'resume__student__user__username']
+    readonly_fields = ['resume', 'text', 'source_updated_at', 'error', 'extracted_at']
+
+
 @admin.register(PortfolioItem)
 class PortfolioItemAdmin(admin.ModelAdmin):
     list_display = ['student', 'title', 'project_type', 'date_completed']
     list_filter = ['project_type']
+    filter_horizontal = ['skills']
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        if 'technologies' in form.changed_data and 'skills' not in form.changed_data:
+            names = skills.split_technologies(form.instance.technologies)
+            form.instance.skills.set(skills.resolve_many(names).values())
 
 
 @admin.register(Document)
@@ -71,6 +108,21 @@ class InterviewAdmin(admin.ModelAdmin):
 class MessageAdmin(admin.ModelAdmin):
     list_display = ['sender', 'recipient', 'subject', 'is_read', 'sent_at']
     list_filter = ['is_read', 'sent_at']
+    raw_id_fields = ['thread']
+
+
+class ThreadParticipantInline(admin.TabularInline):
+    model = ThreadParticipant
+    extra = 0
+    raw_id_fields = ['user']
+
+
+@admin.register(Thread)
+class ThreadAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'last_sender', 'last_message_at']
+    search_fields = ['subject']
+    readonly_fields = ['key']
+    inlines = [ThreadParticipantInline]
 
 
 @admin.register(Notification)
@@ -79,6 +131,33 @@ class NotificationAdmin(admin.ModelAdmin):
     list_filter = ['notification_type', 'is_read', 'created_at']
 
 
+@admin.register(NotificationArchive)
+class NotificationArchiveAdmin(admin.ModelAdmin):
+    list_display = ['user', 'title', 'notification_type', 'created_at']
+    list_filter = ['notification_type']
+    raw_id_fields = ['user']
+
+
+@admin.register(DigestPreference)
+class DigestPreferenceAdmin(admin.ModelAdmin):
+    list_display = ['user', 'frequency', 'last_sent_at']
+    list_filter = ['frequency']
+
+
+@admin.register(EmailDelivery)
+class EmailDeliveryAdmin(admin.ModelAdmin):
+    list_display = ['user', 'subject', 'status', 'attempts', 'created_at', 'sent_at']
+    list_filter = ['status', 'created_at']
+    raw_id_fields = ['user', 'notification']
+
+
+@admin.register(Announcement)
+class AnnouncementAdmin(admin.ModelAdmin):
+    list_display = ['title', 'role', 'branch', 'graduation_year', 'created_by', 'created_at']
+    list_filter = ['role', 'created_at']
+    search_fields = ['title']
+
+
 @admin.register(SkillGapAnalysis)
 class SkillGapAnalysisAdmin(admin.ModelAdmin):
     list_display = ['student', 'required_skill', 'gap_status']
@@ -95,3 +174,9 @@ class PracticeTestAdmin(admin.ModelAdmin):
 class MockInterviewAdmin(admin.ModelAdmin):
     list_display = ['student', 'preferred_date', 'status', 'requested_at']
     list_filter = ['status', 'requested_at']
+
+
+@admin.register(CalendarFeed)
+class CalendarFeedAdmin(admin.ModelAdmin):
+    list_display = ['user', 'version', 'built_version', 'created_at']
+    search_fields = ['user__username']
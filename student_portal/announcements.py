@@ -0,0 +1,84 @@
+"""
+Campus-wide announcements, fanned out on read.
+
+A broadcast is one Announcement row with an optional audience (role,
+branch, graduation year). Nothing is written per recipient: each user's
+notification list merges the announcements matching them, and a single
+per-user cursor (the highest announcement id they have seen) decides what
+is unread. Users only see announcements made after they joined.
+"""
+from django.contrib.auth.models import User
+from django.db.models import BooleanField, ExpressionWrapper, F, Q, Value
+
+from accounts.models import Profile
+
+from .models import Announcement, AnnouncementCursor, Notification, StudentProfile
+
+
+def for_user(user):
+    """Announcements whose audience includes ``user``."""
+    role = getattr(getattr(user, 'profile', None), 'role', Profile.Role.UNKNOWN)
+    qs = Announcement.objects.filter(created_at__gte=user.date_joined).filter(Q(role='') | Q(role=role))
+    student = StudentProfile.objects.filter(user=user).values('branch', 'graduation_year').first() or {}
+    if student.get('branch'):
+        qs = qs.filter(Q(branch='') | Q(branch__iexact=student['branch']))
+    else:
+        qs = qs.filter(branch='')
+    if student.get('graduation_year'):
+        qs = qs.filter(Q(graduation_year__isnull=True) | Q(graduation_year=student['graduation_year']))
+    else:
+        qs = qs.filter(graduation_year__isnull=True)
+    return qs
+
+
+def audience(announcement, user_ids):
+    """The subset of ``user_ids`` the announcement is addressed to."""
+    users = User.objects.filter(pk__in=user_ids, date_joined__lte=announcement.created_at)
+    if announcement.role:
+        users = users.filter(profile__role=announcement.role)
+    if announcement.branch:
+        users = users.filter(student_profile__branch__iexact=announcement.branch)
+    if announcement.graduation_year:
+        users = users.filter(student_profile__graduation_year=announcement.graduation_year)
+    return list(users.values_list('pk', flat=True))
+
+
+def read_up_to(user):
+    return AnnouncementCursor.objects.filter(user=user).values_list('read_up_to', flat=True).first() or 0
+
+
+def unread_count(user):
+    return for_user(user).filter(pk__gt=read_up_to(user)).count()
+
+
+def mark_read(user, up_to):
+    """Move the user's cursor up to ``up_to``, the newest announcement id they were shown; never backwards."""
+    if not up_to:
+        return
+    if not AnnouncementCursor.objects.filter(user=user, read_up_to__lt=up_to).update(read_up_to=up_to):
+        AnnouncementCursor.objects.get_or_create(user=user, defaults={'read_up_to': up_to})
+
+
+def notification_feed(user, unread_only=False):
+    """
+    The user's notifications and announcements as one queryset of dicts
+    (id, title, message, created_at, kind, read, announcement), newest
+    first. ``announcement`` tells which table ``id`` belongs to.
+    """
+    cursor = read_up_to(user)
+    notifications = Notification.objects.filter(user=user)
+    announcements = for_user(user)
+    if unread_only:
+        notifications = notifications.filter(is_read=False)
+        announcements = announcements.filter(pk__gt=cursor)
+    notifications = notifications.order_by().values(
+        'id', 'title', 'message', 'created_at', kind=F('notification_type'), read=F('is_read'),
+        announcement=Value(False),
+    )
+    announcements = announcements.order_by().values(
+        'id', 'title', 'message', 'created_at',
+        kind=Value('announcement'),
+        read=ExpressionWrapper(Q(pk__lte=cursor), output_field=BooleanField()),
+        announcement=Value(True),
+    )
+    return notifications.union(announcements, all=True).order_by('-created_at')
@@ -0,0 +1,139 @@
+"""
+Email digests for notifications.
+
+Creating a Notification enqueues an EmailDelivery for users with an email
+address and digests switched on. ``send_digests`` picks the users whose
+hourly/daily digest is due, coalesces each one's pending deliveries into a
+single email and sends the whole batch over one SMTP connection, writing
+sent/failed state back to the queue. Any Django email backend works, so the
+locmem and file backends (or a local SMTP sink) are enough to test it.
+"""
+import smtplib
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import DigestPreference, EmailDelivery
+
+BATCH_SIZE = 100
+MAX_ATTEMPTS = 5
+MAX_ITEMS_LISTED = 20
+INTERVALS = {
+    'hourly': timedelta(hours=1),
+    'daily': timedelta(days=1),
+}
+
+
+def enqueue(notification):
+    """Queue ``notification`` for the user's next digest, unless they opted out."""
+    user = notification.user
+    if not user.email:
+        return None
+    frequency = DigestPreference.objects.filter(user=user).values_list('frequency', flat=True).first()
+    if frequency == 'off':
+        return None
+    return EmailDelivery.objects.create(
+        user=user, notification=notification, subject=notification.title, body=notification.message,
+    )
+
+
+def enqueue_many(notifications):
+    """Bulk version of ``enqueue`` for notifications created with bulk_create."""
+    user_ids = {notification.user_id for notification in notifications}
+    wanted = set(
+        User.objects.filter(pk__in=user_ids)
+        .exclude(email='')
+        .exclude(digest_preference__frequency='off')
+        .values_list('pk', flat=True)
+    )
+    return EmailDelivery.objects.bulk_create([
+        EmailDelivery(
+            user_id=notification.user_id, notification=notification,
+            subject=notification.title, body=notification.message,
+        )
+        for notification in notifications
+        if notification.user_id in wanted
+    ])
+
+
+def due_users(now=None):
+    """Users with pending deliveries whose digest interval has elapsed."""
+    now = now or timezone.now()
+    due = Q(digest_preference__isnull=True) | Q(digest_preference__last_sent_at__isnull=True)
+    for frequency, interval in INTERVALS.items():
+        due |= Q(digest_preference__frequency=frequency, digest_preference__last_sent_at__lte=now - interval)
+    pending = EmailDelivery.objects.filter(status='pending').values('user_id')
+    return User.objects.filter(due, pk__in=pending).exclude(email='').exclude(digest_preference__frequency='off')
+
+
+def build_message(user, deliveries, connection=None):
+    count = len(deliveries)
+    lines = [f"Hi {user.get_full_name() or user.username},", "", f"You have {count} new notification(s):", ""]
+    for delivery in deliveries[:MAX_ITEMS_LISTED]:
+        lines.append(f"- {delivery.subject}")
+        if delivery.body:
+            lines.append(f"  {delivery.body}")
+    if count > MAX_ITEMS_LISTED:
+        lines.append(f"...and {count - MAX_ITEMS_LISTED} more in the portal.")
+    subject = deliveries[0].subject if count == 1 else f"{count} new notifications"
+    return EmailMessage(
+        subject=f"[CPMS] {subject}",
+        body="\n".join(lines),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[user.email],
+        connection=connection,
+    )
+
+
+def send_digests(now=None, batch_size=BATCH_SIZE, connection=None):
+    """Send one batch of due digests; return (sent, failed) counts of emails."""
+    now = now or timezone.now()
+    users = list(due_users(now).order_by('pk')[:batch_size])
+    if not users:
+        return 0, 0
+    pending = {}
+    for delivery in EmailDelivery.objects.filter(user__in=users, status='pending').order_by('created_at', 'pk'):
+        pending.setdefault(delivery.user_id, []).append(delivery)
+
+    sent = failed = 0
+    connection = connection or get_connection()
+    try:
+        connection.open()
+    except (smtplib.SMTPException, OSError) as exc:
+        # Server unreachable: every digest in the batch has failed this attempt.
+        _record_failure([delivery.pk for deliveries in pending.values() for delivery in deliveries], exc)
+        return 0, len(pending)
+    try:
+        for user in users:
+            deliveries = pending.get(user.pk)
+            if not deliveries:
+                continue
+            ids = [delivery.pk for delivery in deliveries]
+            try:
+                build_message(user, deliveries, connection).send()
+            except (smtplib.SMTPException, OSError) as exc:
+                failed += 1
+                _record_failure(ids, exc)
+                continue
+            sent += 1
+            EmailDelivery.objects.filter(pk__in=ids).update(
+                status='sent', sent_at=timezone.now(), attempts=F('attempts') + 1, error='',
+            )
+            DigestPreference.objects.update_or_create(user=user, defaults={'last_sent_at': now})
+    finally:
+        try:
+            connection.close()
+        except (smtplib.SMTPException, OSError):
+            pass  # everything is already recorded; a failed QUIT changes nothing
+    return sent, failed
+
+
+def _record_failure(ids, exc):
+    EmailDelivery.objects.filter(pk__in=ids).update(
+        attempts=F('attempts') + 1, error=f"{type(exc).__name__}: {exc}"[:255],
+    )
+    EmailDelivery.objects.filter(pk__in=ids, attempts__gte=MAX_ATTEMPTS).update(status='failed')
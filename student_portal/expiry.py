@@ -0,0 +1,26 @@
+"""
+Deactivate job postings whose application deadline has passed.
+
+Runs in short batched UPDATEs so writers are never blocked for long; safe to
+call repeatedly (from cron via ``manage.py expire_job_postings`` or from a
+scheduler tick).
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .models import JobPosting
+
+BATCH_SIZE = 500
+
+
+def expire_job_postings(now=None, batch_size=BATCH_SIZE):
+    """Switch off expired active postings; return how many were deactivated."""
+    now = now or timezone.now()
+    expired = JobPosting.objects.filter(is_active=True, application_deadline__lte=now)
+    total = 0
+    while True:
+        ids = list(expired.order_by("application_deadline").values_list("pk", flat=True)[:batch_size])
+        if not ids:
+            return total
+        with transaction.atomic():
+            total += JobPosting.objects.filter(pk__in=ids, is_active=True).update(is_active=False)
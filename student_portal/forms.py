@@ -1,7 +1,8 @@
 from django import forms
+from . import recipients, skills
 from .models import (
     StudentProfile, Skill, Certification, Resume, PortfolioItem,
-    Document, Application, SavedJob, Message, MockInterview
+    Document, Application, SavedJob, Message, MockInterview, DigestPreference
 )
 
 
@@ -39,6 +40,13 @@ class SkillForm(forms.ModelForm):
             'name': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'e.g., Python, JavaScript'}),
             'proficiency_level': forms.Select(attrs={'class': 'form-select'}),
         }
+    
+    def save(self, commit=True):
+        skill = super().save(commit=False)
+        skill.canonical = skills.resolve(skill.name)
+        if commit:
+            skill.save()
+        return skill
 
 
 class CertificationForm(forms.ModelForm):
@@ -78,6 +86,11 @@ class PortfolioItemForm(forms.ModelForm):
             'technologies': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'Python, Django, React, etc.'}),
             'date_completed': forms.DateInput(attrs={'type': 'date', 'class': 'form-control'}),
         }
+    
+    def _save_m2m(self):
+        super()._save_m2m()
+        names = skills.split_technologies(self.cleaned_data.get('technologies'))
+        self.instance.skills.set(skills.resolve_many(names).values())
 
 
 class DocumentForm(forms.ModelForm):
@@ -99,17 +112,60 @@ class ApplicationForm(forms.ModelForm):
             'resume': forms.Select(attrs={'class': 'form-select'}),
             'cover_letter': forms.Textarea(attrs={'rows': 6, 'class': 'form-control', 'placeholder': 'Write a cover letter...'}),
         }
+    
+    def __init__(self, *args, student, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Only the applicant's own resumes, labelled by title (Resume.__str__ loads the student's user).
+        self.fields['resume'].queryset = Resume.objects.filter(student=student)
+        self.fields['resume'].label_from_instance = lambda resume: resume.title
 
 
 class MessageForm(forms.ModelForm):
+    # Typed username (with search-as-you-type suggestions) instead of a <select>
+    # of every user; validated by a single lookup within the sender's scope.
+    recipient = forms.ModelChoiceField(
+        queryset=None,
+        to_field_name='username',
+        widget=forms.TextInput(attrs={
+            'class': 'form-control',
+            'autocomplete': 'off',
+            'list': 'recipient-options',
+            'placeholder': 'Start typing a username',
+        }),
+        error_messages={'invalid_choice': "You can't message that user."},
+    )
+    
     class Meta:
         model = Message
-        fields = ['recipient', 'subject', 'body']
+        # recipient is set in save() so model validation doesn't look the user up again
+        fields = ['subject', 'body']
         widgets = {
-            'recipient': forms.Select(attrs={'class': 'form-select'}),
             'subject': forms.TextInput(attrs={'class': 'form-control'}),
             'body': forms.Textarea(attrs={'rows': 6, 'class': 'form-control'}),
         }
+    
+    def __init__(self, *args, user, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['recipient'].queryset = recipients.allowed_recipients(user)
+        self.order_fields(['recipient', 'subject', 'body'])
+    
+    def save(self, commit=True):
+        self.instance.recipient = self.cleaned_data['recipient']
+        return super().save(commit)
+
+
+class MessageReplyForm(forms.Form):
+    body = forms.CharField(label='Reply', widget=forms.Textarea(attrs={'rows': 3, 'class': 'form-control'}))
+
+
+class DigestPreferenceForm(forms.ModelForm):
+    class Meta:
+        model = DigestPreference
+        fields = ['frequency']
+        labels = {'frequency': 'Email digest'}
+        widgets = {
+            'frequency': forms.Select(attrs={'class': 'form-select form-select-sm'}),
+        }
 
 
 class MockInterviewForm(forms.ModelForm):
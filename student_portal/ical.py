@@ -0,0 +1,165 @@
+"""
+iCalendar (.ics) interview feeds for students and recruiters.
+
+Each user has one CalendarFeed row. Interview changes bump its version
+(see signals.py); the feed body is rebuilt lazily on the next fetch. The
+(etag, body) pair is cached under a key that includes the version, and the
+current version is itself kept in the cache, so a polling client is
+answered without touching the database. A bump drops the cached version
+at once and again when the transaction commits, and the next fetch reads
+it back from the row. With a per-process cache other workers notice a bump
+only when their copy of the version expires, after at most VERSION_TIMEOUT;
+a shared cache (Redis, Memcached) makes it immediate everywhere.
+"""
+import secrets
+from datetime import timedelta, timezone as dt_timezone
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Q
+
+from .models import CalendarFeed, Interview
+
+CACHE_PREFIX = "calendar_feed:"
+CACHE_TIMEOUT = 60 * 60
+VERSION_TIMEOUT = 60
+INTERVIEW_DURATION = timedelta(hours=1)
+
+
+def _cache_key(token, version):
+    return f"{CACHE_PREFIX}{token}:{version}"
+
+
+def _version_key(token):
+    return f"{CACHE_PREFIX}{token}:version"
+
+
+def get_or_create_feed(user):
+    """Return the user's feed, creating it with a fresh token on first use."""
+    feed, created = CalendarFeed.objects.get_or_create(
+        user=user, defaults={"token": secrets.token_urlsafe(24)}
+    )
+    return feed
+
+
+def touch_feeds(user_ids):
+    """Mark the feeds of the given users as stale."""
+    user_ids = {uid for uid in user_ids if uid}
+    if not user_ids:
+        return
+    feeds = CalendarFeed.objects.filter(user_id__in=user_ids)
+    keys = [_version_key(token) for token in feeds.values_list("token", flat=True)]
+    if not keys:
+        return
+    # Cached bodies are keyed by version, so the bump alone retires them.
+    feeds.update(version=F("version") + 1)
+    # Drop the cached versions now, and again once the bump is visible, in case
+    # a fetch in between cached the old one.
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def _escape(value):
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def _fold(line):
+    """Fold a content line to 75 octets as required by RFC 5545."""
+    raw = line.encode("utf-8")
+    if len(raw) <= 75:
+        return line
+    parts = []
+    while len(raw) > 75:
+        cut = 75 if not parts else 74
+        # Never split a multi-byte UTF-8 sequence.
+        while cut > 0 and (raw[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(raw[:cut].decode("utf-8"))
+        raw = raw[cut:]
+    parts.append(raw.decode("utf-8"))
+    return "\r\n ".join(parts)
+
+
+def _utc(value):
+    return value.astimezone(dt_timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def build_ics(user):
+    """Render the VCALENDAR for every interview the user takes part in."""
+    interviews = (
+        Interview.objects.filter(
+            Q(application__student__user=user) | Q(application__job__posted_by=user)
+        )
+        .select_related("application__job", "application__student__user")
+        .order_by("scheduled_at")
+    )
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        "PRODID:-//CPMS//Interview Schedule//EN",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        "X-WR-CALNAME:CPMS Interviews",
+    ]
+    for interview in interviews:
+        job = interview.application.job
+        student = interview.application.student.user
+        if student.pk == user.pk:
+            summary = f"Interview: {job.title} ({job.company_name})"
+        else:
+            summary = f"Interview: {student.get_full_name() or student.username} - {job.title}"
+        description = interview.notes
+        if interview.meeting_link:
+            description = f"{description}\n{interview.meeting_link}".strip()
+        lines += [
+            "BEGIN:VEVENT",
+            f"UID:interview-{interview.pk}@cpms",
+            f"DTSTAMP:{_utc(interview.created_at)}",
+            f"DTSTART:{_utc(interview.scheduled_at)}",
+            f"DTEND:{_utc(interview.scheduled_at + INTERVIEW_DURATION)}",
+            f"SUMMARY:{_escape(summary)}",
+            "STATUS:CANCELLED" if interview.status == "cancelled" else "STATUS:CONFIRMED",
+        ]
+        if interview.location:
+            lines.append(f"LOCATION:{_escape(interview.location)}")
+        if description:
+            lines.append(f"DESCRIPTION:{_escape(description)}")
+        if interview.meeting_link:
+            lines.append(f"URL:{interview.meeting_link}")
+        lines.append("END:VEVENT")
+    lines.append("END:VCALENDAR")
+    return "".join(_fold(line) + "\r\n" for line in lines)
+
+
+def get_feed(token):
+    """
+    Return (etag, body) for a feed token, or None if the token is unknown.
+
+    Served from the cache when the version and an entry for it are cached;
+    otherwise the stored body is reused unless the feed's version moved on
+    since it was built.
+    """
+    version = cache.get(_version_key(token))
+    if version is None:
+        version = CalendarFeed.objects.filter(token=token).values_list("version", flat=True).first()
+        if version is None:
+            return None
+        cache.set(_version_key(token), version, VERSION_TIMEOUT)
+    entry = cache.get(_cache_key(token, version))
+    if entry is not None:
+        return entry
+    feed = CalendarFeed.objects.select_related("user").get(token=token)
+    if feed.built_version != feed.version:
+        feed.ics = build_ics(feed.user)
+        feed.built_version = feed.version
+        CalendarFeed.objects.filter(pk=feed.pk).update(ics=feed.ics, built_version=feed.built_version)
+    entry = (f'"{feed.pk}-{feed.built_version}"', feed.ics)
+    cache.set(_cache_key(token, feed.built_version), entry, CACHE_TIMEOUT)
+    return entry
@@ -0,0 +1,203 @@
+"""
+Surge-mode (write-behind) application intake.
+
+In the last APPLICATION_SURGE_HOURS before a job's deadline, an apply that
+passes the usual checks in ``job_detail`` is not written to the database.
+Instead it is appended as one JSON line to an intake log and acknowledged
+at once. ``append`` fsyncs each line, so an acknowledged apply survives a
+crash. Each web process writes its own hourly segment file
+(``intake-<hour>-<host>-<pid>.log``), so processes never interleave writes
+and no locking is needed between them.
+
+``drain`` (run by ``manage.py commit_applications``) reads the segments
+from a checkpointed offset and commits a batch of records as Application
+rows in one transaction. The new offset is saved in that same transaction,
+so every record is committed exactly once, even across crashes. Duplicates
+(double submits) are dropped against ``unique_together``, and the resume
+uploaded with a dropped record is deleted. Each student is notified of
+the result through the normal Notification path. The deadline was checked
+when the apply arrived; a job that has since been swept inactive still
+gets the application. Run a single committer.
+"""
+import json
+import os
+import socket
+import threading
+import uuid
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.db import write_atomic
+
+from .models import Application, IntakeCheckpoint, JobPosting, Notification, Resume, StudentProfile
+
+BATCH_SIZE = 500
+SEGMENT_FORMAT = '%Y%m%d%H'
+# A segment is only deleted once writers have long moved on to a newer hour.
+SEGMENT_GRACE = timedelta(minutes=10)
+
+_lock = threading.Lock()
+
+
+def intake_dir():
+    return Path(settings.APPLICATION_INTAKE_DIR)
+
+
+def surge_active(job, now=None):
+    """Whether applies to ``job`` go through the intake log right now."""
+    hours = getattr(settings, 'APPLICATION_SURGE_HOURS', 0)
+    if not hours or job.application_deadline is None:
+        return False
+    now = now or timezone.now()
+    return now < job.application_deadline <= now + timedelta(hours=hours)
+
+
+def _segment_name(now):
+    return f"intake-{now:{SEGMENT_FORMAT}}-{socket.gethostname()}-{os.getpid()}.log"
+
+
+def save_upload(uploaded_file):
+    """Store an uploaded resume where Resume.file would have put it; return its name."""
+    name = Resume._meta.get_field('file').generate_filename(None, uploaded_file.name)
+    return default_storage.save(name, uploaded_file)
+
+
+def append(student, job, resume=None, cover_letter='', resume_file=None, now=None):
+    """Durably log one apply; returns the record id."""
+    now = now or timezone.now()
+    record = {
+        'id': uuid.uuid4().hex,
+        'received_at': now.isoformat(),
+        'student_id': student.pk,
+        'job_id': job.pk,
+        'resume_id': resume.pk if resume else None,
+        'resume_file': resume_file,
+        'cover_letter': cover_letter,
+    }
+    line = json.dumps(record, separators=(',', ':')).encode() + b'\n'
+    directory = intake_dir()
+    with _lock:
+        directory.mkdir(parents=True, exist_ok=True)
+        fd = os.open(directory / _segment_name(now), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o640)
+        try:
+            view = memoryview(line)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    return record['id']
+
+
+# ---- committer ----
+
+def read_batch(path, offset, limit):
+    """Up to ``limit`` complete records after ``offset``; returns (records, new offset)."""
+    records = []
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b'\n'):
+                break  # a write still in progress; read it next time
+            offset += len(line)
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+            if len(records) >= limit:
+                break
+    return records, offset
+
+
+def _result(student, job):
+    if job is None:
+        title = "Application not submitted"
+        message = "A job you applied to was removed before your application could be submitted."
+    else:
+        title = f"Application submitted: {job.title}"
+        message = f"Your application for {job.title} at {job.company_name} has been submitted."
+    return Notification(user_id=student.user_id, title=title, message=message, notification_type='application_update')
+
+
+def _discard_upload(record):
+    """Delete the stored resume of a record that will not become an Application, once the batch commits."""
+    name = record.get('resume_file')
+    if name:
+        transaction.on_commit(lambda: default_storage.delete(name))
+
+
+def commit_records(records):
+    """Create Applications for one batch; call inside a transaction. Returns (created, duplicate, rejected)."""
+    students = StudentProfile.objects.in_bulk({r['student_id'] for r in records})
+    jobs = JobPosting.objects.in_bulk({r['job_id'] for r in records})
+    resumes = set(
+        Resume.objects.filter(pk__in={r['resume_id'] for r in records if r.get('resume_id')})
+        .values_list('pk', 'student_id')
+    )
+    seen = set(
+        Application.objects.filter(
+            student_id__in=students, job_id__in=jobs,
+        ).values_list('student_id', 'job_id')
+    )
+    created = duplicate = rejected = 0
+    for record in records:
+        student, job = students.get(record['student_id']), jobs.get(record['job_id'])
+        if student is None:
+            rejected += 1
+            _discard_upload(record)
+            continue
+        if job is None:
+            rejected += 1
+            _discard_upload(record)
+            _result(student, None).save()
+            continue
+        if (student.pk, job.pk) in seen:
+            duplicate += 1
+            _discard_upload(record)
+            continue
+        seen.add((student.pk, job.pk))
+        resume_id = record.get('resume_id')
+        if (resume_id, student.pk) not in resumes:
+            resume_id = None
+        if record.get('resume_file'):
+            resume_id = Resume.objects.create(
+                student=student, title=f"Resume for {job.title[:100]}", file=record['resume_file'],
+            ).pk
+        Application.objects.create(
+            student=student, job=job, resume_id=resume_id, cover_letter=record.get('cover_letter', ''),
+        )
+        _result(student, job).save()
+        created += 1
+    return created, duplicate, rejected
+
+
+def drain(batch_size=BATCH_SIZE, now=None):
+    """Commit everything logged so far; returns (created, duplicate, rejected) counts."""
+    now = now or timezone.now()
+    directory = intake_dir()
+    totals = [0, 0, 0]
+    if not directory.exists():
+        return tuple(totals)
+    current = f"intake-{now - SEGMENT_GRACE:{SEGMENT_FORMAT}}"
+    for path in sorted(directory.glob('intake-*.log')):
+        checkpoint, _ = IntakeCheckpoint.objects.get_or_create(segment=path.name)
+        offset = checkpoint.offset
+        while True:
+            records, new_offset = read_batch(path, offset, batch_size)
+            if new_offset == offset:
+                break
+            with write_atomic():
+                counts = commit_records(records) if records else (0, 0, 0)
+                IntakeCheckpoint.objects.filter(pk=checkpoint.pk).update(offset=new_offset)
+            totals = [total + count for total, count in zip(totals, counts)]
+            offset = new_offset
+        # Segments are named by hour, so an older hour gets no more writes.
+        if path.name < current and offset >= path.stat().st_size:
+            path.unlink()
+            checkpoint.delete()
+    return tuple(totals)
@@ -0,0 +1,123 @@
+"""
+Live updates over Server-Sent Events.
+
+An in-process pub/sub: each open ``/student/events/`` connection registers
+an asyncio queue for its user, and ``publish`` (called from signal handlers
+after commit, in any thread) hands events to those queues on the event
+loop. Connections are plain async generators, so one ASGI worker holds
+thousands of idle streams without a thread each.
+
+The stream is off unless LIVE_UPDATES is set, and it answers 204 to any
+request that did not come through ASGI, so a WSGI worker is never held
+open. Events only reach connections in the same process: run a single ASGI
+worker (``uvicorn config.asgi:application``) or put a shared broker in
+front of this when scaling out. Every event carries the absolute unread counts, so a
+dropped event is corrected by the next one.
+"""
+import asyncio
+import json
+import threading
+from collections import defaultdict
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+
+from . import announcements
+from .models import Notification, ThreadParticipant
+
+HEARTBEAT_SECONDS = 20
+RETRY_MS = 5000
+QUEUE_SIZE = 100
+
+_lock = threading.Lock()
+_subscribers = defaultdict(set)  # user id -> {(loop, queue)}
+
+
+def subscribe(user_id):
+    subscription = (asyncio.get_running_loop(), asyncio.Queue(QUEUE_SIZE))
+    with _lock:
+        _subscribers[user_id].add(subscription)
+    return subscription
+
+
+def unsubscribe(user_id, subscription):
+    with _lock:
+        subscriptions = _subscribers.get(user_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del _subscribers[user_id]
+
+
+def connection_count():
+    with _lock:
+        return sum(len(subscriptions) for subscriptions in _subscribers.values())
+
+
+def _offer(queue, event):
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        pass
+
+
+def publish(user_id, event_type, data):
+    """Send an event to every open stream of ``user_id``; safe to call from any thread."""
+    with _lock:
+        subscriptions = list(_subscribers.get(user_id, ()))
+    for loop, queue in subscriptions:
+        try:
+            loop.call_soon_threadsafe(_offer, queue, (event_type, data))
+        except RuntimeError:
+            # The loop has shut down; its generator will unsubscribe.
+            pass
+
+
+def has_subscribers(user_id):
+    with _lock:
+        return user_id in _subscribers
+
+
+def notify(user_id, event_type, data):
+    """Publish with fresh unread counts, if the user has a stream open here."""
+    if has_subscribers(user_id):
+        publish(user_id, event_type, dict(data, unread=unread_counts(user_id)))
+
+
+def subscribed_user_ids():
+    with _lock:
+        return list(_subscribers)
+
+
+def unread_counts(user_id):
+    user = User.objects.select_related('profile').get(pk=user_id)
+    return {
+        'notifications': (
+            Notification.objects.filter(user_id=user_id, is_read=False).count()
+            + announcements.unread_count(user)
+        ),
+        'messages': ThreadParticipant.objects.filter(user_id=user_id, unread_count__gt=0).count(),
+    }
+
+
+def format_event(event_type, data):
+    return f"event: {event_type}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def stream(user_id):
+    """Async generator of SSE frames for one connection."""
+    subscription = subscribe(user_id)
+    queue = subscription[1]
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        counts = await sync_to_async(unread_counts)(user_id)
+        yield format_event('counts', {'unread': counts})
+        while True:
+            try:
+                event_type, data = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            yield format_event(event_type, data)
+    finally:
+        unsubscribe(user_id, subscription)
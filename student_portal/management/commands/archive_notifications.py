@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from student_portal.retention import BATCH_SIZE, RETENTION_DAYS, archive_notifications
+
+
+class Command(BaseCommand):
+    help = "Move read notifications older than the retention period into the archive table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=RETENTION_DAYS)
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            "--pause", type=float, default=0, help="Seconds to sleep between batches to let other writers in."
+        )
+
+    def handle(self, *args, days, batch_size, pause, **options):
+        count = archive_notifications(days=days, batch_size=batch_size, pause=pause)
+        self.stdout.write(f"Archived {count} notification(s) older than {days} days.")
@@ -0,0 +1,69 @@
+"""
+Resolve existing Skill names and PortfolioItem.technologies against the
+canonical skill taxonomy.
+
+Works through the tables in primary-key order, one short transaction per
+batch, and only touches rows that have not been resolved yet, so it can be
+interrupted and re-run.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from student_portal import skills
+from student_portal.models import PortfolioItem, Skill
+
+
+class Command(BaseCommand):
+    help = "Link existing skills and portfolio technologies to canonical skills."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, batch_size, **options):
+        self.stdout.write(f"Skills resolved: {self.backfill_skills(batch_size)}")
+        self.stdout.write(f"Portfolio items resolved: {self.backfill_portfolio(batch_size)}")
+
+    def backfill_skills(self, batch_size):
+        total = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                Skill.objects.filter(canonical__isnull=True, pk__gt=last_pk).order_by("pk").only("pk", "name")[:batch_size]
+            )
+            if not batch:
+                return total
+            last_pk = batch[-1].pk
+            resolved = skills.resolve_many(skill.name for skill in batch)
+            for skill in batch:
+                skill.canonical = resolved.get(skills.skill_key(skill.name))
+            with transaction.atomic():
+                Skill.objects.bulk_update(batch, ["canonical"])
+            total += len(batch)
+
+    def backfill_portfolio(self, batch_size):
+        Through = PortfolioItem.skills.through
+        total = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                PortfolioItem.objects.filter(skills__isnull=True, pk__gt=last_pk)
+                .exclude(technologies="")
+                .order_by("pk")
+                .values_list("pk", "technologies")[:batch_size]
+            )
+            if not batch:
+                return total
+            last_pk = batch[-1][0]
+            names = {pk: skills.split_technologies(text) for pk, text in batch}
+            resolved = skills.resolve_many(name for item_names in names.values() for name in item_names)
+            links = {
+                (pk, resolved[skills.skill_key(name)].pk)
+                for pk, item_names in names.items()
+                for name in item_names
+            }
+            with transaction.atomic():
+                Through.objects.bulk_create(
+                    [Through(portfolioitem_id=pk, canonicalskill_id=skill_id) for pk, skill_id in links],
+                    ignore_conflicts=True,
+                )
+            total += len(batch)
@@ -0,0 +1,20 @@
+"""
+Group existing messages into conversation threads by participant pair and
+subject, and fill in the inbox summary and unread counts.
+
+Only messages without a thread are touched, one short transaction per batch,
+so it can be interrupted and re-run.
+"""
+from django.core.management.base import BaseCommand
+
+from student_portal import threads
+
+
+class Command(BaseCommand):
+    help = "Attach existing messages to conversation threads."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, batch_size, **options):
+        self.stdout.write(f"Messages threaded: {threads.backfill(batch_size)}")
@@ -0,0 +1,82 @@
+"""
+Measure sustained apply throughput with and without surge-mode intake.
+
+    python manage.py bench_application_intake --students 1000
+
+Each student applies once through ``job_detail`` via the test client, first
+on the direct path and then on the surge path, followed by a drain of the
+intake log. Requests run one after another, so the figures are per-request
+cost; concurrent writers only widen the gap on SQLite. Everything runs inside
+a rolled-back transaction with a temporary intake directory, so the database
+is left untouched.
+"""
+import tempfile
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Profile
+from student_portal import intake
+from student_portal.models import Application, JobPosting, Resume, StudentProfile
+
+
+class Command(BaseCommand):
+    help = "Benchmark direct vs surge-mode (intake log) applies (rolled back afterwards)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=500)
+
+    def _applies(self, clients, job, resumes):
+        url = reverse("student:job_detail", args=[job.pk])
+        started = time.perf_counter()
+        for client, resume in zip(clients, resumes):
+            response = client.post(url, {"apply": "1", "resume": resume.pk, "cover_letter": "Keen to join."})
+            if response.status_code != 302:
+                raise CommandError(f"Apply failed with HTTP {response.status_code}")
+        return time.perf_counter() - started
+
+    def handle(self, *args, students, **options):
+        User = get_user_model()
+        with tempfile.TemporaryDirectory() as directory, override_settings(ALLOWED_HOSTS=["testserver"]), \
+                transaction.atomic():
+            deadline = timezone.now() + timedelta(minutes=30)
+            recruiter = User.objects.create_user(username="__bench_intake_recruiter__")
+            jobs = [
+                JobPosting.objects.create(
+                    title=f"Benchmark Role {i}", company_name="Benchmark Corp", description="-",
+                    requirements="-", posted_by=recruiter, application_deadline=deadline,
+                )
+                for i in range(2)
+            ]
+            clients, resumes = [], []
+            for i in range(students):
+                user = User.objects.create_user(username=f"__bench_intake_{i}__")
+                Profile.objects.filter(user=user).update(role=Profile.Role.STUDENT)
+                student, _ = StudentProfile.objects.get_or_create(user=user)
+                resumes.append(Resume.objects.create(student=student, title="Resume", content="-"))
+                client = Client()
+                client.force_login(user)
+                clients.append(client)
+
+            with override_settings(APPLICATION_SURGE_HOURS=0):
+                direct = self._applies(clients, jobs[0], resumes)
+            with override_settings(APPLICATION_SURGE_HOURS=1, APPLICATION_INTAKE_DIR=directory):
+                surge = self._applies(clients, jobs[1], resumes)
+                started = time.perf_counter()
+                created, duplicate, rejected = intake.drain()
+                drain = time.perf_counter() - started
+            committed = Application.objects.filter(job=jobs[1]).count()
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"Direct apply:   {students} in {direct:.2f} s ({students / direct:.0f} applies/s)")
+        self.stdout.write(f"Surge intake:   {students} in {surge:.2f} s ({students / surge:.0f} applies/s acknowledged)")
+        self.stdout.write(
+            f"Committer:      {created} committed, {duplicate} duplicate(s), {rejected} rejected "
+            f"in {drain:.2f} s ({created / drain:.0f} applies/s); {committed} rows present"
+        )
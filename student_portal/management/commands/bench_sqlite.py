@@ -0,0 +1,147 @@
+"""
+Concurrent read/write throughput on SQLite, with and without the production
+connection profile (settings.SQLITE_PRODUCTION_OPTIONS).
+
+    python manage.py bench_sqlite --writers 4 --readers 4 --seconds 5
+
+Each run uses a scratch database file shaped like the application tables.
+Writer processes run apply-shaped transactions: check for an existing
+application, insert one, and bump a counter on the job. Reader processes
+page through a job's applicants. Connections are opened the way Django
+opens them (init_command statements, then BEGIN <transaction_mode>), so
+the numbers reflect the settings as configured; in the production run the
+writers begin with IMMEDIATE, as accounts.db.write_atomic does. Failed
+operations are the "database is locked" errors a request would have raised.
+"""
+import multiprocessing
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+SCHEMA = """
+CREATE TABLE job (id INTEGER PRIMARY KEY, title TEXT, applicants INTEGER NOT NULL DEFAULT 0);
+CREATE TABLE application (
+    id INTEGER PRIMARY KEY, student_id INTEGER NOT NULL, job_id INTEGER NOT NULL,
+    status TEXT NOT NULL, cover_letter TEXT NOT NULL, applied_at REAL NOT NULL,
+    UNIQUE (student_id, job_id)
+);
+CREATE INDEX application_job ON application (job_id, applied_at);
+"""
+JOBS = 50
+
+
+def connect(path, options):
+    """Open a connection like Django's SQLite backend would with these OPTIONS."""
+    connection = sqlite3.connect(path, timeout=options.get("timeout", 5), isolation_level=None)
+    for statement in options.get("init_command", "").split(";"):
+        if statement.strip():
+            connection.execute(statement)
+    return connection, f"BEGIN {options.get('transaction_mode') or ''}".strip()
+
+
+def _writer(path, options, seconds, seed, results):
+    connection, begin = connect(path, options)
+    rng = random.Random(seed)
+    done = failed = 0
+    student = seed * 10_000_000
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        student += 1
+        job = rng.randint(1, JOBS)
+        try:
+            connection.execute(begin)
+            exists = connection.execute(
+                "SELECT 1 FROM application WHERE student_id = ? AND job_id = ?", (student, job)
+            ).fetchone()
+            if not exists:
+                connection.execute(
+                    "INSERT INTO application (student_id, job_id, status, cover_letter, applied_at) "
+                    "VALUES (?, ?, 'applied', ?, ?)",
+                    (student, job, "x" * 400, time.time()),
+                )
+                connection.execute("UPDATE job SET applicants = applicants + 1 WHERE id = ?", (job,))
+            connection.execute("COMMIT")
+            done += 1
+        except sqlite3.OperationalError:
+            if connection.in_transaction:
+                connection.execute("ROLLBACK")
+            failed += 1
+    results.put(("write", done, failed))
+
+
+def _reader(path, options, seconds, seed, results):
+    connection, begin = connect(path, options)
+    rng = random.Random(seed)
+    done = failed = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        try:
+            connection.execute(
+                "SELECT a.id, a.student_id, a.status, j.title FROM application a JOIN job j ON j.id = a.job_id "
+                "WHERE a.job_id = ? ORDER BY a.applied_at DESC LIMIT 20",
+                (rng.randint(1, JOBS),),
+            ).fetchall()
+            done += 1
+        except sqlite3.OperationalError:
+            failed += 1
+    results.put(("read", done, failed))
+
+
+class Command(BaseCommand):
+    help = "Benchmark concurrent SQLite reads/writes with default vs production connection options."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--writers", type=int, default=4)
+        parser.add_argument("--readers", type=int, default=4)
+        parser.add_argument("--seconds", type=float, default=5.0)
+        parser.add_argument("--rows", type=int, default=20000, help="Applications preloaded before the run.")
+
+    def _prepare(self, path, options, rows):
+        connection, _ = connect(path, options)
+        connection.executescript(SCHEMA)
+        connection.executemany("INSERT INTO job (id, title) VALUES (?, ?)", [(i, f"Job {i}") for i in range(1, JOBS + 1)])
+        connection.execute("BEGIN")
+        connection.executemany(
+            "INSERT INTO application (student_id, job_id, status, cover_letter, applied_at) "
+            "VALUES (?, ?, 'applied', '', ?)",
+            [(i, i % JOBS + 1, float(i)) for i in range(rows)],
+        )
+        connection.execute("COMMIT")
+        connection.close()
+
+    def _run(self, label, options, writers, readers, seconds, rows):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "bench.sqlite3")
+            self._prepare(path, options, rows)
+            context = multiprocessing.get_context("fork")
+            results = context.Queue()
+            processes = [
+                context.Process(target=_writer, args=(path, options, seconds, i + 1, results)) for i in range(writers)
+            ] + [
+                context.Process(target=_reader, args=(path, options, seconds, i + 1, results)) for i in range(readers)
+            ]
+            for process in processes:
+                process.start()
+            totals = {"write": [0, 0], "read": [0, 0]}
+            for _ in processes:
+                kind, done, failed = results.get()
+                totals[kind][0] += done
+                totals[kind][1] += failed
+            for process in processes:
+                process.join()
+        for kind in ("write", "read"):
+            done, failed = totals[kind]
+            self.stdout.write(
+                f"{label:<11} {kind}s: {done / seconds:>8.0f}/s ok, {failed} failed (database is locked)"
+            )
+
+    def handle(self, *args, writers, readers, seconds, rows, **options):
+        self.stdout.write(f"{writers} writer and {readers} reader processes, {seconds:g} s each run")
+        self._run("default", {}, writers, readers, seconds, rows)
+        production = {**settings.SQLITE_PRODUCTION_OPTIONS, "transaction_mode": "IMMEDIATE"}
+        self._run("production", production, writers, readers, seconds, rows)
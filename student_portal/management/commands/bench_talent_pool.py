@@ -0,0 +1,72 @@
+"""
+Time talent-pool bitmap queries over a synthetic population.
+
+    python manage.py bench_talent_pool --students 50000
+
+The index is loaded from generated rows, so no database data is needed.
+"""
+import random
+import time
+from collections import defaultdict
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from student_portal.talent_pool import TalentPoolIndex, TalentQuery
+
+
+class Command(BaseCommand):
+    help = "Benchmark the talent-pool bitmap index with synthetic students."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=50000)
+        parser.add_argument("--skills", type=int, default=300, help="Distinct canonical skills.")
+        parser.add_argument("--repeat", type=int, default=200)
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, students, skills, repeat, seed, **options):
+        rng = random.Random(seed)
+        branches = ["CSE", "IT", "ECE", "EEE", "ME", "CE", "CHE"]
+        rows = [
+            {
+                "id": sid,
+                "branch": rng.choice(branches),
+                "year": rng.choice(["1st", "2nd", "3rd", "4th"]),
+                "graduation_year": rng.choice([2026, 2027, 2028, 2029]),
+                "cgpa": Decimal(rng.randint(500, 1000)) / 100,
+                "placement_eligible": rng.random() < 0.9,
+            }
+            for sid in range(1, students + 1)
+        ]
+        skill_map = defaultdict(set)
+        for sid in range(1, students + 1):
+            # Skewed popularity: low skill ids (Python, SQL, ...) are common.
+            for _ in range(rng.randint(2, 10)):
+                skill_map[sid].add(min(int(rng.expovariate(1 / 20)) + 1, skills))
+        placed = {sid for sid in range(1, students + 1) if rng.random() < 0.2}
+
+        index = TalentPoolIndex()
+        started = time.perf_counter()
+        index.load(rows, skill_map, placed)
+        self.stdout.write(f"Built index for {students} students in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+        queries = {
+            "CSE|IT, cgpa>=7.5, skills 1&2, eligible, not placed": TalentQuery(
+                branches=["CSE", "IT"], min_cgpa=Decimal("7.5"), skill_ids=[1, 2],
+                eligible_only=True, exclude_placed=True,
+            ),
+            "single skill": TalentQuery(skill_ids=[3]),
+            "grad 2027, 4 skills": TalentQuery(graduation_years=[2027], skill_ids=[1, 2, 3, 4]),
+            "everyone not placed": TalentQuery(exclude_placed=True),
+        }
+        for label, q in queries.items():
+            timings = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                count = index.query(q).bit_count()
+                timings.append(time.perf_counter() - started)
+            timings.sort()
+            self.stdout.write(
+                f"{label}: {count} matches, p50 {timings[len(timings) // 2] * 1000:.3f} ms, "
+                f"p99 {timings[int(len(timings) * 0.99)] * 1000:.3f} ms"
+            )
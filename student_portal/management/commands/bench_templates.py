@@ -0,0 +1,103 @@
+"""
+Per-page time with and without cached template loaders and fragment caching.
+
+    python manage.py bench_templates --requests 200
+
+Renders the three role dashboards and a full job search page through the
+test client under three setups:
+- plain loaders, which recompile templates on every request, with no
+  fragment cache;
+- cached loaders only;
+- cached loaders with the sidebar and job card fragments cached.
+Database work is the same in each setup, so the differences are template
+cost. Everything runs inside a rolled-back transaction.
+"""
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from accounts.models import Profile
+from student_portal.models import Application, JobPosting, StudentProfile
+
+PLAIN_LOADERS = [
+    "django.template.loaders.filesystem.Loader",
+    "django.template.loaders.app_directories.Loader",
+]
+DUMMY_CACHE = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "bench-templates"}}
+
+
+def _templates(loaders):
+    config = dict(settings.TEMPLATES[0], APP_DIRS=False)
+    config["OPTIONS"] = dict(config["OPTIONS"], loaders=loaders)
+    return [config]
+
+
+class Command(BaseCommand):
+    help = "Benchmark page render time: plain vs cached loaders vs fragment caching (rolled back afterwards)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--jobs", type=int, default=40)
+
+    def _user(self, username, role):
+        user = get_user_model().objects.create_user(username=username)
+        Profile.objects.filter(user=user).update(role=role)
+        return user
+
+    def _time(self, user, url, requests):
+        client = Client()
+        client.force_login(user)
+        client.get(url)  # warm up
+        timings = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            response = client.get(url)
+            timings.append(time.perf_counter() - started)
+            assert response.status_code == 200, (url, response.status_code)
+        return statistics.median(timings) * 1000
+
+    def handle(self, *args, requests, jobs, **options):
+        setups = [
+            ("plain loaders", _templates(PLAIN_LOADERS), DUMMY_CACHE),
+            ("cached loaders", _templates([("django.template.loaders.cached.Loader", PLAIN_LOADERS)]), DUMMY_CACHE),
+            ("+ fragment cache", _templates([("django.template.loaders.cached.Loader", PLAIN_LOADERS)]), LOCMEM_CACHE),
+        ]
+        with override_settings(ALLOWED_HOSTS=["testserver"], RATE_LIMITS={}), transaction.atomic():
+            student = self._user("__bench_tpl_student__", Profile.Role.STUDENT)
+            tpo = self._user("__bench_tpl_tpo__", Profile.Role.TPO)
+            recruiter = self._user("__bench_tpl_recruiter__", Profile.Role.RECRUITER)
+            profile, _ = StudentProfile.objects.get_or_create(user=student)
+            description = "Build and run services for the placement platform. " * 20
+            postings = [
+                JobPosting.objects.create(
+                    title=f"Engineer {i}", company_name="Benchmark Corp", description=description,
+                    requirements="Python", location="Pune", salary_range="8-12 LPA", posted_by=recruiter,
+                )
+                for i in range(jobs)
+            ]
+            for job in postings[:5]:
+                Application.objects.create(student=profile, job=job)
+            pages = [
+                ("student dashboard", student, reverse("student:dashboard")),
+                ("job search", student, reverse("student:job_search")),
+                ("TPO dashboard", tpo, reverse("tpo:dashboard")),
+                ("recruiter dashboard", recruiter, reverse("recruiter:dashboard")),
+            ]
+            results = {}
+            for label, templates, caches in setups:
+                with override_settings(TEMPLATES=templates, CACHES=caches):
+                    for page, user, url in pages:
+                        results[(page, label)] = self._time(user, url, requests)
+            transaction.set_rollback(True)
+
+        header = f"{'page':<22}" + "".join(f"{label:>18}" for label, _, _ in setups)
+        self.stdout.write(header + "   (median ms/request)")
+        for page, _, _ in pages:
+            self.stdout.write(f"{page:<22}" + "".join(f"{results[(page, label)]:>18.2f}" for label, _, _ in setups))
@@ -0,0 +1,138 @@
+"""
+Drive every named URL of the student, TPO and recruiter portals and report
+latency percentiles and query counts per view.
+
+    python manage.py seed_data
+    python manage.py bench_urls --requests 50 --output bench-before.json
+    ... change something ...
+    python manage.py bench_urls --requests 50 --output bench-after.json --compare bench-before.json
+
+Each portal is requested as a user of that role (the first seed_* account by
+default), with URL arguments filled from that user's own data. URLs that
+delete, stream or only accept POST are listed under "skipped". Every run
+is wrapped in a rolled-back transaction, so views that write on GET leave
+nothing behind.
+"""
+import json
+import math
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.testing import NAMESPACES, QueryLog, portal_urls, skip_reason, url_arguments
+from recruiter_portal.models import ApiToken
+from student_portal.models import Application, JobPosting, StudentProfile
+
+
+def percentile(sorted_values, pct):
+    return sorted_values[max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)]
+
+
+class Command(BaseCommand):
+    help = "Benchmark every named portal URL; report p50/p95/p99 latency and queries per view as JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=30, help="Timed requests per URL.")
+        parser.add_argument("--student", default="seed_student_00001")
+        parser.add_argument("--recruiter", default="seed_recruiter_001")
+        parser.add_argument("--tpo", default="seed_tpo_1")
+        parser.add_argument("--only", default="", help="Only URL names containing this text.")
+        parser.add_argument("--output", help="Write the JSON report here instead of stdout.")
+        parser.add_argument("--compare", help="Earlier JSON report to print a comparison against.")
+
+    def _user(self, username):
+        try:
+            return User.objects.get(username=username)
+        except User.DoesNotExist:
+            raise CommandError(f"No user {username!r}; run seed_data or pass --student/--recruiter/--tpo.")
+
+    def _measure(self, client, path, requests, headers):
+        client.get(path, **headers)  # warm up caches and connections
+        queries = QueryLog()
+        with connection.execute_wrapper(queries):
+            response = client.get(path, **headers)
+        timings = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            client.get(path, **headers)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        return {
+            "path": path,
+            "status": response.status_code,
+            "p50_ms": round(percentile(timings, 50), 2),
+            "p95_ms": round(percentile(timings, 95), 2),
+            "p99_ms": round(percentile(timings, 99), 2),
+            "queries": len(queries),
+            "bytes": 0 if response.streaming else len(response.content),
+        }
+
+    def handle(self, *args, requests, student, recruiter, tpo, only, output, compare, **options):
+        report = {
+            "generated_at": timezone.now().isoformat(),
+            "requests": requests,
+            "dataset": {
+                "students": StudentProfile.objects.count(),
+                "jobs": JobPosting.objects.count(),
+                "applications": Application.objects.count(),
+            },
+            "views": {},
+            "skipped": {},
+        }
+        with override_settings(ALLOWED_HOSTS=["testserver"], RATE_LIMITS={}), transaction.atomic():
+            users = {"student": self._user(student), "recruiter": self._user(recruiter), "tpo": self._user(tpo)}
+            clients = {}
+            for role, user in users.items():
+                # Failing views are reported by status code rather than ending the run.
+                clients[role] = Client(raise_request_exception=False)
+                clients[role].force_login(user)
+            _, api_key = ApiToken.issue(users["recruiter"], "bench_urls")
+            arguments = url_arguments(users)
+            urls = [(name, role, params) for role in NAMESPACES for name, params in portal_urls(role) if only in name]
+            for name, role, params in urls:
+                reason = skip_reason(name)
+                if reason:
+                    report["skipped"][name] = reason
+                    continue
+                kwargs = arguments.get(name) if params else {}
+                if kwargs is None:
+                    report["skipped"][name] = f"no data for {', '.join(params)}"
+                    continue
+                headers = {"HTTP_AUTHORIZATION": f"Bearer {api_key}"} if ":api_" in name else {}
+                result = self._measure(clients[role], reverse(name, kwargs=kwargs), requests, headers)
+                report["views"][name] = result
+                self.stderr.write(
+                    f"{name:<38} {result['status']} p50 {result['p50_ms']:>8.2f} ms  "
+                    f"p95 {result['p95_ms']:>8.2f} ms  p99 {result['p99_ms']:>8.2f} ms  {result['queries']:>4} queries"
+                )
+            transaction.set_rollback(True)
+
+        payload = json.dumps(report, indent=2, sort_keys=True)
+        if output:
+            with open(output, "w") as f:
+                f.write(payload + "\n")
+            self.stderr.write(f"Wrote {output}")
+        else:
+            self.stdout.write(payload)
+        if compare:
+            self._compare(compare, report)
+
+    def _compare(self, path, report):
+        with open(path) as f:
+            before = json.load(f)["views"]
+        self.stderr.write(f"\n{'view':<38} {'p95 before':>11} {'p95 after':>10} {'change':>8} {'queries':>12}")
+        for name, after in report["views"].items():
+            old = before.get(name)
+            if old is None:
+                self.stderr.write(f"{name:<38} {'-':>11} {after['p95_ms']:>10.2f}")
+                continue
+            change = (after["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100 if old["p95_ms"] else 0.0
+            self.stderr.write(
+                f"{name:<38} {old['p95_ms']:>11.2f} {after['p95_ms']:>10.2f} {change:>+7.0f}% "
+                f"{old['queries']:>5} -> {after['queries']:<4}"
+            )
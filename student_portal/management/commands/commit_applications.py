@@ -0,0 +1,34 @@
+"""
+Surge-mode committer: drain the application intake log into the database.
+
+    python manage.py commit_applications           # commit what is logged now
+    python manage.py commit_applications --loop    # keep draining
+
+Run exactly one committer; see student_portal/intake.py.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from student_portal import intake
+
+
+class Command(BaseCommand):
+    help = "Commit applies queued in the surge-mode intake log as Application rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=intake.BATCH_SIZE)
+        parser.add_argument("--loop", action="store_true", help="Keep draining the intake log.")
+        parser.add_argument("--interval", type=float, default=1.0, help="Seconds between polls in --loop mode.")
+
+    def handle(self, *args, batch_size, loop, interval, **options):
+        totals = [0, 0, 0]
+        while True:
+            created, duplicate, rejected = intake.drain(batch_size=batch_size)
+            totals = [total + count for total, count in zip(totals, (created, duplicate, rejected))]
+            if created or duplicate or rejected:
+                self.stdout.write(f"Committed {created}, {duplicate} duplicate(s), {rejected} rejected")
+            if not loop:
+                break
+            time.sleep(interval)
+        self.stdout.write(f"Done: {totals[0]} committed, {totals[1]} duplicate(s), {totals[2]} rejected.")
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from student_portal.expiry import BATCH_SIZE, expire_job_postings
+
+
+class Command(BaseCommand):
+    help = "Deactivate job postings whose application deadline has passed."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, batch_size, **options):
+        count = expire_job_postings(batch_size=batch_size)
+        self.stdout.write(f"Deactivated {count} expired job posting(s).")
@@ -0,0 +1,39 @@
+"""
+Background worker that extracts text from new and changed resumes.
+
+    python manage.py extract_resume_text            # drain the backlog once
+    python manage.py extract_resume_text --loop     # keep polling
+
+File parsing runs in a process pool so a large PDF never blocks the
+database writes for the rest of the batch.
+"""
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from student_portal import resume_text
+
+
+class Command(BaseCommand):
+    help = "Extract and index resume text for keyword search."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument("--workers", type=int, default=None, help="Pool size (default: CPU count).")
+        parser.add_argument("--loop", action="store_true", help="Keep polling for new resumes.")
+        parser.add_argument("--interval", type=float, default=10.0, help="Seconds between polls in --loop mode.")
+
+    def handle(self, *args, batch_size, workers, loop, interval, **options):
+        total = 0
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            while True:
+                processed = resume_text.index_pending(batch_size=batch_size, executor=executor)
+                total += processed
+                if processed:
+                    self.stdout.write(f"Indexed {processed} resume(s)")
+                    continue
+                if not loop:
+                    break
+                time.sleep(interval)
+        self.stdout.write(f"Done: {total} resume(s) indexed.")
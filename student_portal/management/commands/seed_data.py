@@ -0,0 +1,306 @@
+"""
+Seed a production-sized synthetic dataset.
+
+    python manage.py seed_data                 # 20k students, 2k postings, 300k applications, ...
+    python manage.py seed_data --scale 0.05    # a 5% slice for quick runs
+    python manage.py seed_data --flush         # remove earlier seed data first
+
+The data is fake but realistic:
+- students with profiles, skills (resolved to canonical skills),
+  certifications and a resume each;
+- recruiters with postings;
+- applications with a realistic status mix;
+- interviews, saved jobs;
+- threaded messages between students and recruiters;
+- notifications.
+Everything is written with bulk_create in one transaction. Timestamps are
+spread over the past months instead of "now". All seed accounts are named
+``seed_*`` and share the password printed at the end, which is what
+``bench_urls`` logs in with.
+"""
+import random
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import Profile
+from student_portal import skills as skill_names
+from student_portal.models import (
+    Application, Certification, Interview, JobPosting, Message, Notification, Resume, SavedJob, Skill,
+    StudentProfile, Thread, ThreadParticipant,
+)
+from student_portal.threads import snippet, thread_key
+
+PASSWORD = "seed-pass"
+PREFIX = "seed_"
+BATCH_SIZE = 5000
+
+BRANCHES = ["CSE", "IT", "ECE", "EEE", "ME", "CE", "CHE"]
+SKILLS = [
+    "Python", "Java", "C++", "JavaScript", "SQL", "Django", "React", "Node.js", "Machine Learning",
+    "Data Analysis", "AWS", "Docker", "Kubernetes", "Git", "Linux", "Excel", "Tableau", "Go", "Rust",
+    "TypeScript", "Spring Boot", "AutoCAD", "MATLAB", "Embedded C", "VLSI", "Power BI", "Figma",
+]
+COMPANIES = [
+    "Infosys", "TCS", "Wipro", "Accenture", "Zoho", "Freshworks", "Flipkart", "Amazon", "Microsoft",
+    "Google", "Deloitte", "Capgemini", "L&T", "Bosch", "Siemens", "Razorpay", "Swiggy", "Paytm",
+]
+ROLES = [
+    "Software Engineer", "Data Analyst", "Backend Developer", "Frontend Developer", "DevOps Engineer",
+    "QA Engineer", "Graduate Engineer Trainee", "Business Analyst", "ML Engineer", "Design Engineer",
+]
+LOCATIONS = ["Bengaluru", "Hyderabad", "Pune", "Chennai", "Noida", "Mumbai", "Remote"]
+CERTIFICATIONS = [
+    ("AWS Certified Cloud Practitioner", "Amazon"), ("Azure Fundamentals", "Microsoft"),
+    ("Oracle Java SE Programmer", "Oracle"), ("CCNA", "Cisco"), ("Google Data Analytics", "Google"),
+]
+STATUSES = ["applied", "under_review", "shortlisted", "interview_scheduled", "rejected", "accepted"]
+STATUS_WEIGHTS = [45, 20, 10, 7, 15, 3]
+NOTIFICATION_TYPES = ["job_alert", "interview", "application_update", "announcement", "reminder"]
+LOREM = (
+    "We are looking for graduates who enjoy solving problems, learn quickly and work well in teams. "
+    "You will work with senior engineers on production systems used by millions of customers."
+)
+
+
+@contextmanager
+def explicit_timestamps(*fields):
+    """Let bulk_create keep the timestamps we set instead of stamping now()."""
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def _field(model, name):
+    return model._meta.get_field(name)
+
+
+class Command(BaseCommand):
+    help = "Seed a large synthetic dataset (students, postings, applications, messages, ...)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=float, default=1.0, help="Multiply every count by this factor.")
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--flush", action="store_true", help="Delete existing seed_* users and their data first.")
+
+    def _count(self, n, scale):
+        return max(1, int(n * scale))
+
+    def _ago(self, rng, days):
+        return self.now - timedelta(seconds=rng.randint(0, int(days * 86400)))
+
+    def handle(self, *args, scale, seed, flush, **options):
+        rng = random.Random(seed)
+        self.now = timezone.now()
+        seeded = User.objects.filter(username__startswith=PREFIX)
+        if seeded.exists():
+            if not flush:
+                raise CommandError("Seed data already exists; pass --flush to replace it.")
+            started = time.perf_counter()
+            seeded.delete()
+            self.stdout.write(f"Flushed previous seed data in {time.perf_counter() - started:.1f} s")
+
+        counts = {
+            "students": self._count(20000, scale),
+            "recruiters": self._count(200, scale),
+            "tpos": self._count(5, scale),
+            "jobs": self._count(2000, scale),
+            "applications": self._count(300000, scale),
+            "threads": self._count(20000, scale),
+            "notifications": self._count(200000, scale),
+        }
+        started = time.perf_counter()
+        timestamps = [
+            _field(model, name) for model, name in [
+                (Profile, "created_at"), (JobPosting, "posted_at"), (JobPosting, "updated_at"),
+                (Application, "applied_at"), (Application, "updated_at"), (SavedJob, "saved_at"),
+                (Interview, "created_at"), (Message, "sent_at"), (Thread, "created_at"),
+                (Notification, "created_at"), (Resume, "created_at"), (Resume, "updated_at"),
+            ]
+        ]
+        with transaction.atomic(), explicit_timestamps(*timestamps):
+            self._seed(rng, counts)
+        self.stdout.write(
+            f"Seeded in {time.perf_counter() - started:.1f} s. Log in as {PREFIX}student_00001, "
+            f"{PREFIX}recruiter_001 or {PREFIX}tpo_1 with password {PASSWORD!r}."
+        )
+
+    def _users(self, role, names):
+        password = make_password(PASSWORD)
+        users = User.objects.bulk_create(
+            [User(username=name, email=f"{name}@example.edu", password=password, date_joined=self.now) for name in names],
+            batch_size=BATCH_SIZE,
+        )
+        Profile.objects.bulk_create(
+            [Profile(user=user, role=role, created_at=user.date_joined) for user in users], batch_size=BATCH_SIZE
+        )
+        return users
+
+    def _report(self, label, n):
+        self.stdout.write(f"  {label}: {n}")
+
+    def _seed(self, rng, counts):
+        student_users = self._users(
+            Profile.Role.STUDENT, [f"{PREFIX}student_{i:05d}" for i in range(1, counts["students"] + 1)]
+        )
+        recruiters = self._users(
+            Profile.Role.RECRUITER, [f"{PREFIX}recruiter_{i:03d}" for i in range(1, counts["recruiters"] + 1)]
+        )
+        tpos = self._users(Profile.Role.TPO, [f"{PREFIX}tpo_{i}" for i in range(1, counts["tpos"] + 1)])
+        self._report("users", len(student_users) + len(recruiters) + len(tpos))
+
+        students = StudentProfile.objects.bulk_create(
+            [
+                StudentProfile(
+                    user=user,
+                    enrollment_number=f"SEED{i:06d}",
+                    course="B.Tech",
+                    branch=rng.choice(BRANCHES),
+                    year=rng.choice(["3rd", "4th"]),
+                    cgpa=Decimal(rng.randint(550, 990)) / 100,
+                    graduation_year=rng.choice([2026, 2027]),
+                    placement_eligible=rng.random() < 0.92,
+                )
+                for i, user in enumerate(student_users, 1)
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        self._report("student profiles", len(students))
+
+        canonical = skill_names.resolve_many(SKILLS)
+        skill_rows, certification_rows, resumes = [], [], []
+        for student in students:
+            chosen = rng.sample(SKILLS, rng.randint(3, 8))
+            for name in chosen:
+                skill_rows.append(Skill(
+                    student=student, name=name, canonical=canonical[skill_names.skill_key(name)],
+                    proficiency_level=rng.choice(["beginner", "intermediate", "advanced", "expert"]),
+                ))
+            for name, issuer in rng.sample(CERTIFICATIONS, rng.randint(0, 2)):
+                issued = timezone.localdate(self._ago(rng, 700))
+                certification_rows.append(Certification(
+                    student=student, name=name, issuer=issuer, issue_date=issued,
+                    expiry_date=issued + timedelta(days=rng.choice([365, 730, 1095])),
+                ))
+            created = self._ago(rng, 365)
+            resumes.append(Resume(
+                student=student, title="Campus Resume", is_default=True, created_at=created, updated_at=created,
+                content=f"{student.branch} student. Skills: {', '.join(chosen)}. {LOREM}",
+            ))
+        Skill.objects.bulk_create(skill_rows, batch_size=BATCH_SIZE)
+        Certification.objects.bulk_create(certification_rows, batch_size=BATCH_SIZE)
+        resumes = Resume.objects.bulk_create(resumes, batch_size=BATCH_SIZE)
+        self._report("skills", len(skill_rows))
+        self._report("certifications", len(certification_rows))
+        self._report("resumes", len(resumes))
+
+        jobs = []
+        for _ in range(counts["jobs"]):
+            posted = self._ago(rng, 180)
+            deadline = posted + timedelta(days=rng.randint(14, 60))
+            jobs.append(JobPosting(
+                title=rng.choice(ROLES), company_name=rng.choice(COMPANIES),
+                description=f"{LOREM} {LOREM}", requirements=", ".join(rng.sample(SKILLS, 4)),
+                location=rng.choice(LOCATIONS), salary_range=f"{rng.randint(4, 12)}-{rng.randint(13, 30)} LPA",
+                min_cgpa=rng.choice([None, Decimal("6.00"), Decimal("7.00"), Decimal("7.50")]),
+                job_type=rng.choices(["full_time", "internship", "part_time", "contract"], [70, 25, 3, 2])[0],
+                posted_by=rng.choice(recruiters), posted_at=posted, updated_at=posted,
+                application_deadline=deadline, is_active=deadline > self.now,
+            ))
+        jobs = JobPosting.objects.bulk_create(jobs, batch_size=BATCH_SIZE)
+        self._report("job postings", len(jobs))
+
+        per_student = max(1, min(len(jobs), counts["applications"] // len(students)))
+        applications, saved = [], []
+        for student, resume in zip(students, resumes):
+            picks = rng.sample(jobs, min(len(jobs), per_student + 2))
+            for job in picks[:per_student]:
+                applied = min(self.now, job.posted_at + timedelta(hours=rng.randint(1, 24 * 14)))
+                applications.append(Application(
+                    student=student, job=job, resume=resume, cover_letter="",
+                    status=rng.choices(STATUSES, STATUS_WEIGHTS)[0], applied_at=applied, updated_at=applied,
+                ))
+            for job in picks[per_student:]:
+                saved.append(SavedJob(student=student, job=job, saved_at=self._ago(rng, 90)))
+        applications = Application.objects.bulk_create(applications, batch_size=BATCH_SIZE)
+        SavedJob.objects.bulk_create(saved, batch_size=BATCH_SIZE)
+        self._report("applications", len(applications))
+        self._report("saved jobs", len(saved))
+
+        interviews = [
+            Interview(
+                application=application,
+                scheduled_at=application.applied_at + timedelta(days=rng.randint(3, 20), hours=rng.randint(9, 17)),
+                location=rng.choice(["Online", "Placement Cell, Block A", "Seminar Hall"]),
+                status="scheduled",
+                created_at=application.applied_at,
+            )
+            for application in applications
+            if application.status == "interview_scheduled"
+        ]
+        Interview.objects.bulk_create(interviews, batch_size=BATCH_SIZE)
+        self._report("interviews", len(interviews))
+
+        self._seed_messages(rng, applications, counts["threads"])
+
+        users = [student.user for student in students]
+        notifications = []
+        for _ in range(counts["notifications"]):
+            kind = rng.choice(NOTIFICATION_TYPES)
+            notifications.append(Notification(
+                user=rng.choice(users), title=f"{kind.replace('_', ' ').title()} update",
+                message="There is an update on your placement activity.", notification_type=kind,
+                is_read=rng.random() < 0.7, created_at=self._ago(rng, 180),
+            ))
+        Notification.objects.bulk_create(notifications, batch_size=BATCH_SIZE)
+        self._report("notifications", len(notifications))
+
+    def _seed_messages(self, rng, applications, count):
+        """Student <-> recruiter conversations about an application, with threads and inbox rows."""
+        by_pk = {job.pk: job for job in JobPosting.objects.only("pk", "posted_by_id", "title")}
+        threads, conversations = [], []
+        for application in rng.sample(applications, min(count, len(applications))):
+            job = by_pk[application.job_id]
+            student_id, recruiter_id = application.student.user_id, job.posted_by_id
+            subject = f"Application #{application.pk}: {job.title}"
+            started = application.applied_at
+            thread = Thread(key=thread_key(student_id, recruiter_id, subject), subject=subject, created_at=started)
+            messages = []
+            for n in range(rng.randint(1, 5)):
+                sender, recipient = (recruiter_id, student_id) if n % 2 == 0 else (student_id, recruiter_id)
+                messages.append(Message(
+                    sender_id=sender, recipient_id=recipient, subject=subject,
+                    body=f"Message {n + 1} about the {job.title} role. {LOREM}",
+                    sent_at=started + timedelta(hours=6 * (n + 1)), is_read=rng.random() < 0.6,
+                ))
+            last = messages[-1]
+            thread.last_message_at, thread.last_snippet, thread.last_sender_id = last.sent_at, snippet(last.body), last.sender_id
+            threads.append(thread)
+            conversations.append((thread, messages, student_id, recruiter_id))
+        threads = Thread.objects.bulk_create(threads, batch_size=BATCH_SIZE)
+        messages, participants = [], []
+        for thread, thread_messages, student_id, recruiter_id in conversations:
+            for message in thread_messages:
+                message.thread = thread
+                messages.append(message)
+            for user_id in (student_id, recruiter_id):
+                unread = sum(1 for m in thread_messages if m.recipient_id == user_id and not m.is_read)
+                participants.append(ThreadParticipant(
+                    thread=thread, user_id=user_id, last_message_at=thread.last_message_at, unread_count=unread,
+                ))
+        Message.objects.bulk_create(messages, batch_size=BATCH_SIZE)
+        ThreadParticipant.objects.bulk_create(participants, batch_size=BATCH_SIZE)
+        self._report("threads", len(threads))
+        self._report("messages", len(messages))
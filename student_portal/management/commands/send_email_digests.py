@@ -0,0 +1,37 @@
+"""
+Email worker: send notification digests that are due.
+
+    python manage.py send_email_digests           # send what is due now
+    python manage.py send_email_digests --loop    # keep polling
+
+Each batch goes out over a single SMTP connection.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from student_portal import digests
+
+
+class Command(BaseCommand):
+    help = "Coalesce pending notification emails into digests and send them."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=digests.BATCH_SIZE)
+        parser.add_argument("--loop", action="store_true", help="Keep polling for due digests.")
+        parser.add_argument("--interval", type=float, default=60.0, help="Seconds between polls in --loop mode.")
+
+    def handle(self, *args, batch_size, loop, interval, **options):
+        total_sent = total_failed = 0
+        while True:
+            sent, failed = digests.send_digests(batch_size=batch_size)
+            total_sent += sent
+            total_failed += failed
+            if sent or failed:
+                self.stdout.write(f"Sent {sent} digest(s), {failed} failed")
+                if sent:
+                    continue
+            if not loop:
+                break
+            time.sleep(interval)
+        self.stdout.write(f"Done: {total_sent} digest(s) sent, {total_failed} failed.")
@@ -0,0 +1,32 @@
+"""
+Reminder scheduler: deadlines of saved jobs, upcoming interviews and
+expiring certifications.
+
+    python manage.py send_reminders           # one tick (e.g. from cron)
+    python manage.py send_reminders --loop    # keep ticking
+
+Safe to run on several nodes at once; the ReminderLog ledger makes every
+reminder fire once.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from student_portal import reminders
+
+
+class Command(BaseCommand):
+    help = "Create reminder notifications for deadlines, interviews and expiring certifications."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Keep running a tick every --interval seconds.")
+        parser.add_argument("--interval", type=float, default=60.0, help="Seconds between ticks in --loop mode.")
+
+    def handle(self, *args, loop, interval, **options):
+        while True:
+            fired = reminders.run_reminders()
+            if any(fired.values()):
+                self.stdout.write(", ".join(f"{kind}: {count}" for kind, count in fired.items()))
+            if not loop:
+                break
+            time.sleep(interval)
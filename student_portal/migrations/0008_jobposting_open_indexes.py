@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-19 14:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student_portal', '0007_calendar_feed'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-posted_at', 'application_deadline'], name='jobposting_open_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(condition=models.Q(('application_deadline__isnull', False), ('is_active', True)), fields=['application_deadline'], name='jobposting_expiry_idx'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated manually: seed the canonical skill taxonomy with common aliases
+
+from django.db import migrations
+
+SKILLS = {
+    "Python": ["python", "py", "python3", "python 3", "python2", "python 2"],
+    "Java": ["java", "core java", "java se", "j2ee", "java ee"],
+    "JavaScript": ["javascript", "js", "ecmascript", "es6", "vanilla js"],
+    "TypeScript": ["typescript", "ts"],
+    "C": ["c", "c language", "c programming"],
+    "C++": ["c++", "cpp", "cplusplus"],
+    "C#": ["c#", "csharp", "c sharp"],
+    "Go": ["go", "golang"],
+    "SQL": ["sql", "mysql", "postgresql", "postgres", "sqlite", "pl/sql", "t-sql"],
+    "HTML": ["html", "html5"],
+    "CSS": ["css", "css3"],
+    "React": ["react", "reactjs", "react.js"],
+    "Angular": ["angular", "angularjs", "angular.js"],
+    "Node.js": ["node.js", "nodejs", "node"],
+    "Django": ["django"],
+    "Flask": ["flask"],
+    "Spring Boot": ["spring boot", "springboot", "spring"],
+    "Machine Learning": ["machine learning", "ml"],
+    "Deep Learning": ["deep learning", "dl"],
+    "Data Structures and Algorithms": ["data structures and algorithms", "dsa", "data structures", "algorithms"],
+    "Git": ["git", "github", "gitlab"],
+    "Docker": ["docker"],
+    "Kubernetes": ["kubernetes", "k8s"],
+    "AWS": ["aws", "amazon web services"],
+    "Linux": ["linux", "unix"],
+    "Excel": ["excel", "ms excel", "microsoft excel"],
+}
+
+
+def seed(apps, schema_editor):
+    CanonicalSkill = apps.get_model("student_portal", "CanonicalSkill")
+    SkillAlias = apps.get_model("student_portal", "SkillAlias")
+    for name, aliases in SKILLS.items():
+        skill, _ = CanonicalSkill.objects.get_or_create(key=aliases[0], defaults={"name": name})
+        for alias in aliases:
+            SkillAlias.objects.get_or_create(alias=alias, defaults={"skill": skill})
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("student_portal", "0009_skill_taxonomy"),
+    ]
+
+    operations = [
+        migrations.RunPython(seed, noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.9 on 2026-10-19 14:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student_portal', '0010_seed_skill_taxonomy'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeText',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.TextField(blank=True)),
+                ('source_updated_at', models.DateTimeField()),
+                ('error', models.CharField(blank=True, max_length=200)),
+                ('extracted_at', models.DateTimeField(auto_now=True)),
+                ('resume', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='search_text', to='student_portal.resume')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ResumeKeyword',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('word', models.CharField(max_length=50)),
+                ('resume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='keywords', to='student_portal.resume')),
+            ],
+            options={
+                'unique_together': {('word', 'resume')},
+            },
+        ),
+    ]
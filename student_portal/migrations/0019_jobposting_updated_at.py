@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-19 14:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student_portal', '0018_intake_checkpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposting',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
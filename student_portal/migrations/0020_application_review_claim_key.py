@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-19 15:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student_portal', '0019_jobposting_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='review_claim_key',
+            field=models.CharField(blank=True, max_length=32),
+        ),
+    ]
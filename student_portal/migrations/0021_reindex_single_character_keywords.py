@@ -0,0 +1,22 @@
+# Generated manually: single-character words (C, R) are now indexed, so mark
+# every extracted resume stale for extract_resume_text to re-index.
+
+import datetime
+
+from django.db import migrations
+
+
+def mark_stale(apps, schema_editor):
+    ResumeText = apps.get_model("student_portal", "ResumeText")
+    ResumeText.objects.update(source_updated_at=datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("student_portal", "0020_application_review_claim_key"),
+    ]
+
+    operations = [
+        migrations.RunPython(mark_stale, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,10 @@
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import User
 from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Profile
 
 
 class StudentProfile(models.Model):
@@ -41,10 +45,37 @@ class StudentProfile(models.Model):
         return f"{self.user.username} - {self.enrollment_number}"
 
 
+class CanonicalSkill(models.Model):
+    """One entry of the skill taxonomy; free-text skill names resolve to these via SkillAlias"""
+    name = models.CharField(max_length=100)
+    key = models.CharField(max_length=100, unique=True)
+    
+    class Meta:
+        ordering = ['name']
+    
+    def __str__(self):
+        return self.name
+
+
+class SkillAlias(models.Model):
+    """Normalized spelling ("py", "python3") pointing at a canonical skill"""
+    alias = models.CharField(max_length=100, unique=True)
+    skill = models.ForeignKey(CanonicalSkill, on_delete=models.CASCADE, related_name='aliases')
+    
+    class Meta:
+        verbose_name_plural = "Skill aliases"
+    
+    def __str__(self):
+        return f"{self.alias} -> {self.skill.name}"
+
+
 class Skill(models.Model):
     """Student skills"""
     student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name='skills')
     name = models.CharField(max_length=100)
+    canonical = models.ForeignKey(
+        CanonicalSkill, on_delete=models.PROTECT, null=True, blank=True, related_name='student_skills'
+    )
     proficiency_level = models.CharField(
         max_length=20,
         choices=[
@@ -70,6 +101,11 @@ class Certification(models.Model):
     credential_id = models.CharField(max_length=100, blank=True)
     credential_url = models.URLField(blank=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['expiry_date'], condition=Q(expiry_date__isnull=False), name='certification_expiry_idx'),
+        ]
+    
     def __str__(self):
         return f"{self.student.user.username} - {self.name}"
 
@@ -91,6 +127,32 @@ class Resume(models.Model):
         return f"{self.student.user.username} - {self.title}"
 
 
+class ResumeText(models.Model):
+    """Plain text extracted from a resume (file and builder content) for keyword search"""
+    resume = models.OneToOneField(Resume, on_delete=models.CASCADE, related_name='search_text')
+    text = models.TextField(blank=True)
+    # Resume.updated_at at extraction time; a newer updated_at means re-extract.
+    source_updated_at = models.DateTimeField()
+    error = models.CharField(max_length=200, blank=True)
+    extracted_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Text of {self.resume}"
+
+
+class ResumeKeyword(models.Model):
+    """Inverted index: one row per distinct word in a resume's extracted text"""
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE, related_name='keywords')
+    word = models.CharField(max_length=50)
+    
+    class Meta:
+        # (word, resume) doubles as the lookup index for keyword filters.
+        unique_together = ['word', 'resume']
+    
+    def __str__(self):
+        return f"{self.word} ({self.resume_id})"
+
+
 class PortfolioItem(models.Model):
     """Portfolio projects, GitHub links, publications"""
     student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name='portfolio_items')
@@ -108,6 +170,7 @@ class PortfolioItem(models.Model):
     )
     url = models.URLField(blank=True)
     technologies = models.CharField(max_length=500, blank=True, help_text="Comma-separated technologies")
+    skills = models.ManyToManyField(CanonicalSkill, blank=True, related_name='portfolio_items')
     date_completed = models.DateField(null=True, blank=True)
     
     def __str__(self):
@@ -135,6 +198,15 @@ class Document(models.Model):
         return f"{self.student.user.username} - {self.name}"
 
 
+class JobPostingQuerySet(models.QuerySet):
+    def open(self, now=None):
+        """Active postings whose application deadline (if any) has not passed"""
+        now = now or timezone.now()
+        return self.filter(is_active=True).filter(
+            Q(application_deadline__isnull=True) | Q(application_deadline__gt=now)
+        )
+
+
 class JobPosting(models.Model):
     """Job/Internship postings from recruiters"""
     title = models.CharField(max_length=200)
@@ -158,14 +230,38 @@ class JobPosting(models.Model):
     )
     posted_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='job_postings')
     posted_at = models.DateTimeField(auto_now_add=True)
+    # Version of the cached job card fragment in job_search.html.
+    updated_at = models.DateTimeField(auto_now=True)
     application_deadline = models.DateTimeField(null=True, blank=True)
     is_active = models.BooleanField(default=True)
     
+    objects = JobPostingQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-posted_at']
+        indexes = [
+            # Listings only ever read active postings; expired ones are
+            # switched off by the expire_job_postings sweeper.
+            models.Index(
+                fields=['-posted_at', 'application_deadline'],
+                condition=Q(is_active=True),
+                name='jobposting_open_idx',
+            ),
+            models.Index(
+                fields=['application_deadline'],
+                condition=Q(is_active=True, application_deadline__isnull=False),
+                name='jobposting_expiry_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.company_name} - {self.title}"
+    
+    @property
+    def is_open(self):
+        return self.is_active and (
+            self.application_deadline is None or self.application_deadline > timezone.now()
+        )
 
 
 class Application(models.Model):
@@ -186,10 +282,24 @@ class Application(models.Model):
     cover_letter = models.TextField(blank=True)
     applied_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Review queue lease: a recruiter reviewer holds the application until it expires.
+    # The claim key identifies the reviewer's session, as a team may share one account.
+    review_claimed_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, related_name='claimed_applications'
+    )
+    review_claim_key = models.CharField(max_length=32, blank=True)
+    review_lease_expires_at = models.DateTimeField(null=True, blank=True)
     
     class Meta:
         unique_together = ['student', 'job']
         ordering = ['-applied_at']
+        indexes = [
+            models.Index(
+                fields=['job', 'applied_at'],
+                condition=Q(status='applied'),
+                name='application_review_queue_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.student.user.username} - {self.job.title}"
@@ -230,13 +340,48 @@ class Interview(models.Model):
     
     class Meta:
         ordering = ['scheduled_at']
+        indexes = [
+            models.Index(fields=['scheduled_at'], condition=Q(status='scheduled'), name='interview_upcoming_idx'),
+        ]
     
     def __str__(self):
         return f"Interview - {self.application.student.user.username}"
 
 
+class Thread(models.Model):
+    """A conversation between two users on one subject; summary fields are kept current on send"""
+    key = models.CharField(max_length=40, unique=True)
+    subject = models.CharField(max_length=200)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_message_at = models.DateTimeField(null=True, blank=True)
+    last_snippet = models.CharField(max_length=200, blank=True)
+    last_sender = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    
+    def __str__(self):
+        return self.subject
+
+
+class ThreadParticipant(models.Model):
+    """Per-user inbox row for a thread (denormalized ordering and unread state)"""
+    thread = models.ForeignKey(Thread, on_delete=models.CASCADE, related_name='participants')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='thread_memberships')
+    last_message_at = models.DateTimeField(null=True, blank=True)
+    unread_count = models.PositiveIntegerField(default=0)
+    last_read_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        unique_together = ['thread', 'user']
+        indexes = [
+            models.Index(fields=['user', '-last_message_at'], name='thread_inbox_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.username} in {self.thread.subject}"
+
+
 class Message(models.Model):
     """Messages between students, TPO, and recruiters"""
+    thread = models.ForeignKey(Thread, on_delete=models.CASCADE, null=True, blank=True, related_name='messages')
     sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sent_messages')
     recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='received_messages')
     subject = models.CharField(max_length=200)
@@ -246,6 +391,9 @@ class Message(models.Model):
     
     class Meta:
         ordering = ['-sent_at']
+        indexes = [
+            models.Index(fields=['thread', 'sent_at'], name='message_thread_idx'),
+        ]
     
     def __str__(self):
         return f"{self.sender.username} -> {self.recipient.username}: {self.subject}"
@@ -264,6 +412,7 @@ class Notification(models.Model):
             ('application_update', 'Application Update'),
             ('announcement', 'Announcement'),
             ('message', 'Message'),
+            ('reminder', 'Reminder'),
         ]
     )
     is_read = models.BooleanField(default=False)
@@ -271,11 +420,130 @@ class Notification(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Retention scans for old read rows (see retention.py).
+            models.Index(fields=['created_at'], condition=Q(is_read=True), name='notification_archivable_idx'),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.title}"
 
 
+class NotificationArchive(models.Model):
+    """Read notifications moved out of the live table by the retention job"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_notifications', db_index=False)
+    title = models.CharField(max_length=200)
+    message = models.TextField()
+    notification_type = models.CharField(max_length=50)
+    created_at = models.DateTimeField()
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='notification_archive_user_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.username} - {self.title}"
+
+
+class DigestPreference(models.Model):
+    """How often a user's notifications are emailed to them as a digest"""
+    FREQUENCY_CHOICES = [
+        ('hourly', 'Hourly'),
+        ('daily', 'Daily'),
+        ('off', 'Off'),
+    ]
+    
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='digest_preference')
+    frequency = models.CharField(max_length=10, choices=FREQUENCY_CHOICES, default='daily')
+    last_sent_at = models.DateTimeField(null=True, blank=True)
+    
+    def __str__(self):
+        return f"{self.user.username}: {self.frequency}"
+
+
+class EmailDelivery(models.Model):
+    """Outbound email queue entry; pending items are coalesced into digests"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+    
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='email_deliveries')
+    notification = models.ForeignKey(Notification, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    subject = models.CharField(max_length=200)
+    body = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at'], condition=Q(status='pending'), name='email_delivery_pending_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.username}: {self.subject} ({self.status})"
+
+
+class Announcement(models.Model):
+    """Broadcast stored once and merged into each matching user's notifications at read time"""
+    title = models.CharField(max_length=200)
+    message = models.TextField()
+    # Audience: blank/null means "everyone"; branch and year only match students.
+    role = models.CharField(max_length=32, choices=Profile.Role.choices, blank=True)
+    branch = models.CharField(max_length=100, blank=True)
+    graduation_year = models.IntegerField(null=True, blank=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='announcements')
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return self.title
+
+
+class AnnouncementCursor(models.Model):
+    """Per-user "read up to" position over Announcement ids"""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='announcement_cursor')
+    read_up_to = models.PositiveBigIntegerField(default=0)
+    
+    def __str__(self):
+        return f"{self.user.username} read up to {self.read_up_to}"
+
+
+class ReminderLog(models.Model):
+    """Ledger of reminders already sent; one row per (kind, object, due time)"""
+    kind = models.CharField(max_length=50)
+    object_id = models.PositiveBigIntegerField()
+    due_at = models.DateTimeField()
+    sent_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id', 'due_at'], name='reminder_sent_once'),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} #{self.object_id} due {self.due_at}"
+
+
+class IntakeCheckpoint(models.Model):
+    """How far the surge-mode committer has read into one intake log segment"""
+    segment = models.CharField(max_length=200, unique=True)
+    offset = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.segment} @ {self.offset}"
+
+
 class SkillGapAnalysis(models.Model):
     """Skill gap analysis for students"""
     student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name='skill_gaps')
@@ -340,3 +608,18 @@ class MockInterview(models.Model):
     
     def __str__(self):
         return f"Mock Interview - {self.student.user.username}"
+
+
+class CalendarFeed(models.Model):
+    """Token-authenticated iCalendar feed of a user's interviews"""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='calendar_feed')
+    token = models.CharField(max_length=64, unique=True)
+    # Bumped whenever one of the user's interviews changes; the stored ics is
+    # regenerated only when built_version lags behind it.
+    version = models.PositiveIntegerField(default=1)
+    built_version = models.PositiveIntegerField(default=0)
+    ics = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"Calendar feed - {self.user.username}"
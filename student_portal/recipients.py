@@ -0,0 +1,45 @@
+"""
+Who a user may message, and prefix search over that set.
+
+Students can write to TPO staff and to recruiters whose jobs they applied
+to; recruiters to TPO staff and to students who applied to their jobs; TPO
+staff to anyone with a portal role. Search is a prefix match on the
+(uniquely indexed) username, written as a range so the index is used.
+"""
+from django.contrib.auth.models import User
+from django.db.models import Q
+
+from accounts.models import Profile
+
+from .models import JobPosting, StudentProfile
+
+SEARCH_LIMIT = 20
+_PREFIX_END = "\U0010ffff"
+
+
+def allowed_recipients(user):
+    """Queryset of users ``user`` may start a conversation with."""
+    role = getattr(getattr(user, 'profile', None), 'role', None)
+    tpo = Q(profile__role=Profile.Role.TPO)
+    if role == Profile.Role.STUDENT:
+        scope = tpo | Q(pk__in=JobPosting.objects.filter(applications__student__user=user).values('posted_by_id'))
+    elif role == Profile.Role.RECRUITER:
+        scope = tpo | Q(pk__in=StudentProfile.objects.filter(applications__job__posted_by=user).values('user_id'))
+    elif role == Profile.Role.TPO:
+        scope = Q(profile__role__in=[Profile.Role.STUDENT, Profile.Role.RECRUITER, Profile.Role.TPO])
+    else:
+        return User.objects.none()
+    return User.objects.filter(scope, is_active=True).exclude(pk=user.pk)
+
+
+def search(user, term, limit=SEARCH_LIMIT):
+    """Up to ``limit`` allowed recipients whose username starts with ``term``."""
+    term = term.strip()
+    if not term:
+        return []
+    return list(
+        allowed_recipients(user)
+        .filter(username__gte=term, username__lt=term + _PREFIX_END)
+        .order_by('username')
+        .values('username', 'first_name', 'last_name', 'profile__role')[:limit]
+    )
@@ -0,0 +1,160 @@
+"""
+Time-based reminders: saved-job deadlines, upcoming interviews and
+expiring certifications.
+
+Each tick runs one indexed range query per reminder type for objects
+coming due inside its window, leaves out those already in the ReminderLog
+ledger, and in a single transaction writes the ledger rows and
+bulk-creates the Notifications. The ledger has a unique constraint on
+(kind, object, due time), so a reminder fires once across restarts. If two
+nodes race, one of them hits the constraint and rolls back, and the next
+tick finds nothing left to send. A changed deadline or interview time is
+a new due time and is reminded again.
+"""
+from datetime import datetime, time, timedelta
+from datetime import timezone as dt_timezone
+
+from django.db import IntegrityError
+from django.utils import timezone
+
+from accounts.db import write_atomic
+
+from . import digests, live
+from .models import Certification, Interview, Notification, ReminderLog, SavedJob
+
+
+class Reminder:
+    """One reminder type: which objects come due in the window and what to tell whom."""
+    kind = None
+    notification_type = None
+    window = None
+
+    def candidates(self, now):
+        raise NotImplementedError
+
+    def due_at(self, obj):
+        raise NotImplementedError
+
+    def notification(self, obj):
+        raise NotImplementedError
+
+    def pending(self, now):
+        """Candidates in the window that are not in the ledger yet."""
+        candidates = list(self.candidates(now))
+        if not candidates:
+            return []
+        sent = set(
+            ReminderLog.objects.filter(kind=self.kind, object_id__in=[obj.pk for obj in candidates])
+            .values_list('object_id', 'due_at')
+        )
+        return [obj for obj in candidates if (obj.pk, self.due_at(obj)) not in sent]
+
+
+class SavedJobDeadline(Reminder):
+    kind = 'saved_job_deadline'
+    notification_type = 'job_alert'
+    window = timedelta(days=1)
+
+    def candidates(self, now):
+        return SavedJob.objects.filter(
+            job__is_active=True,
+            job__application_deadline__gt=now,
+            job__application_deadline__lte=now + self.window,
+        ).select_related('job', 'student')
+
+    def due_at(self, saved):
+        return saved.job.application_deadline
+
+    def notification(self, saved):
+        deadline = timezone.localtime(saved.job.application_deadline)
+        return Notification(
+            user_id=saved.student.user_id,
+            title=f"Closing soon: {saved.job.title}",
+            message=f"Applications for {saved.job.title} at {saved.job.company_name} close {deadline:%b %d, %H:%M}.",
+            notification_type=self.notification_type,
+        )
+
+
+class UpcomingInterview(Reminder):
+    kind = 'interview_upcoming'
+    notification_type = 'interview'
+    window = timedelta(hours=2)
+
+    def candidates(self, now):
+        return Interview.objects.filter(
+            status='scheduled', scheduled_at__gt=now, scheduled_at__lte=now + self.window,
+        ).select_related('application__job', 'application__student')
+
+    def due_at(self, interview):
+        return interview.scheduled_at
+
+    def notification(self, interview):
+        job = interview.application.job
+        when = timezone.localtime(interview.scheduled_at)
+        where = f" ({interview.location})" if interview.location else ""
+        return Notification(
+            user_id=interview.application.student.user_id,
+            title=f"Interview at {when:%H:%M}: {job.company_name}",
+            message=f"Your interview for {job.title} is at {when:%b %d, %H:%M}{where}.",
+            notification_type=self.notification_type,
+        )
+
+
+class CertificationExpiry(Reminder):
+    kind = 'certification_expiry'
+    notification_type = 'reminder'
+    window = timedelta(days=30)
+
+    def candidates(self, now):
+        today = timezone.localdate(now)
+        return Certification.objects.filter(
+            expiry_date__gte=today, expiry_date__lte=today + self.window,
+        ).select_related('student')
+
+    def due_at(self, certification):
+        # The ledger keys on a datetime; expiry dates are stored as midnight UTC.
+        return datetime.combine(certification.expiry_date, time.min, tzinfo=dt_timezone.utc)
+
+    def notification(self, certification):
+        return Notification(
+            user_id=certification.student.user_id,
+            title=f"Certification expiring: {certification.name}",
+            message=f"Your {certification.name} certification from {certification.issuer} "
+                    f"expires on {certification.expiry_date:%b %d, %Y}.",
+            notification_type=self.notification_type,
+        )
+
+
+REMINDERS = [SavedJobDeadline(), UpcomingInterview(), CertificationExpiry()]
+
+
+def run_reminder(reminder, now):
+    """Fire one reminder type; return how many notifications were created."""
+    due = list(reminder.pending(now))
+    if not due:
+        return 0
+    try:
+        with write_atomic():
+            ReminderLog.objects.bulk_create([
+                ReminderLog(kind=reminder.kind, object_id=obj.pk, due_at=reminder.due_at(obj)) for obj in due
+            ])
+            notifications = Notification.objects.bulk_create([reminder.notification(obj) for obj in due])
+            # bulk_create skips post_save, so do what the signal handlers would.
+            digests.enqueue_many(notifications)
+    except IntegrityError:
+        # Another node sent some of these first; the next tick picks up the rest.
+        return 0
+    for notification in notifications:
+        data = {
+            "title": notification.title,
+            "message": notification.message,
+            "notification_type": notification.notification_type,
+        }
+        live.notify(notification.user_id, "notification", data)
+    return len(notifications)
+
+
+def run_reminders(now=None):
+    """One scheduler tick; returns {kind: notifications created}."""
+    now = now or timezone.now()
+    return {reminder.kind: run_reminder(reminder, now) for reminder in REMINDERS}
@@ -0,0 +1,214 @@
+"""
+Resume text extraction and keyword indexing.
+
+``extract_file`` is a pure function of a file path so it can run in a
+process pool: DOCX text comes from the document XML parts, PDF text from the
+literal strings drawn by text operators in (Flate-decoded) content streams.
+That covers text-based PDFs from word processors and resume builders;
+scanned PDFs and legacy .doc files yield no text.
+
+``index_pending`` finds resumes whose text is missing or older than the
+resume, extracts them in a pool and writes ResumeText + ResumeKeyword rows.
+A file that fails to parse, or kills its worker, is recorded in
+ResumeText.error without holding up the rest of the batch.
+"""
+import re
+import zipfile
+import zlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from xml.etree import ElementTree
+
+from django.db.models import F, Q
+
+from accounts.db import write_atomic
+
+from .models import Resume, ResumeKeyword, ResumeText
+
+MAX_TEXT = 200_000
+# Decompressed content-stream bytes read per PDF; bounds a Flate bomb.
+MAX_TEXT_BYTES = 8_000_000
+MAX_KEYWORDS = 5000
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+# ---- extraction (runs in worker processes) ----
+
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_DOCX_PARTS = re.compile(r"word/(document|header\d*|footer\d*)\.xml$")
+
+
+def extract_docx(path):
+    lines = []
+    with zipfile.ZipFile(path) as archive:
+        for name in sorted(n for n in archive.namelist() if _DOCX_PARTS.match(n)):
+            root = ElementTree.fromstring(archive.read(name))
+            for paragraph in root.iter(f"{_W_NS}p"):
+                text = "".join(node.text or "" for node in paragraph.iter(f"{_W_NS}t"))
+                if text:
+                    lines.append(text)
+    return "\n".join(lines)
+
+
+_PDF_STREAM = re.compile(rb"stream\r?\n(.*?)\r?\nendstream", re.S)
+_PDF_TEXT_OBJECT = re.compile(rb"BT(.*?)ET", re.S)
+_PDF_STRING = rb"\((?:\\.|[^\\)])*\)"
+# A TJ array ([(Kub) 10 (ernetes)] TJ) or a single string shown by Tj/'/".
+_PDF_SHOW = re.compile(rb"\[((?:" + _PDF_STRING + rb"|[^\]])*)\]\s*TJ|(" + _PDF_STRING + rb")", re.S)
+_PDF_ARRAY_ITEM = re.compile(_PDF_STRING + rb"|-?\d*\.?\d+", re.S)
+# TJ offsets are in thousandths of an em; large negative ones are word gaps.
+_PDF_WORD_GAP = -200
+_PDF_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f"}
+
+
+def _pdf_unescape(literal):
+    body = literal[1:-1]
+    out = bytearray()
+    i = 0
+    while i < len(body):
+        char = body[i:i + 1]
+        if char != b"\\":
+            out += char
+            i += 1
+            continue
+        nxt = body[i + 1:i + 2]
+        octal = re.match(rb"[0-7]{1,3}", body[i + 1:i + 4])
+        if octal:
+            out.append(int(octal.group(), 8) & 0xFF)
+            i += 1 + len(octal.group())
+        else:
+            out += _PDF_ESCAPES.get(nxt, nxt if nxt != b"\n" else b"")
+            i += 2
+    return out.decode("latin-1")
+
+
+def extract_pdf(path):
+    with open(path, "rb") as handle:
+        data = handle.read()
+    chunks = []
+    budget = MAX_TEXT_BYTES
+    for match in _PDF_STREAM.finditer(data):
+        if budget <= 0:
+            break
+        stream = match.group(1)
+        try:
+            stream = zlib.decompressobj().decompress(stream, budget)
+        except zlib.error:
+            pass
+        budget -= len(stream)
+        for text_object in _PDF_TEXT_OBJECT.finditer(stream):
+            shown = []
+            for array, string in _PDF_SHOW.findall(text_object.group(1)):
+                if string:
+                    shown.append(_pdf_unescape(string))
+                    continue
+                parts = []
+                for item in _PDF_ARRAY_ITEM.findall(array):
+                    if item.startswith(b"("):
+                        parts.append(_pdf_unescape(item))
+                    elif float(item) <= _PDF_WORD_GAP:
+                        parts.append(" ")
+                shown.append("".join(parts))
+            if shown:
+                chunks.append(" ".join(shown))
+    return "\n".join(chunks)
+
+
+def _error(exc):
+    return f"{type(exc).__name__}: {exc}"[:200]
+
+
+def extract_file(path):
+    """Return (text, error) for a resume file path; never raises."""
+    lowered = path.lower()
+    try:
+        if lowered.endswith(".docx"):
+            text = extract_docx(path)
+        elif lowered.endswith(".pdf"):
+            text = extract_pdf(path)
+        else:
+            return "", "Unsupported file type"
+    except Exception as exc:
+        # Uploads are untrusted: any parser failure marks this resume failed, not the batch.
+        return "", _error(exc)
+    return text[:MAX_TEXT], ""
+
+
+# ---- indexing (runs in the Django process) ----
+
+def keywords(text):
+    """Distinct words of ``text``, most frequent first (ties in order of appearance), capped at MAX_KEYWORDS."""
+    counts = Counter(word.rstrip(".") for word in _WORD.findall(text.lower()))
+    return [word for word, _ in counts.most_common() if len(word) <= 50][:MAX_KEYWORDS]
+
+
+def pending_resumes():
+    """Resumes with no extracted text, or whose text predates the last edit."""
+    return Resume.objects.filter(
+        Q(search_text__isnull=True) | Q(search_text__source_updated_at__lt=F("updated_at"))
+    ).order_by("pk")
+
+
+def save_text(resume, text, error=""):
+    text = "\n".join(part for part in (resume.content, text) if part)
+    with write_atomic():
+        ResumeText.objects.update_or_create(
+            resume=resume,
+            defaults={"text": text, "error": error, "source_updated_at": resume.updated_at},
+        )
+        ResumeKeyword.objects.filter(resume=resume).delete()
+        ResumeKeyword.objects.bulk_create(
+            [ResumeKeyword(resume=resume, word=word) for word in keywords(text)],
+            batch_size=1000,
+        )
+
+
+def _file_path(resume):
+    if not resume.file:
+        return None
+    try:
+        return resume.file.path
+    except NotImplementedError:
+        # Remote storage: nothing to hand to a worker process.
+        return None
+
+
+def index_pending(batch_size=50, workers=None, executor=None):
+    """Extract and index one batch of pending resumes; return how many were processed."""
+    batch = list(pending_resumes()[:batch_size])
+    if not batch:
+        return 0
+    paths = {resume.pk: _file_path(resume) for resume in batch}
+    to_extract = [resume for resume in batch if paths[resume.pk]]
+    results = {}
+    if to_extract:
+        own_executor = executor is None
+        executor = executor or ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = {resume.pk: executor.submit(extract_file, paths[resume.pk]) for resume in to_extract}
+            for pk, future in futures.items():
+                try:
+                    results[pk] = future.result()
+                except Exception as exc:
+                    # e.g. a worker killed mid-file (BrokenProcessPool)
+                    results[pk] = ("", _error(exc))
+        finally:
+            if own_executor:
+                executor.shutdown()
+    for resume in batch:
+        text, error = results.get(resume.pk, ("", ""))
+        save_text(resume, text, error)
+    return len(batch)
+
+
+def filter_by_keywords(applications, query):
+    """Narrow an Application queryset to those whose resume contains every word of ``query``.
+
+    A query with no searchable words matches nothing rather than everyone.
+    """
+    words = keywords(query)
+    if not words:
+        return applications.none()
+    for word in words:
+        applications = applications.filter(resume__keywords__word=word)
+    return applications
@@ -0,0 +1,94 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import announcements, digests, ical, live, talent_pool
+from .models import (
+    Announcement, Application, Interview, JobPosting, Message, Notification, Skill, StudentProfile,
+)
+
+
+@receiver(post_save, sender=Interview)
+@receiver(post_delete, sender=Interview)
+def interview_changed(sender, instance, **kwargs):
+    # Both the student and the recruiter who owns the job see this interview.
+    participants = (
+        Application.objects.filter(pk=instance.application_id)
+        .values_list("student__user_id", "job__posted_by_id")
+        .first()
+    )
+    if participants:
+        ical.touch_feeds(participants)
+
+
+@receiver(post_save, sender=JobPosting)
+def job_changed(sender, instance, created, **kwargs):
+    # Event summaries embed the job title and company.
+    if created:
+        return
+    student_ids = list(
+        Interview.objects.filter(application__job=instance).values_list("application__student__user_id", flat=True)
+    )
+    if student_ids:
+        ical.touch_feeds(student_ids + [instance.posted_by_id])
+
+
+@receiver(post_save, sender=StudentProfile)
+@receiver(post_delete, sender=StudentProfile)
+def student_profile_changed(sender, instance, **kwargs):
+    # Read the id now: a deleted instance has pk None by the time the commit runs.
+    student_id = instance.pk
+    transaction.on_commit(lambda: talent_pool.students_changed([student_id]))
+
+
+@receiver(post_save, sender=Skill)
+@receiver(post_delete, sender=Skill)
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def student_facets_changed(sender, instance, **kwargs):
+    # Skills and accepted offers feed the talent-pool bitsets.
+    transaction.on_commit(lambda: talent_pool.students_changed([instance.student_id]))
+
+
+@receiver(post_save, sender=Notification)
+def notification_created(sender, instance, created, **kwargs):
+    if not created:
+        return
+    data = {
+        "title": instance.title,
+        "message": instance.message,
+        "notification_type": instance.notification_type,
+    }
+    transaction.on_commit(lambda: live.notify(instance.user_id, "notification", data))
+    digests.enqueue(instance)
+
+
+@receiver(post_save, sender=Message)
+def message_created(sender, instance, created, **kwargs):
+    if not created:
+        return
+    data = {
+        "thread": instance.thread_id,
+        "subject": instance.subject,
+        "sender": instance.sender.username,
+    }
+    transaction.on_commit(lambda: live.notify(instance.recipient_id, "message", data))
+
+
+@receiver(post_save, sender=Announcement)
+def announcement_created(sender, instance, created, **kwargs):
+    if not created:
+        return
+    data = {
+        "title": instance.title,
+        "message": instance.message,
+        "notification_type": "announcement",
+    }
+
+    def push():
+        # Only users with a stream open in this process need an event now;
+        # everyone else picks the announcement up on their next read.
+        for user_id in announcements.audience(instance, live.subscribed_user_ids()):
+            live.notify(user_id, "notification", data)
+
+    transaction.on_commit(push)
@@ -0,0 +1,67 @@
+"""
+Skill name normalization against the canonical taxonomy.
+
+Free-text names are reduced to a lookup key and resolved through SkillAlias;
+names that match nothing become new canonical skills so every Skill and
+PortfolioItem can point at an integer id.
+"""
+import re
+
+from django.db import IntegrityError, transaction
+
+from .models import CanonicalSkill, SkillAlias
+
+_WHITESPACE = re.compile(r"\s+")
+# Keep characters that carry meaning in skill names (C++, C#, .NET, Node.js).
+_STRIP = " \t\r\n,;:!?\"'()[]{}"
+
+
+def skill_key(name):
+    """Lookup key for a skill name: lower-cased, trimmed, single-spaced."""
+    return _WHITESPACE.sub(" ", (name or "").strip(_STRIP).lower())[:100]
+
+
+def split_technologies(text):
+    """Split a comma/semicolon separated technologies string into names."""
+    return [part.strip() for part in re.split(r"[,;\n]", text or "") if skill_key(part)]
+
+
+def _create(key, name):
+    try:
+        with transaction.atomic():
+            skill = CanonicalSkill.objects.create(key=key, name=name.strip()[:100])
+            SkillAlias.objects.create(alias=key, skill=skill)
+            return skill
+    except IntegrityError:
+        # Someone else created it concurrently.
+        return SkillAlias.objects.select_related("skill").get(alias=key).skill
+
+
+def resolve_many(names, create=True):
+    """
+    Map names to CanonicalSkill objects, creating unknown ones.
+
+    Returns a dict keyed by skill_key(name). Known names cost a single
+    indexed query regardless of how many are passed. With create=False
+    unknown names are simply left out.
+    """
+    wanted = {}
+    for name in names:
+        key = skill_key(name)
+        if key:
+            wanted.setdefault(key, name)
+    if not wanted:
+        return {}
+    resolved = {
+        alias.alias: alias.skill
+        for alias in SkillAlias.objects.select_related("skill").filter(alias__in=list(wanted))
+    }
+    for key, name in wanted.items():
+        if create and key not in resolved:
+            resolved[key] = _create(key, name)
+    return resolved
+
+
+def resolve(name):
+    """Return the CanonicalSkill for one name (None for a blank name)."""
+    return resolve_many([name]).get(skill_key(name))
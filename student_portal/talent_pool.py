@@ -0,0 +1,230 @@
+"""
+In-memory bitmap index over StudentProfile ids for talent-pool searches.
+
+Every facet value (canonical skill, branch, year, graduation year, CGPA,
+eligibility, placed) owns one bitset, stored as a Python int with bit N set
+for StudentProfile id N. Boolean queries are then a handful of AND/OR/NOT
+operations on those ints, and counts are popcounts.
+
+The index is built lazily per process, kept current by the signals in
+signals.py for changes made in this process, and rebuilt after MAX_AGE
+seconds to pick up changes made by other workers.
+"""
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+from .models import Application, Skill, StudentProfile
+
+MAX_AGE = 300
+
+ELIGIBLE = ("eligible",)
+PLACED = ("placed",)
+
+
+def _norm(value):
+    return (value or "").strip().upper()
+
+
+def _cgpa_bucket(cgpa):
+    # Hundredths: CGPA is stored with two decimals, so bucket >= threshold is exact.
+    return int(Decimal(cgpa) * 100)
+
+
+def iter_ids(bits):
+    """Yield the set bit positions of ``bits`` in ascending order."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+@dataclass
+class TalentQuery:
+    """AND across facets; OR within branches/years/graduation_years; AND across skills."""
+    branches: list = field(default_factory=list)
+    years: list = field(default_factory=list)
+    graduation_years: list = field(default_factory=list)
+    skill_ids: list = field(default_factory=list)
+    min_cgpa: Decimal | None = None
+    eligible_only: bool = False
+    exclude_placed: bool = False
+
+
+class TalentPoolIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._bits = defaultdict(int)
+        self._members = {}
+        self._all = 0
+        self.built_at = None
+
+    # ---- building ----
+
+    @staticmethod
+    def _keys(row, skill_ids, placed):
+        keys = {("branch", _norm(row["branch"])), ("year", _norm(row["year"]))}
+        if row["graduation_year"]:
+            keys.add(("grad", row["graduation_year"]))
+        if row["cgpa"] is not None:
+            keys.add(("cgpa", _cgpa_bucket(row["cgpa"])))
+        if row["placement_eligible"]:
+            keys.add(ELIGIBLE)
+        if placed:
+            keys.add(PLACED)
+        keys.update(("skill", skill_id) for skill_id in skill_ids)
+        return frozenset(keys)
+
+    @staticmethod
+    def _fetch(student_ids=None):
+        students = StudentProfile.objects.all()
+        skills = Skill.objects.filter(canonical__isnull=False)
+        placed = Application.objects.filter(status="accepted")
+        if student_ids is not None:
+            students = students.filter(pk__in=student_ids)
+            skills = skills.filter(student_id__in=student_ids)
+            placed = placed.filter(student_id__in=student_ids)
+        rows = list(students.values("id", "branch", "year", "graduation_year", "cgpa", "placement_eligible"))
+        skill_map = defaultdict(set)
+        for student_id, skill_id in skills.values_list("student_id", "canonical_id"):
+            skill_map[student_id].add(skill_id)
+        placed_ids = set(placed.values_list("student_id", flat=True))
+        return rows, skill_map, placed_ids
+
+    def load(self, rows, skill_map, placed_ids):
+        """Replace the whole index from pre-fetched rows."""
+        bits = defaultdict(int)
+        members = {}
+        everyone = 0
+        for row in rows:
+            sid = row["id"]
+            keys = self._keys(row, skill_map.get(sid, ()), sid in placed_ids)
+            members[sid] = keys
+            bit = 1 << sid
+            everyone |= bit
+            for key in keys:
+                bits[key] |= bit
+        with self._lock:
+            self._bits, self._members, self._all = bits, members, everyone
+            self.built_at = time.monotonic()
+
+    def rebuild(self):
+        self.load(*self._fetch())
+
+    def refresh(self, student_ids):
+        """Re-read the given students from the database and patch their bits."""
+        student_ids = set(student_ids)
+        if not student_ids or self.built_at is None:
+            return
+        rows, skill_map, placed_ids = self._fetch(student_ids)
+        fresh = {
+            row["id"]: self._keys(row, skill_map.get(row["id"], ()), row["id"] in placed_ids)
+            for row in rows
+        }
+        with self._lock:
+            for sid in student_ids:
+                bit = 1 << sid
+                old = self._members.pop(sid, frozenset())
+                new = fresh.get(sid)
+                for key in old - (new or frozenset()):
+                    self._bits[key] &= ~bit
+                if new is None:
+                    self._all &= ~bit
+                    continue
+                for key in new - old:
+                    self._bits[key] |= bit
+                self._members[sid] = new
+                self._all |= bit
+
+    def is_stale(self):
+        return self.built_at is None or time.monotonic() - self.built_at > MAX_AGE
+
+    # ---- querying ----
+
+    def _any(self, keys):
+        result = 0
+        for key in keys:
+            result |= self._bits.get(key, 0)
+        return result
+
+    def query(self, q):
+        """Return the bitset of StudentProfile ids matching ``q``."""
+        with self._lock:
+            result = self._all
+            if q.branches:
+                result &= self._any(("branch", _norm(b)) for b in q.branches)
+            if q.years:
+                result &= self._any(("year", _norm(y)) for y in q.years)
+            if q.graduation_years:
+                result &= self._any(("grad", y) for y in q.graduation_years)
+            for skill_id in q.skill_ids:
+                result &= self._bits.get(("skill", skill_id), 0)
+            if q.min_cgpa is not None:
+                floor = _cgpa_bucket(q.min_cgpa)
+                result &= self._any(key for key in self._bits if key[0] == "cgpa" and key[1] >= floor)
+            if q.eligible_only:
+                result &= self._bits.get(ELIGIBLE, 0)
+            if q.exclude_placed:
+                result &= ~self._bits.get(PLACED, 0)
+            return result
+
+    def facet_counts(self, result, facet):
+        """Count matches per value of a facet ("branch", "year", "grad")."""
+        with self._lock:
+            counts = {
+                key[1]: (result & bits).bit_count()
+                for key, bits in self._bits.items()
+                if key[0] == facet and key[1] != ""
+            }
+        return sorted(((value, n) for value, n in counts.items() if n), key=lambda item: -item[1])
+
+
+index = TalentPoolIndex()
+_build_lock = threading.Lock()
+
+
+def get_index():
+    """Return the process-wide index, (re)building it when missing or stale."""
+    if index.is_stale():
+        with _build_lock:
+            if index.is_stale():
+                index.rebuild()
+    return index
+
+
+def students_changed(student_ids):
+    """Patch the index after students' profile, skills or placement changed."""
+    index.refresh(student_ids)
+
+
+def search(q, page_size=25, page=1):
+    """
+    Run a query and load one page of matching StudentProfiles.
+
+    Returns a dict with the total count, per-branch and per-year counts and
+    the requested page of profiles (ordered by id).
+    """
+    idx = get_index()
+    started = time.perf_counter()
+    result = idx.query(q)
+    total = result.bit_count()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    offset = (page - 1) * page_size
+    page_ids = []
+    for position, sid in enumerate(iter_ids(result)):
+        if position >= offset + page_size:
+            break
+        if position >= offset:
+            page_ids.append(sid)
+    students = StudentProfile.objects.select_related("user").in_bulk(page_ids)
+    return {
+        "total": total,
+        "query_ms": elapsed_ms,
+        "branch_counts": idx.facet_counts(result, "branch"),
+        "year_counts": idx.facet_counts(result, "year"),
+        "students": [students[sid] for sid in page_ids if sid in students],
+        "page": page,
+        "has_next": total > offset + page_size,
+    }
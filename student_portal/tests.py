@@ -1,3 +1,913 @@
-from django.test import TestCase
+import io
+import json
+import os
+import shutil
+import smtplib
+import tempfile
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.core.mail.backends.locmem import EmailBackend as LocmemBackend
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Profile
+from accounts.testing import QueryBudgetMixin
+from recruiter_portal.models import ApiToken
+
+from . import announcements, digests, ical, intake, live, recipients, reminders, resume_text, retention, skills, threads, views
+from .forms import SkillForm
+from .models import (
+    Announcement, Application, CanonicalSkill, Certification, DigestPreference, EmailDelivery, IntakeCheckpoint,
+    Interview, JobPosting, Message, Notification, NotificationArchive, PortfolioItem, ReminderLog, Resume, ResumeText,
+    SavedJob, Skill, StudentProfile, Thread, ThreadParticipant,
+)
+
+
+@override_settings(RATE_LIMITS={})
+class ApplicationResumeScopeTests(TestCase):
+    """The apply form only offers, and only accepts, the applicant's own resumes."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user('applicant')
+        profile = StudentProfile.objects.create(user=cls.student)
+        cls.own = Resume.objects.create(student=profile, title='My Resume', content='Python')
+        other = StudentProfile.objects.create(user=User.objects.create_user('someone_else'))
+        cls.foreign = Resume.objects.create(student=other, title='Someone Else Resume', content='Java')
+        recruiter = User.objects.create_user('recruiter')
+        cls.job = JobPosting.objects.create(
+            title='Engineer', company_name='Acme', description='d', requirements='r', posted_by=recruiter,
+        )
+
+    def setUp(self):
+        self.client.force_login(self.student)
+        self.url = reverse('student:job_detail', args=[self.job.pk])
+
+    def test_only_own_resumes_are_offered(self):
+        response = self.client.get(self.url)
+        self.assertContains(response, 'My Resume')
+        self.assertNotContains(response, 'Someone Else Resume')
+
+    def test_cannot_apply_with_another_students_resume(self):
+        self.client.post(self.url, {'apply': '1', 'resume': self.foreign.pk})
+        self.assertFalse(Application.objects.filter(job=self.job).exists())
+
+    def test_can_apply_with_own_resume(self):
+        self.client.post(self.url, {'apply': '1', 'resume': self.own.pk})
+        self.assertEqual(Application.objects.get(job=self.job).resume, self.own)
+
+
+class TempMediaMixin:
+    """Store uploads in a throwaway MEDIA_ROOT."""
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def stored_files(self):
+        return [name for _, _, names in os.walk(self.media_root) for name in names]
+
+
+@override_settings(RATE_LIMITS={})
+class ResumeUploadApplyTests(TempMediaMixin, TestCase):
+    """An apply with an uploaded resume that is refused leaves no file behind."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user('uploader')
+        cls.profile = StudentProfile.objects.create(user=cls.student)
+        cls.recruiter = User.objects.create_user('upload_recruiter')
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.student)
+
+    def job(self, deadline):
+        return JobPosting.objects.create(
+            title='Engineer', company_name='Acme', description='d', requirements='r',
+            posted_by=self.recruiter, application_deadline=deadline,
+        )
+
+    def apply(self, job):
+        upload = SimpleUploadedFile('cv.pdf', b'%PDF-1.4 resume', content_type='application/pdf')
+        return self.client.post(reverse('student:job_detail', args=[job.pk]), {'apply': '1', 'resume_file': upload})
+
+    def test_expired_job_rejects_application(self):
+        job = self.job(timezone.now() - timedelta(hours=1))
+        response = self.apply(job)
+        self.assertContains(response, 'The application deadline for this job has passed.')
+        self.assertFalse(Application.objects.filter(job=job).exists())
+        self.assertFalse(Resume.objects.filter(student=self.profile).exists())
+        self.assertEqual(self.stored_files(), [])
+
+    def test_job_closing_during_apply_stores_nothing(self):
+        job = self.job(timezone.now() + timedelta(days=3))
+        with mock.patch.object(views, '_lock_open_job', return_value=False):
+            response = self.apply(job)
+        self.assertContains(response, 'The application deadline for this job has passed.')
+        self.assertFalse(Resume.objects.filter(student=self.profile).exists())
+        self.assertEqual(self.stored_files(), [])
+
+    def test_concurrent_duplicate_apply_deletes_the_upload(self):
+        job = self.job(timezone.now() + timedelta(days=3))
+
+        def other_request_applies_first(job):
+            Application.objects.create(student=self.profile, job=job)
+            return True
+
+        with mock.patch.object(views, '_lock_open_job', side_effect=other_request_applies_first):
+            response = self.apply(job)
+        self.assertContains(response, 'You have already applied for this job.')
+        self.assertFalse(Resume.objects.filter(student=self.profile).exists())
+        self.assertEqual(self.stored_files(), [])
+
+    def test_dropped_intake_record_deletes_the_upload(self):
+        job = self.job(timezone.now() + timedelta(days=3))
+        Application.objects.create(student=self.profile, job=job)
+        name = intake.save_upload(SimpleUploadedFile('cv.pdf', b'%PDF-1.4 resume'))
+        record = {'student_id': self.profile.pk, 'job_id': job.pk, 'resume_file': name}
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.assertEqual(intake.commit_records([record]), (0, 1, 0))
+        self.assertEqual(self.stored_files(), [])
+
+
+@override_settings(RATE_LIMITS={}, APPLICATION_SURGE_HOURS=1)
+class SurgeIntakeTests(TestCase):
+    """Applies near the deadline go through the intake log and are committed exactly once."""
+
+    @classmethod
+    def setUpTestData(cls):
+        recruiter = User.objects.create_user('surge_recruiter')
+        cls.job = JobPosting.objects.create(
+            title='Engineer', company_name='Acme', description='d', requirements='r', posted_by=recruiter,
+            application_deadline=timezone.now() + timedelta(minutes=30),
+        )
+        cls.students = [StudentProfile.objects.create(user=User.objects.create_user(f'surge{n}')) for n in range(5)]
+
+    def setUp(self):
+        intake_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, intake_dir)
+        settings_override = override_settings(APPLICATION_INTAKE_DIR=intake_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_apply_is_logged_and_acknowledged(self):
+        self.client.force_login(self.students[0].user)
+        response = self.client.post(reverse('student:job_detail', args=[self.job.pk]), {'apply': '1'}, follow=True)
+        self.assertContains(response, 'has been received')
+        self.assertFalse(Application.objects.exists())
+        self.assertEqual(intake.drain(), (1, 0, 0))
+        self.assertTrue(Application.objects.filter(student=self.students[0], job=self.job).exists())
+        self.assertTrue(
+            Notification.objects.filter(user=self.students[0].user, title__startswith='Application submitted').exists()
+        )
+
+    def test_crash_mid_drain_commits_each_record_once(self):
+        for student in self.students:
+            intake.append(student, self.job)
+        commit_records, calls = intake.commit_records, []
+
+        def crash_on_second_batch(records):
+            calls.append(len(records))
+            if len(calls) == 2:
+                raise RuntimeError('committer killed')
+            return commit_records(records)
+
+        with mock.patch.object(intake, 'commit_records', side_effect=crash_on_second_batch):
+            with self.assertRaises(RuntimeError):
+                intake.drain(batch_size=2)
+        self.assertEqual(Application.objects.count(), 2)
+        # The rolled-back batch and the rest are picked up from the saved offset, nothing twice.
+        self.assertEqual(intake.drain(batch_size=2), (3, 0, 0))
+        self.assertEqual(intake.drain(batch_size=2), (0, 0, 0))
+        self.assertEqual(
+            sorted(Application.objects.values_list('student_id', flat=True)), [s.pk for s in self.students],
+        )
+
+    def test_double_submit_is_dropped(self):
+        intake.append(self.students[0], self.job)
+        intake.append(self.students[0], self.job)
+        self.assertEqual(intake.drain(), (1, 1, 0))
+        self.assertEqual(Application.objects.count(), 1)
+
+    def test_finished_segment_is_removed(self):
+        now = timezone.now()
+        intake.append(self.students[0], self.job, now=now - timedelta(hours=2))
+        self.assertEqual(intake.drain(now=now), (1, 0, 0))
+        self.assertEqual(list(intake.intake_dir().iterdir()), [])
+        self.assertFalse(IntakeCheckpoint.objects.exists())
+
+
+class TemplateFragmentCacheTests(TestCase):
+    """Job cards are cached per job version; sidebars per role and TEMPLATE_FRAGMENT_VERSION."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user('browser')
+        Profile.objects.filter(user=cls.student).update(role=Profile.Role.STUDENT)
+        StudentProfile.objects.create(user=cls.student)
+        cls.job = JobPosting.objects.create(
+            title='Backend Engineer', company_name='Acme', description='d', requirements='r',
+            posted_by=User.objects.create_user('card_recruiter'),
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client.force_login(self.student)
+
+    def test_job_card_follows_updated_at(self):
+        self.assertContains(self.client.get(reverse('student:job_search')), 'Backend Engineer')
+        # A queryset update leaves updated_at alone, so the cached card is still served.
+        JobPosting.objects.filter(pk=self.job.pk).update(title='Platform Engineer')
+        self.assertContains(self.client.get(reverse('student:job_search')), 'Backend Engineer')
+        self.job.title = 'Platform Engineer'
+        self.job.save()
+        response = self.client.get(reverse('student:job_search'))
+        self.assertContains(response, 'Platform Engineer')
+        self.assertNotContains(response, 'Backend Engineer')
+
+    def test_saved_marker_stays_outside_the_card(self):
+        self.client.get(reverse('student:job_search'))
+        SavedJob.objects.create(student=self.student.student_profile, job=self.job)
+        self.assertContains(self.client.get(reverse('student:job_search')), 'bi-bookmark-fill')
+
+    def test_sidebar_is_cached_per_fragment_version(self):
+        self.assertEqual(self.client.get(reverse('student:dashboard')).status_code, 200)
+        self.assertIsNotNone(cache.get(make_template_fragment_key('sidebar', ['student', 1])))
+        with override_settings(TEMPLATE_FRAGMENT_VERSION=2):
+            self.client.get(reverse('student:dashboard'))
+        self.assertIsNotNone(cache.get(make_template_fragment_key('sidebar', ['student', 2])))
+
+
+def docx_bytes(text):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr(
+            'word/document.xml',
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f'<w:body><w:p><w:r><w:t>{text}</w:t></w:r></w:p></w:body></w:document>',
+        )
+    return buffer.getvalue()
+
+
+class ResumeTextTests(TempMediaMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.profile = StudentProfile.objects.create(user=User.objects.create_user('indexed'))
+
+    def resume(self, name, data):
+        return Resume.objects.create(student=self.profile, title=name, file=SimpleUploadedFile(name, data))
+
+    def index(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            return resume_text.index_pending(executor=executor)
+
+    def test_keywords_rank_by_frequency_before_truncating(self):
+        text = 'zebra python python django django django apple'
+        self.assertEqual(resume_text.keywords(text), ['django', 'python', 'zebra', 'apple'])
+        with mock.patch.object(resume_text, 'MAX_KEYWORDS', 2):
+            self.assertEqual(resume_text.keywords(text), ['django', 'python'])
+
+    def test_docx_is_extracted_and_indexed(self):
+        resume = self.resume('cv.docx', docx_bytes('Kubernetes and Python'))
+        self.assertEqual(self.index(), 1)
+        self.assertEqual(ResumeText.objects.get(resume=resume).error, '')
+        self.assertEqual(
+            set(resume.keywords.values_list('word', flat=True)), {'kubernetes', 'and', 'python'},
+        )
+        self.assertEqual(self.index(), 0)
+
+    def test_unexpected_parser_error_marks_only_that_resume_failed(self):
+        good = self.resume('good.docx', docx_bytes('Python'))
+        bad = self.resume('bad.pdf', b'%PDF-1.4')
+        with mock.patch.object(resume_text, 'extract_pdf', side_effect=RecursionError('too deep')):
+            self.assertEqual(self.index(), 2)
+        self.assertEqual(ResumeText.objects.get(resume=bad).error, 'RecursionError: too deep')
+        self.assertEqual(ResumeText.objects.get(resume=good).error, '')
+        self.assertTrue(good.keywords.filter(word='python').exists())
+        self.assertEqual(self.index(), 0)
+
+    def test_failed_worker_marks_resume_failed(self):
+        resume = self.resume('cv.docx', docx_bytes('Python'))
+        executor = mock.Mock()
+        executor.submit.return_value.result.side_effect = OSError('worker died')
+        self.assertEqual(resume_text.index_pending(executor=executor), 1)
+        self.assertEqual(ResumeText.objects.get(resume=resume).error, 'OSError: worker died')
+
+    def test_pdf_decompression_stops_at_the_cap(self):
+        bomb = zlib.compress(b'BT (Python) Tj ET' + b' ' * 1_000_000)
+        data = b'%PDF-1.4\nstream\n' + bomb + b'\nendstream\nstream\nBT (Django) Tj ET\nendstream\n'
+        path = os.path.join(self.media_root, 'bomb.pdf')
+        with open(path, 'wb') as handle:
+            handle.write(data)
+        with mock.patch.object(resume_text, 'MAX_TEXT_BYTES', 1000):
+            self.assertEqual(resume_text.extract_pdf(path), 'Python')
+
+    def test_single_character_terms_are_searched(self):
+        job = JobPosting.objects.create(
+            title='Firmware', company_name='Acme', description='d', requirements='r',
+            posted_by=User.objects.create_user('firmware_recruiter'),
+        )
+        c_resume = self.resume('c.docx', docx_bytes('C and Python'))
+        c_application = Application.objects.create(student=self.profile, job=job, resume=c_resume)
+        other = StudentProfile.objects.create(user=User.objects.create_user('java_dev'))
+        java_resume = Resume.objects.create(student=other, title='Java', content='Java and Python')
+        Application.objects.create(student=other, job=job, resume=java_resume)
+        self.index()
+        applications = Application.objects.filter(job=job)
+        self.assertEqual(list(resume_text.filter_by_keywords(applications, 'C')), [c_application])
+        self.assertEqual(resume_text.filter_by_keywords(applications, 'python').count(), 2)
+        self.assertFalse(resume_text.filter_by_keywords(applications, '!!').exists())
+
+
+class SkillTaxonomyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.profile = StudentProfile.objects.create(user=User.objects.create_user('skilled'))
+        cls.admin = User.objects.create_superuser('skills_admin', 'admin@example.com', 'pw')
+
+    def test_aliases_resolve_to_one_canonical_skill(self):
+        resolved = skills.resolve_many(['Python', ' py ', 'PYTHON3', 'k8s'])
+        self.assertEqual(resolved['py'], resolved['python'])
+        self.assertEqual(resolved['python3'].name, 'Python')
+        self.assertEqual(resolved['k8s'].name, 'Kubernetes')
+
+    def test_unknown_name_becomes_canonical_once(self):
+        first = skills.resolve('Elixir')
+        self.assertEqual(skills.resolve(' elixir'), first)
+        self.assertEqual(CanonicalSkill.objects.filter(key='elixir').count(), 1)
+
+    def test_skill_form_links_canonical(self):
+        form = SkillForm({'name': 'js', 'proficiency_level': 'advanced'}, instance=Skill(student=self.profile))
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.save().canonical.name, 'JavaScript')
+
+    def admin_change(self, skill, **data):
+        self.client.force_login(self.admin)
+        data = {
+            'student': self.profile.pk, 'name': skill.name,
+            'canonical': skill.canonical_id or '', 'proficiency_level': skill.proficiency_level, **data,
+        }
+        response = self.client.post(reverse('admin:student_portal_skill_change', args=[skill.pk]), data)
+        self.assertEqual(response.status_code, 302)
+        skill.refresh_from_db()
+
+    def test_admin_rename_re_resolves_canonical(self):
+        skill = Skill.objects.create(student=self.profile, name='py', canonical=skills.resolve('py'))
+        self.admin_change(skill, name='k8s')
+        self.assertEqual(skill.canonical.name, 'Kubernetes')
+
+    def test_admin_explicit_canonical_is_kept(self):
+        skill = Skill.objects.create(student=self.profile, name='py', canonical=skills.resolve('py'))
+        java = skills.resolve('java')
+        self.admin_change(skill, name='Jython', canonical=java.pk)
+        self.assertEqual(skill.canonical, java)
+
+    def test_backfill_is_idempotent(self):
+        Skill.objects.create(student=self.profile, name='golang')
+        item = PortfolioItem.objects.create(student=self.profile, title='t', description='d', technologies='py, k8s')
+        call_command('backfill_skills', stdout=io.StringIO())
+        self.assertEqual(Skill.objects.get().canonical.name, 'Go')
+        self.assertEqual(sorted(item.skills.values_list('name', flat=True)), ['Kubernetes', 'Python'])
+        with self.assertNumQueries(2):
+            call_command('backfill_skills', stdout=io.StringIO())
+
+
+class MessageThreadTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = User.objects.create_user('alice')
+        cls.bob = User.objects.create_user('bob')
+        cls.carol = User.objects.create_user('carol')
+
+    def send(self, sender, recipient, subject, body='hello'):
+        return threads.deliver(Message(sender=sender, recipient=recipient, subject=subject, body=body))
+
+    def participant(self, user, message):
+        return ThreadParticipant.objects.get(user=user, thread_id=message.thread_id)
+
+    def test_replies_share_a_thread_per_pair_and_subject(self):
+        first = self.send(self.alice, self.bob, 'Offer letter')
+        reply = self.send(self.bob, self.alice, 'RE: Fwd:  offer   LETTER')
+        other_subject = self.send(self.alice, self.bob, 'Interview')
+        other_pair = self.send(self.alice, self.carol, 'Offer letter')
+        self.assertEqual(first.thread_id, reply.thread_id)
+        self.assertEqual(len({first.thread_id, other_subject.thread_id, other_pair.thread_id}), 3)
+        self.assertEqual(Thread.objects.get(pk=first.thread_id).subject, 'Offer letter')
+
+    def test_inbox_orders_by_activity_and_counts_unread(self):
+        old = self.send(self.alice, self.bob, 'Old')
+        self.send(self.carol, self.bob, 'New')
+        self.send(self.alice, self.bob, 'Re: Old', body='second ' * 40)
+        inbox = list(threads.inbox(self.bob))
+        self.assertEqual([p.thread.subject for p in inbox], ['Old', 'New'])
+        self.assertEqual([p.unread_count for p in inbox], [2, 1])
+        self.assertEqual(len(inbox[0].thread.last_snippet), threads.SNIPPET_LENGTH)
+        self.assertEqual(self.participant(self.alice, old).unread_count, 0)
+        self.assertEqual(threads.unread_total(self.bob), 2)
+
+    def test_opening_a_thread_marks_it_read_and_takes_replies(self):
+        message = self.send(self.alice, self.bob, 'Offer letter')
+        url = reverse('student:message_thread', args=[message.thread_id])
+        self.client.force_login(self.bob)
+        self.assertContains(self.client.get(url), 'hello')
+        self.assertEqual(self.participant(self.bob, message).unread_count, 0)
+        self.assertTrue(Message.objects.get(pk=message.pk).is_read)
+        self.client.post(url, {'body': 'thanks'})
+        reply = Message.objects.get(body='thanks')
+        self.assertEqual((reply.recipient, reply.thread_id), (self.alice, message.thread_id))
+        self.assertEqual(self.participant(self.alice, message).unread_count, 1)
+
+    def test_non_participant_cannot_open_thread(self):
+        message = self.send(self.alice, self.bob, 'Private')
+        self.client.force_login(self.carol)
+        response = self.client.get(reverse('student:message_thread', args=[message.thread_id]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_backfill_threads_existing_messages(self):
+        Message.objects.bulk_create([
+            Message(sender=self.alice, recipient=self.bob, subject='Offer', body='a'),
+            Message(sender=self.bob, recipient=self.alice, subject='Re: offer', body='b', is_read=True),
+            Message(sender=self.alice, recipient=self.bob, subject='Re: Offer', body='c'),
+        ])
+        self.assertEqual(threads.backfill(batch_size=2), 3)
+        self.assertEqual(Thread.objects.count(), 1)
+        self.assertEqual([p.unread_count for p in threads.inbox(self.bob)], [2])
+        self.assertEqual(threads.backfill(), 0)
+
+
+class LiveUpdatesTests(TestCase):
+    """The SSE stream only runs under ASGI with LIVE_UPDATES on; otherwise pages don't open it."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('listener')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.url = reverse('student:event_stream')
+
+    def test_off_by_default(self):
+        self.assertEqual(self.client.get(self.url).status_code, 204)
+        self.assertNotContains(self.client.get(reverse('student:notification_list')), 'js/live.js')
+
+    @override_settings(LIVE_UPDATES=True)
+    def test_wsgi_request_gets_204_even_when_enabled(self):
+        self.assertEqual(self.client.get(self.url).status_code, 204)
+        self.assertContains(self.client.get(reverse('student:notification_list')), 'js/live.js')
+
+    @override_settings(LIVE_UPDATES=True)
+    async def test_asgi_request_streams(self):
+        client = AsyncClient()
+        await client.aforce_login(self.user)
+        response = await client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+
+    async def test_stream_subscribes_until_closed(self):
+        frames = live.stream(self.user.pk)
+        self.assertEqual(await anext(frames), 'retry: %d\n\n' % live.RETRY_MS)
+        self.assertTrue((await anext(frames)).startswith('event: counts\n'))
+        self.assertEqual(live.connection_count(), 1)
+        await frames.aclose()
+        self.assertEqual(live.connection_count(), 0)
+
+
+class NotificationReadTests(TestCase):
+    """Opening the notification list marks read only what it rendered."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('reader')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.url = reverse('student:notification_list')
+
+    def announce(self, title='Drive'):
+        return Announcement.objects.create(title=title, message='m')
+
+    def notify(self, title='Update'):
+        return Notification.objects.create(user=self.user, title=title, message='m', notification_type='reminder')
+
+    def test_items_arriving_during_render_stay_unread(self):
+        self.announce()
+        self.notify()
+        real_mark_read = announcements.mark_read
+
+        def arrives_meanwhile(user, up_to):
+            self.announce('Late')
+            self.notify('Late')
+            real_mark_read(user, up_to)
+
+        with mock.patch.object(views.announcements, 'mark_read', side_effect=arrives_meanwhile):
+            self.client.get(self.url)
+        self.assertEqual(announcements.unread_count(self.user), 1)
+        self.assertEqual(list(Notification.objects.filter(is_read=False).values_list('title', flat=True)), ['Late'])
+
+    def test_announcements_for_others_do_not_move_the_cursor(self):
+        shown = self.announce()
+        Announcement.objects.create(title='TPO only', message='m', role='tpo')
+        self.client.get(self.url)
+        self.assertEqual(announcements.read_up_to(self.user), shown.pk)
+
+    def test_older_page_does_not_move_the_cursor_back(self):
+        older = self.announce('Older')
+        for n in range(20):
+            self.notify(f'n{n}')
+        newest = self.announce('Newest')
+        self.client.get(self.url)
+        self.assertEqual(announcements.read_up_to(self.user), newest.pk)
+        response = self.client.get(self.url, {'page': 2})
+        self.assertContains(response, 'Older')
+        self.assertEqual(announcements.read_up_to(self.user), newest.pk)
+        self.assertLess(older.pk, newest.pk)
+
+
+class NotificationArchiveTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('archivist')
+        cls.other = User.objects.create_user('bystander')
+
+    def notification(self, user, title, age_days, is_read=True):
+        notification = Notification.objects.create(
+            user=user, title=title, message='m', notification_type='reminder', is_read=is_read,
+        )
+        Notification.objects.filter(pk=notification.pk).update(created_at=timezone.now() - timedelta(days=age_days))
+        return notification
+
+    def test_only_old_read_notifications_move_in_batches(self):
+        for n in range(5):
+            self.notification(self.user, f'old {n}', 100 + n)
+        unread = self.notification(self.user, 'old unread', 200, is_read=False)
+        recent = self.notification(self.user, 'recent', 10)
+        self.assertEqual(retention.archive_notifications(batch_size=2), 5)
+        self.assertEqual(set(Notification.objects.values_list('pk', flat=True)), {unread.pk, recent.pk})
+        archived = NotificationArchive.objects.get(title='old 4')
+        self.assertEqual((archived.user, archived.notification_type), (self.user, 'reminder'))
+        self.assertLess(archived.created_at, timezone.now() - timedelta(days=103))
+        self.assertEqual(retention.archive_notifications(), 0)
+
+    def test_archive_page_lists_only_own_notifications(self):
+        self.notification(self.user, 'mine', 100)
+        self.notification(self.other, 'theirs', 100)
+        call_command('archive_notifications', stdout=io.StringIO())
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('student:notification_archive'))
+        self.assertContains(response, 'mine')
+        self.assertNotContains(response, 'theirs')
+
+
+class RecipientScopeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        def user(username, role, **fields):
+            user = User.objects.create_user(username, **fields)
+            Profile.objects.filter(user=user).update(role=role)
+            return User.objects.select_related('profile').get(pk=user.pk)
+
+        cls.student = user('stu_applicant', Profile.Role.STUDENT)
+        cls.classmate = user('stu_classmate', Profile.Role.STUDENT)
+        cls.recruiter = user('rec_hiring', Profile.Role.RECRUITER)
+        cls.other_recruiter = user('rec_other', Profile.Role.RECRUITER)
+        cls.tpo = user('tpo_officer', Profile.Role.TPO)
+        cls.retired_tpo = user('tpo_retired', Profile.Role.TPO, is_active=False)
+        cls.unknown = user('nobody', Profile.Role.UNKNOWN)
+        job = JobPosting.objects.create(
+            title='Engineer', company_name='Acme', description='d', requirements='r', posted_by=cls.recruiter,
+        )
+        JobPosting.objects.create(
+            title='Analyst', company_name='Other', description='d', requirements='r', posted_by=cls.other_recruiter,
+        )
+        Application.objects.create(student=StudentProfile.objects.create(user=cls.student), job=job)
+        StudentProfile.objects.create(user=cls.classmate)
+
+    def allowed(self, user):
+        return set(recipients.allowed_recipients(user).values_list('username', flat=True))
+
+    def test_student_reaches_tpo_and_recruiters_applied_to(self):
+        self.assertEqual(self.allowed(self.student), {'tpo_officer', 'rec_hiring'})
+
+    def test_recruiter_reaches_tpo_and_own_applicants(self):
+        self.assertEqual(self.allowed(self.recruiter), {'tpo_officer', 'stu_applicant'})
+        self.assertEqual(self.allowed(self.other_recruiter), {'tpo_officer'})
+
+    def test_tpo_reaches_every_active_role_but_self(self):
+        self.assertEqual(
+            self.allowed(self.tpo), {'stu_applicant', 'stu_classmate', 'rec_hiring', 'rec_other'},
+        )
+
+    def test_unknown_role_reaches_nobody(self):
+        self.assertEqual(self.allowed(self.unknown), set())
+
+    def test_search_is_a_scoped_prefix_match(self):
+        self.client.force_login(self.tpo)
+        response = self.client.get(reverse('student:recipient_search'), {'q': 'stu_'})
+        self.assertEqual([r['username'] for r in response.json()['results']], ['stu_applicant', 'stu_classmate'])
+        self.assertEqual([r['username'] for r in recipients.search(self.tpo, 'stu', limit=1)], ['stu_applicant'])
+        self.assertEqual(recipients.search(self.student, 'stu'), [])
+        self.assertEqual(recipients.search(self.student, '  '), [])
+
+    def test_form_rejects_recipient_outside_scope(self):
+        self.client.force_login(self.student)
+        response = self.client.post(
+            reverse('student:message_send'), {'recipient': 'rec_other', 'subject': 's', 'body': 'b'},
+        )
+        self.assertContains(response, "You can&#x27;t message that user.")
+        self.assertFalse(Message.objects.exists())
+
+
+class UnreachableBackend(LocmemBackend):
+    def open(self):
+        raise ConnectionRefusedError('SMTP server down')
+
+
+class RejectingBackend(LocmemBackend):
+    """Refuses mail to one address, like a server rejecting a recipient."""
+
+    def send_messages(self, messages):
+        if any('bounce@example.com' in message.to for message in messages):
+            raise smtplib.SMTPRecipientsRefused({'bounce@example.com': (550, b'no such user')})
+        return super().send_messages(messages)
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class EmailDigestTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.ada = User.objects.create_user('digest_ada', 'ada@example.com')
+        cls.bob = User.objects.create_user('digest_bob', 'bounce@example.com')
+
+    def notify(self, user, title):
+        return Notification.objects.create(user=user, title=title, message=f'{title} body', notification_type='reminder')
+
+    def test_pending_notifications_coalesce_into_one_email_per_user(self):
+        for n in range(3):
+            self.notify(self.ada, f'Update {n}')
+        self.notify(self.bob, 'Only one')
+        self.assertEqual(digests.send_digests(), (2, 0))
+        by_recipient = {message.to[0]: message for message in mail.outbox}
+        self.assertEqual(by_recipient['ada@example.com'].subject, '[CPMS] 3 new notifications')
+        self.assertIn('- Update 2\n  Update 2 body', by_recipient['ada@example.com'].body)
+        self.assertEqual(by_recipient['bounce@example.com'].subject, '[CPMS] Only one')
+        self.assertFalse(EmailDelivery.objects.exclude(status='sent').exists())
+        self.assertEqual(digests.send_digests(), (0, 0))
+
+    def test_batch_size_limits_users_per_run(self):
+        self.notify(self.ada, 'a')
+        self.notify(self.bob, 'b')
+        self.assertEqual(digests.send_digests(batch_size=1), (1, 0))
+        self.assertEqual(digests.send_digests(batch_size=1), (1, 0))
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_schedule_follows_frequency(self):
+        now = timezone.now()
+        DigestPreference.objects.create(user=self.ada, frequency='hourly', last_sent_at=now - timedelta(minutes=30))
+        DigestPreference.objects.create(user=self.bob, frequency='daily', last_sent_at=now - timedelta(hours=2))
+        self.notify(self.ada, 'a')
+        self.notify(self.bob, 'b')
+        self.assertEqual(digests.send_digests(now=now), (0, 0))
+        self.assertEqual(digests.send_digests(now=now + timedelta(minutes=31)), (1, 0))
+        self.assertEqual(mail.outbox[-1].to, ['ada@example.com'])
+        self.assertEqual(digests.send_digests(now=now + timedelta(hours=22)), (1, 0))
+        self.assertEqual(mail.outbox[-1].to, ['bounce@example.com'])
+
+    def test_opted_out_users_are_not_queued(self):
+        DigestPreference.objects.create(user=self.ada, frequency='off')
+        self.notify(self.ada, 'a')
+        self.notify(User.objects.create_user('no_email'), 'b')
+        self.assertFalse(EmailDelivery.objects.exists())
+
+    def test_unreachable_server_records_failure_for_the_batch(self):
+        self.notify(self.ada, 'a')
+        self.notify(self.bob, 'b')
+        self.assertEqual(digests.send_digests(connection=UnreachableBackend()), (0, 2))
+        for delivery in EmailDelivery.objects.all():
+            self.assertEqual((delivery.status, delivery.attempts), ('pending', 1))
+            self.assertEqual(delivery.error, 'ConnectionRefusedError: SMTP server down')
+        EmailDelivery.objects.update(attempts=digests.MAX_ATTEMPTS - 1)
+        digests.send_digests(connection=UnreachableBackend())
+        self.assertEqual(set(EmailDelivery.objects.values_list('status', flat=True)), {'failed'})
+        self.assertEqual(digests.send_digests(), (0, 0))
+
+    def test_rejected_recipient_does_not_stop_the_batch(self):
+        self.notify(self.ada, 'a')
+        self.notify(self.bob, 'b')
+        self.assertEqual(digests.send_digests(connection=RejectingBackend()), (1, 1))
+        self.assertEqual(EmailDelivery.objects.get(user=self.ada).status, 'sent')
+        failed = EmailDelivery.objects.get(user=self.bob)
+        self.assertEqual((failed.status, failed.attempts), ('pending', 1))
+        self.assertTrue(failed.error.startswith('SMTPRecipientsRefused'))
+
+
+class ReminderTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.now = timezone.now()
+        cls.user = User.objects.create_user('reminded')
+        student = StudentProfile.objects.create(user=cls.user)
+        recruiter = User.objects.create_user('reminder_recruiter')
+
+        def job(title, deadline):
+            return JobPosting.objects.create(
+                title=title, company_name='Acme', description='d', requirements='r',
+                posted_by=recruiter, application_deadline=deadline,
+            )
+
+        closing = job('Closing', cls.now + timedelta(hours=5))
+        SavedJob.objects.create(student=student, job=closing)
+        SavedJob.objects.create(student=student, job=job('Later', cls.now + timedelta(days=3)))
+        application = Application.objects.create(student=student, job=closing)
+        cls.interview = Interview.objects.create(
+            application=application, scheduled_at=cls.now + timedelta(hours=1), status='scheduled',
+        )
+        Certification.objects.create(student=student, name='AWS', issuer='Amazon', expiry_date=cls.now.date() + timedelta(days=10))
+        Certification.objects.create(student=student, name='GCP', issuer='Google', expiry_date=cls.now.date() + timedelta(days=90))
+
+    def test_each_due_item_fires_once(self):
+        self.assertEqual(
+            reminders.run_reminders(self.now),
+            {'saved_job_deadline': 1, 'interview_upcoming': 1, 'certification_expiry': 1},
+        )
+        interview_title = f"Interview at {timezone.localtime(self.interview.scheduled_at):%H:%M}: Acme"
+        self.assertEqual(
+            sorted(Notification.objects.filter(user=self.user).values_list('title', flat=True)),
+            ['Certification expiring: AWS', 'Closing soon: Closing', interview_title],
+        )
+
+    def test_second_run_sends_nothing(self):
+        reminders.run_reminders(self.now)
+        notifications = Notification.objects.count()
+        self.assertEqual(set(reminders.run_reminders(self.now + timedelta(minutes=1)).values()), {0})
+        self.assertEqual(Notification.objects.count(), notifications)
+        self.assertEqual(ReminderLog.objects.count(), 3)
+
+    def test_rescheduled_interview_is_reminded_again(self):
+        reminders.run_reminders(self.now)
+        Interview.objects.filter(pk=self.interview.pk).update(scheduled_at=self.now + timedelta(minutes=90))
+        self.assertEqual(reminders.run_reminders(self.now)['interview_upcoming'], 1)
+
+    def test_losing_a_race_sends_nothing(self):
+        reminder = reminders.UpcomingInterview()
+        ReminderLog.objects.create(kind=reminder.kind, object_id=self.interview.pk, due_at=self.interview.scheduled_at)
+        with mock.patch.object(reminder, 'pending', return_value=[self.interview]):
+            self.assertEqual(reminders.run_reminder(reminder, self.now), 0)
+        self.assertFalse(Notification.objects.filter(notification_type='interview').exists())
+
+
+class CalendarFeedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.student = User.objects.create_user('feed_student')
+        recruiter = User.objects.create_user('feed_recruiter')
+        job = JobPosting.objects.create(
+            title='Engineer', company_name='Acme', description='d', requirements='r', posted_by=recruiter,
+        )
+        profile = StudentProfile.objects.create(user=cls.student)
+        cls.application = Application.objects.create(student=profile, job=job)
+        cls.token = ical.get_or_create_feed(cls.student).token
+        cls.url = reverse('student:calendar_feed', args=[cls.token])
+
+    def setUp(self):
+        cache.clear()
+
+    def test_unchanged_feed_answers_304(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_polling_an_unchanged_feed_skips_the_database(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        # With the cached version gone (a cold worker), the row is read again.
+        cache.delete(ical._version_key(self.token))
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_interview_change_is_served_at_once(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Interview.objects.create(application=self.application, scheduled_at=timezone.now() + timedelta(days=2))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertContains(response, 'SUMMARY:Interview: Engineer (Acme)')
+
+    def test_unknown_token_is_404(self):
+        response = self.client.get(reverse('student:calendar_feed', args=['nope']))
+        self.assertEqual(response.status_code, 404)
+
+
+class SeedAndBenchmarkTests(TestCase):
+    """seed_data at a small scale, and bench_urls run over what it seeds."""
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command('seed_data', scale=0.001, stdout=io.StringIO())
+
+    def test_seed_counts_and_consistency(self):
+        self.assertEqual(StudentProfile.objects.filter(user__profile__role=Profile.Role.STUDENT).count(), 20)
+        self.assertEqual(User.objects.filter(profile__role=Profile.Role.RECRUITER, username__startswith='seed_').count(), 1)
+        self.assertEqual(JobPosting.objects.count(), 2)
+        # Every student applies to the same number of jobs, at most once each.
+        per_student = set(Application.objects.values('student').annotate(n=Count('pk')).values_list('n', flat=True))
+        self.assertEqual(per_student, {2})
+        self.assertEqual(Interview.objects.count(), Application.objects.filter(status='interview_scheduled').count())
+        self.assertEqual(Resume.objects.count(), 20)
+        self.assertFalse(Application.objects.filter(applied_at__gt=timezone.now()).exists())
+        self.assertFalse(Application.objects.filter(applied_at__lt=F('job__posted_at')).exists())
+        for thread in Thread.objects.all():
+            self.assertEqual(ThreadParticipant.objects.filter(thread=thread).count(), 2)
+            self.assertEqual(thread.last_message_at, thread.messages.order_by('-sent_at')[0].sent_at)
+        unread = ThreadParticipant.objects.aggregate(n=Sum('unread_count'))['n']
+        self.assertEqual(unread, Message.objects.filter(is_read=False).count())
+        self.assertTrue(self.client.login(username='seed_student_00001', password='seed-pass'))
+
+    def test_reseeding_needs_flush(self):
+        with self.assertRaises(CommandError):
+            call_command('seed_data', scale=0.001, stdout=io.StringIO())
+        call_command('seed_data', scale=0.001, seed=2, flush=True, stdout=io.StringIO())
+        self.assertEqual(User.objects.filter(username__startswith='seed_student_').count(), 20)
+
+    def test_bench_urls_reports_every_view_and_leaves_no_trace(self):
+        output = os.path.join(tempfile.mkdtemp(), 'bench.json')
+        self.addCleanup(shutil.rmtree, os.path.dirname(output))
+        stderr = io.StringIO()
+        call_command('bench_urls', requests=2, output=output, stdout=io.StringIO(), stderr=stderr)
+        with open(output) as f:
+            report = json.load(f)
+        self.assertEqual(report['dataset']['students'], 20)
+        self.assertIn('student:dashboard', report['views'])
+        self.assertIn('recruiter:api_jobs', report['views'])
+        for name, result in report['views'].items():
+            with self.subTest(view=name):
+                self.assertLess(result['status'], 400)
+                self.assertLessEqual(result['p50_ms'], result['p95_ms'])
+                self.assertLessEqual(result['p95_ms'], result['p99_ms'])
+        self.assertTrue(report['skipped'])
+        self.assertFalse(ApiToken.objects.exists())
+        call_command('bench_urls', requests=1, only='dashboard', compare=output, stdout=io.StringIO(), stderr=stderr)
+        self.assertIn('p95 before', stderr.getvalue())
+
+    def test_bench_urls_needs_the_seed_users(self):
+        with self.assertRaises(CommandError):
+            call_command('bench_urls', student='nobody', stdout=io.StringIO(), stderr=io.StringIO())
+
+
+class StudentQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Queries per student page; each must stay the same from 10 to 1,000 rows."""
+    namespace = 'student'
+    budgets = {
+        'student:dashboard': 14,
+        'student:profile': 6,
+        'student:skill_add': 2,
+        'student:certification_add': 2,
+        'student:resume_list': 4,
+        'student:resume_create': 3,
+        'student:resume_edit': 3,
+        'student:portfolio_list': 4,
+        'student:portfolio_add': 3,
+        'student:document_list': 4,
+        'student:document_upload': 3,
+        'student:job_search': 7,
+        'student:job_detail': 8,
+        'student:application_list': 5,
+        'student:application_detail': 6,
+        'student:saved_jobs': 5,
+        'student:interview_list': 6,
+        'student:calendar_feed': 2,
+        'student:message_list': 4,
+        'student:message_send': 3,
+        'student:recipient_search': 2,
+        'student:message_thread': 5,
+        'student:notification_list': 14,
+        'student:notification_archive': 4,
+        'student:digest_preference': 2,
+        'student:skill_gap_analysis': 4,
+        'student:practice_tests': 3,
+        'student:mock_interview_list': 4,
+        'student:mock_interview_request': 3,
+    }
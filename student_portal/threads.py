@@ -0,0 +1,149 @@
+"""
+Conversation threads for Message.
+
+Messages between the same two users on the same subject (ignoring "Re:"
+prefixes and case) share a Thread. Each participant has a ThreadParticipant
+row carrying the thread's last activity and their unread count, so the inbox
+is a single indexed query on (user, last_message_at) and a thread's messages
+are only loaded when it is opened. ``deliver`` keeps those rows current on
+send; ``rebuild`` recomputes them from the messages (used by the backfill).
+"""
+import hashlib
+import re
+
+from django.db.models import Count, F
+from django.utils import timezone
+
+from accounts.db import write_atomic
+
+from .models import Message, Thread, ThreadParticipant
+
+SNIPPET_LENGTH = 120
+_REPLY_PREFIX = re.compile(r"^\s*((re|fwd?)\s*:\s*)+", re.I)
+
+
+def normalize_subject(subject):
+    return " ".join(_REPLY_PREFIX.sub("", subject or "").split()).lower()
+
+
+def thread_key(user_a_id, user_b_id, subject):
+    low, high = sorted((user_a_id, user_b_id))
+    return hashlib.sha1(f"{low}:{high}:{normalize_subject(subject)}".encode()).hexdigest()
+
+
+def snippet(body):
+    text = " ".join((body or "").split())
+    return text if len(text) <= SNIPPET_LENGTH else text[:SNIPPET_LENGTH - 1] + "…"
+
+
+def _thread_for(sender_id, recipient_id, subject):
+    thread, _ = Thread.objects.get_or_create(
+        key=thread_key(sender_id, recipient_id, subject),
+        defaults={'subject': _REPLY_PREFIX.sub("", subject).strip() or subject},
+    )
+    for user_id in {sender_id, recipient_id}:
+        ThreadParticipant.objects.get_or_create(thread=thread, user_id=user_id)
+    return thread
+
+
+def deliver(message):
+    """Save an unsaved Message into its thread and update the inbox rows of both participants."""
+    with write_atomic():
+        if message.thread_id is None:
+            message.thread = _thread_for(message.sender_id, message.recipient_id, message.subject)
+        message.save()
+        Thread.objects.filter(pk=message.thread_id).update(
+            last_message_at=message.sent_at,
+            last_snippet=snippet(message.body),
+            last_sender_id=message.sender_id,
+        )
+        rows = ThreadParticipant.objects.filter(thread_id=message.thread_id)
+        rows.update(last_message_at=message.sent_at)
+        if message.recipient_id != message.sender_id:
+            rows.filter(user_id=message.recipient_id).update(unread_count=F('unread_count') + 1)
+    return message
+
+
+def reply(thread, sender, body):
+    """Send ``body`` to the other participant of ``thread``."""
+    recipient_id = (
+        thread.participants.exclude(user=sender).values_list('user_id', flat=True).first() or sender.pk
+    )
+    return deliver(Message(
+        thread=thread, sender=sender, recipient_id=recipient_id, subject=thread.subject, body=body,
+    ))
+
+
+def inbox(user):
+    """The user's threads, most recently active first."""
+    return (
+        ThreadParticipant.objects.filter(user=user, last_message_at__isnull=False)
+        .select_related('thread__last_sender')
+        .order_by('-last_message_at')
+    )
+
+
+def unread_total(user):
+    return ThreadParticipant.objects.filter(user=user, unread_count__gt=0).count()
+
+
+def mark_read(participant):
+    if not participant.unread_count:
+        return
+    now = timezone.now()
+    Message.objects.filter(thread_id=participant.thread_id, recipient_id=participant.user_id, is_read=False).update(
+        is_read=True
+    )
+    ThreadParticipant.objects.filter(pk=participant.pk).update(unread_count=0, last_read_at=now)
+    participant.unread_count = 0
+    participant.last_read_at = now
+
+
+def rebuild(thread_ids):
+    """Recompute thread summaries and participants' unread counts from their messages."""
+    for thread in Thread.objects.filter(pk__in=thread_ids):
+        last = thread.messages.order_by('-sent_at', '-pk').first()
+        if last is None:
+            continue
+        Thread.objects.filter(pk=thread.pk).update(
+            last_message_at=last.sent_at, last_snippet=snippet(last.body), last_sender_id=last.sender_id,
+        )
+        users = thread.messages.values_list('sender_id', 'recipient_id')
+        for user_id in {user_id for pair in users for user_id in pair}:
+            ThreadParticipant.objects.get_or_create(thread=thread, user_id=user_id)
+        unread = dict(
+            thread.messages.filter(is_read=False)
+            .exclude(recipient_id=F('sender_id'))
+            .order_by()
+            .values_list('recipient_id')
+            .annotate(n=Count('pk'))
+        )
+        for participant in thread.participants.all():
+            participant.last_message_at = last.sent_at
+            participant.unread_count = unread.get(participant.user_id, 0)
+            participant.save(update_fields=['last_message_at', 'unread_count'])
+
+
+def backfill(batch_size=1000):
+    """Attach unthreaded messages to threads by participant pair and subject; return how many."""
+    done = 0
+    while True:
+        batch = list(
+            Message.objects.filter(thread__isnull=True)
+            .order_by('sent_at', 'pk')
+            .only('pk', 'sender_id', 'recipient_id', 'subject')[:batch_size]
+        )
+        if not batch:
+            return done
+        touched = set()
+        with write_atomic():
+            threads = {}
+            for message in batch:
+                key = thread_key(message.sender_id, message.recipient_id, message.subject)
+                if key not in threads:
+                    threads[key] = _thread_for(message.sender_id, message.recipient_id, message.subject)
+                message.thread = threads[key]
+                touched.add(message.thread.pk)
+            Message.objects.bulk_update(batch, ['thread'])
+            rebuild(touched)
+        done += len(batch)
@@ -39,13 +39,19 @@ urlpatterns = [
     
     # Interviews
     path("interviews/", views.interview_list, name="interview_list"),
+    path("calendar/<str:token>.ics", views.calendar_feed, name="calendar_feed"),
     
     # Messages
     path("messages/", views.message_list, name="message_list"),
     path("messages/send/", views.message_send, name="message_send"),
+    path("messages/recipients/", views.recipient_search, name="recipient_search"),
+    path("messages/<int:pk>/", views.message_thread, name="message_thread"),
     
     # Notifications
     path("notifications/", views.notification_list, name="notification_list"),
+    path("notifications/archive/", views.notification_archive, name="notification_archive"),
+    path("notifications/digest/", views.digest_preference, name="digest_preference"),
+    path("events/", views.event_stream, name="event_stream"),
     
     # Skill Development
     path("skill-gap-analysis/", views.skill_gap_analysis, name="skill_gap_analysis"),
@@ -1,21 +1,31 @@
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.core.handlers.asgi import ASGIRequest
 from django.shortcuts import render, redirect, get_object_or_404
-from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.http import Http404, HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.db import IntegrityError
 from django.db.models import Q, Count
 from django.core.paginator import Paginator
+from django.urls import reverse
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.http import require_safe
 
+from accounts.db import write_atomic
 from accounts.models import Profile
+from accounts.replicas import read_replica
+from . import announcements, ical, intake, live, recipients, retention, threads
 from .models import (
     StudentProfile, Skill, Certification, Resume, PortfolioItem,
     Document, JobPosting, Application, SavedJob, Interview,
-    Message, Notification, SkillGapAnalysis, PracticeTest, MockInterview
+    Notification, NotificationArchive, SkillGapAnalysis, PracticeTest, MockInterview, ThreadParticipant,
+    DigestPreference
 )
 from .forms import (
     StudentProfileForm, SkillForm, CertificationForm, ResumeForm,
     PortfolioItemForm, DocumentForm, ApplicationForm, MessageForm,
-    MockInterviewForm, JobSearchForm
+    MessageReplyForm, MockInterviewForm, JobSearchForm, DigestPreferenceForm
 )
 
 
@@ -53,7 +63,7 @@ def dashboard(request: HttpRequest) -> HttpResponse:
     ).select_related('application__job')[:5]
     
     # Recent notifications
-    recent_notifications = Notification.objects.filter(user=request.user, is_read=False)[:5]
+    recent_notifications = announcements.notification_feed(request.user, unread_only=True)[:5]
     
     context = {
         'student': student,
@@ -87,7 +97,7 @@ def profile_view(request: HttpRequest) -> HttpResponse:
     context = {
         'student': student,
         'form': form,
-        'skills': student.skills.all(),
+        'skills': student.skills.select_related('canonical'),
         'certifications': student.certifications.all(),
     }
     return render(request, "student_portal/profile.html", context)
@@ -221,6 +231,7 @@ def portfolio_add(request: HttpRequest) -> HttpResponse:
             item = form.save(commit=False)
             item.student = student
             item.save()
+            form.save_m2m()
             messages.success(request, "Portfolio item added successfully!")
             return redirect('student:portfolio_list')
     else:
@@ -279,12 +290,13 @@ def document_delete(request: HttpRequest, pk: int) -> HttpResponse:
 # ========== JOB SEARCH & APPLICATIONS ==========
 
 @login_required
+@read_replica
 def job_search(request: HttpRequest) -> HttpResponse:
     """Browse and search jobs"""
     student = get_student_profile(request.user)
     form = JobSearchForm(request.GET)
     
-    jobs = JobPosting.objects.filter(is_active=True)
+    jobs = JobPosting.objects.open()
     
     if form.is_valid():
         search = form.cleaned_data.get('search')
@@ -321,6 +333,20 @@ def job_search(request: HttpRequest) -> HttpResponse:
     return render(request, "student_portal/job_search.html", context)
 
 
+def _lock_open_job(job):
+    """Re-check (and lock, where supported) that the job still accepts applications. Call inside write_atomic()."""
+    return JobPosting.objects.select_for_update().open().filter(pk=job.pk).exists()
+
+
+def _application_received(request, job):
+    """Acknowledge an apply taken by the surge-mode intake log (see intake.py)."""
+    messages.success(
+        request,
+        f"Your application for {job.title} has been received. You will get a notification once it is submitted.",
+    )
+    return redirect('student:job_detail', pk=job.pk)
+
+
 @login_required
 def job_detail(request: HttpRequest, pk: int) -> HttpResponse:
     """View job details"""
@@ -338,6 +364,8 @@ def job_detail(request: HttpRequest, pk: int) -> HttpResponse:
         if 'apply' in request.POST:
             if application:
                 messages.warning(request, "You have already applied for this job.")
+            elif not job.is_open:
+                messages.error(request, "The application deadline for this job has passed.")
             elif not student.placement_eligible:
                 messages.error(request, "You are not marked as placement-eligible. Contact the placement cell.")
             elif job.min_cgpa is not None and (student.cgpa is None or student.cgpa < job.min_cgpa):
@@ -361,34 +389,70 @@ def job_detail(request: HttpRequest, pk: int) -> HttpResponse:
                         )
                     elif uploaded_file.size > 5 * 1024 * 1024:  # 5MB
                         messages.error(request, "File is too large. Maximum size is 5 MB.")
-                    else:
-                        title = f"Resume for {job.title[:100]}"
-                        new_resume = Resume.objects.create(
-                            student=student,
-                            title=title,
-                            content="",
-                            file=uploaded_file,
-                            is_default=False,
+                    elif intake.surge_active(job):
+                        intake.append(
+                            student, job,
+                            cover_letter=request.POST.get('cover_letter', ''),
+                            resume_file=intake.save_upload(uploaded_file),
                         )
-                        cover_letter = request.POST.get('cover_letter', '')
-                        app = Application.objects.create(
-                            student=student,
-                            job=job,
-                            resume=new_resume,
-                            cover_letter=cover_letter,
-                        )
-                        messages.success(request, "Application submitted successfully with uploaded resume!")
-                        return redirect('student:application_detail', pk=app.pk)
+                        return _application_received(request, job)
+                    else:
+                        new_resume = None
+                        try:
+                            with write_atomic():
+                                if not _lock_open_job(job):
+                                    raise JobPosting.DoesNotExist
+                                title = f"Resume for {job.title[:100]}"
+                                new_resume = Resume.objects.create(
+                                    student=student,
+                                    title=title,
+                                    content="",
+                                    file=uploaded_file,
+                                    is_default=False,
+                                )
+                                cover_letter = request.POST.get('cover_letter', '')
+                                app = Application.objects.create(
+                                    student=student,
+                                    job=job,
+                                    resume=new_resume,
+                                    cover_letter=cover_letter,
+                                )
+                        except JobPosting.DoesNotExist:
+                            messages.error(request, "The application deadline for this job has passed.")
+                        except IntegrityError:
+                            # The Resume row was rolled back, but its file had already been stored.
+                            if new_resume is not None:
+                                new_resume.file.delete(save=False)
+                            messages.warning(request, "You have already applied for this job.")
+                        else:
+                            messages.success(request, "Application submitted successfully with uploaded resume!")
+                            return redirect('student:application_detail', pk=app.pk)
                 else:
-                    app_form = ApplicationForm(request.POST)
+                    app_form = ApplicationForm(request.POST, student=student)
                     if app_form.is_valid():
+                        if intake.surge_active(job):
+                            intake.append(
+                                student, job,
+                                resume=app_form.cleaned_data['resume'],
+                                cover_letter=app_form.cleaned_data['cover_letter'],
+                            )
+                            return _application_received(request, job)
                         app = app_form.save(commit=False)
                         app.student = student
                         app.job = job
-                        app.save()
-                        messages.success(request, "Application submitted successfully!")
-                        return redirect('student:application_detail', pk=app.pk)
-                    if not application:  # only show form errors when we didn't just try file upload
+                        try:
+                            with write_atomic():
+                                if not _lock_open_job(job):
+                                    raise JobPosting.DoesNotExist
+                                app.save()
+                        except JobPosting.DoesNotExist:
+                            messages.error(request, "The application deadline for this job has passed.")
+                        except IntegrityError:
+                            messages.warning(request, "You have already applied for this job.")
+                        else:
+                            messages.success(request, "Application submitted successfully!")
+                            return redirect('student:application_detail', pk=app.pk)
+                    elif not application:  # only show form errors when we didn't just try file upload
                         messages.error(request, "Please select a resume or upload a new one.")
         elif 'save' in request.POST:
             SavedJob.objects.get_or_create(student=student, job=job)
@@ -399,11 +463,12 @@ def job_detail(request: HttpRequest, pk: int) -> HttpResponse:
             messages.success(request, "Job removed from saved!")
             return redirect('student:job_detail', pk=pk)
     
-    app_form = ApplicationForm(initial={'resume': resumes.filter(is_default=True).first()})
+    app_form = ApplicationForm(student=student, initial={'resume': resumes.filter(is_default=True).first()})
     
-    # Eligibility for applying: placement_eligible and CGPA if job has min_cgpa
+    # Eligibility for applying: open for applications, placement_eligible and CGPA if job has min_cgpa
     can_apply = (
-        student.placement_eligible
+        job.is_open
+        and student.placement_eligible
         and (job.min_cgpa is None or (student.cgpa is not None and student.cgpa >= job.min_cgpa))
     )
     
@@ -476,61 +541,169 @@ def interview_list(request: HttpRequest) -> HttpResponse:
         application__student=student
     ).select_related('application__job').order_by('scheduled_at')
     
+    feed = ical.get_or_create_feed(request.user)
+    
     context = {
         'upcoming': interviews.filter(status='scheduled', scheduled_at__gte=timezone.now()),
         'past': interviews.exclude(status='scheduled'),
+        'calendar_feed_url': request.build_absolute_uri(reverse('student:calendar_feed', args=[feed.token])),
     }
     return render(request, "student_portal/interview_list.html", context)
 
 
+@require_safe
+def calendar_feed(request: HttpRequest, token: str) -> HttpResponse:
+    """iCalendar subscription feed (token-authenticated, shared by students and recruiters)"""
+    entry = ical.get_feed(token)
+    if entry is None:
+        raise Http404("Unknown calendar feed")
+    etag, body = entry
+    
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(body, content_type='text/calendar; charset=utf-8')
+        response['Content-Disposition'] = 'inline; filename="interviews.ics"'
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
 # ========== MESSAGES ==========
 
 @login_required
 def message_list(request: HttpRequest) -> HttpResponse:
-    """List messages"""
-    messages_list = Message.objects.filter(
-        Q(sender=request.user) | Q(recipient=request.user)
-    ).select_related('sender', 'recipient').order_by('-sent_at')
-    
-    paginator = Paginator(messages_list, 20)
+    """Inbox: one row per conversation thread, most recent first"""
+    paginator = Paginator(threads.inbox(request.user), 20)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
     return render(request, "student_portal/message_list.html", {'page_obj': page_obj})
 
 
+@login_required
+def message_thread(request: HttpRequest, pk: int) -> HttpResponse:
+    """Show one conversation and reply to it"""
+    participant = get_object_or_404(
+        ThreadParticipant.objects.select_related('thread'), thread_id=pk, user=request.user
+    )
+    thread = participant.thread
+    if request.method == 'POST':
+        form = MessageReplyForm(request.POST)
+        if form.is_valid():
+            threads.reply(thread, request.user, form.cleaned_data['body'])
+            messages.success(request, "Reply sent.")
+            return redirect('student:message_thread', pk=pk)
+    else:
+        form = MessageReplyForm()
+    threads.mark_read(participant)
+    
+    # Newest page by default; older messages are loaded on demand.
+    paginator = Paginator(thread.messages.select_related('sender').order_by('sent_at', 'pk'), 50)
+    page_obj = paginator.get_page(request.GET.get('page', paginator.num_pages))
+    
+    return render(request, "student_portal/message_thread.html", {
+        'thread': thread,
+        'page_obj': page_obj,
+        'form': form,
+    })
+
+
 @login_required
 def message_send(request: HttpRequest) -> HttpResponse:
     """Send a message"""
     if request.method == 'POST':
-        form = MessageForm(request.POST)
+        form = MessageForm(request.POST, user=request.user)
         if form.is_valid():
             message = form.save(commit=False)
             message.sender = request.user
-            message.save()
+            threads.deliver(message)
             messages.success(request, "Message sent successfully!")
-            return redirect('student:message_list')
+            return redirect('student:message_thread', pk=message.thread_id)
     else:
-        form = MessageForm()
+        form = MessageForm(user=request.user, initial={'recipient': request.GET.get('to', '')})
     
     return render(request, "student_portal/message_form.html", {'form': form})
 
 
+@login_required
+@require_safe
+def recipient_search(request: HttpRequest) -> JsonResponse:
+    """Usernames the current user may message, matching the typed prefix (max 20)"""
+    results = [
+        {
+            'username': row['username'],
+            'name': f"{row['first_name']} {row['last_name']}".strip(),
+            'role': row['profile__role'],
+        }
+        for row in recipients.search(request.user, request.GET.get('q', ''))
+    ]
+    return JsonResponse({'results': results})
+
+
 # ========== NOTIFICATIONS ==========
 
+async def event_stream(request: HttpRequest) -> HttpResponse:
+    """Server-Sent Events stream of new notifications/messages and unread counts"""
+    if not settings.LIVE_UPDATES or not isinstance(request, ASGIRequest):
+        # Under WSGI the endless stream would hold a worker; 204 tells EventSource not to reconnect.
+        return HttpResponse(status=204)
+    user = await request.auser()
+    if not user.is_authenticated:
+        return HttpResponse(status=401)
+    return StreamingHttpResponse(
+        live.stream(user.pk),
+        content_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
 @login_required
 def notification_list(request: HttpRequest) -> HttpResponse:
-    """List notifications"""
-    notifications = Notification.objects.filter(user=request.user)
+    """List notifications, with announcements addressed to the user merged in"""
+    paginator = Paginator(announcements.notification_feed(request.user), 20)
+    page_number = request.GET.get('page')
+    page_obj = paginator.get_page(page_number)
+    page_obj.object_list = list(page_obj.object_list)
+    
+    # Mark as read once the page has been fetched, so it still shows what was new.
+    # Only up to the newest item rendered: anything arriving meanwhile stays unread.
+    newest = {False: 0, True: 0}
+    for item in page_obj.object_list:
+        newest[item['announcement']] = max(newest[item['announcement']], item['id'])
+    Notification.objects.filter(user=request.user, is_read=False, pk__lte=newest[False]).update(is_read=True)
+    announcements.mark_read(request.user, newest[True])
     
-    # Mark as read
-    Notification.objects.filter(user=request.user, is_read=False).update(is_read=True)
+    digest_form = DigestPreferenceForm(instance=DigestPreference.objects.filter(user=request.user).first())
     
-    paginator = Paginator(notifications, 20)
+    return render(request, "student_portal/notification_list.html", {
+        'page_obj': page_obj,
+        'digest_form': digest_form,
+    })
+
+
+@login_required
+def digest_preference(request: HttpRequest) -> HttpResponse:
+    """Choose how often notifications are emailed"""
+    if request.method == 'POST':
+        preference, _ = DigestPreference.objects.get_or_create(user=request.user)
+        form = DigestPreferenceForm(request.POST, instance=preference)
+        if form.is_valid():
+            form.save()
+            messages.success(request, "Email digest preference saved.")
+    return redirect('student:notification_list')
+
+
+@login_required
+def notification_archive(request: HttpRequest) -> HttpResponse:
+    """Browse notifications moved out of the live list by the retention job"""
+    paginator = Paginator(NotificationArchive.objects.filter(user=request.user), 50)
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
-    return render(request, "student_portal/notification_list.html", {'page_obj': page_obj})
+    return render(request, "student_portal/notification_archive.html", {
+        'page_obj': page_obj,
+        'retention_days': retention.RETENTION_DAYS,
+    })
 
 
 # ========== SKILL DEVELOPMENT ==========
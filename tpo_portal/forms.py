@@ -3,7 +3,9 @@ Forms for TPO Portal: student eligibility, application status, interview schedul
 """
 from django import forms
 
-from student_portal.models import StudentProfile, Application, Interview
+from student_portal import skills
+from student_portal.models import Announcement, StudentProfile, Application, Interview
+from student_portal.talent_pool import TalentQuery
 
 
 class StudentEligibilityForm(forms.ModelForm):
@@ -37,3 +39,80 @@ class InterviewScheduleForm(forms.ModelForm):
             "notes": forms.Textarea(attrs={"class": "form-control", "rows": 3}),
             "status": forms.Select(attrs={"class": "form-select"}),
         }
+
+
+class AnnouncementForm(forms.ModelForm):
+    """Broadcast to everyone, or narrow the audience by role, branch and graduation year."""
+
+    class Meta:
+        model = Announcement
+        fields = ["title", "message", "role", "branch", "graduation_year"]
+        labels = {"role": "Audience role"}
+        widgets = {
+            "title": forms.TextInput(attrs={"class": "form-control"}),
+            "message": forms.Textarea(attrs={"class": "form-control", "rows": 4}),
+            "role": forms.Select(attrs={"class": "form-select"}),
+            "branch": forms.TextInput(attrs={"class": "form-control", "placeholder": "All branches"}),
+            "graduation_year": forms.NumberInput(attrs={"class": "form-control", "placeholder": "All years"}),
+        }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["role"].choices = [("", "Everyone")] + [
+            choice for choice in self.fields["role"].choices if choice[0] and choice[0] != "unknown"
+        ]
+
+
+def _split(value):
+    return [part.strip() for part in (value or "").split(",") if part.strip()]
+
+
+class TalentPoolSearchForm(forms.Form):
+    """Boolean talent-pool filters; comma-separated lists mean OR, except skills which mean AND."""
+
+    branches = forms.CharField(
+        required=False,
+        widget=forms.TextInput(attrs={"class": "form-control", "placeholder": "Branches, e.g. CSE, IT"}),
+    )
+    years = forms.CharField(
+        required=False,
+        widget=forms.TextInput(attrs={"class": "form-control", "placeholder": "Years, e.g. 4th"}),
+    )
+    graduation_year = forms.IntegerField(
+        required=False,
+        widget=forms.NumberInput(attrs={"class": "form-control", "placeholder": "Graduation year"}),
+    )
+    skills = forms.CharField(
+        required=False,
+        widget=forms.TextInput(attrs={"class": "form-control", "placeholder": "Skills (all required), e.g. Python, SQL"}),
+    )
+    min_cgpa = forms.DecimalField(
+        required=False,
+        max_digits=4,
+        decimal_places=2,
+        min_value=0,
+        max_value=10,
+        widget=forms.NumberInput(attrs={"class": "form-control", "step": "0.01", "placeholder": "Min CGPA"}),
+    )
+    eligible_only = forms.BooleanField(required=False, widget=forms.CheckboxInput(attrs={"class": "form-check-input"}))
+    exclude_placed = forms.BooleanField(required=False, widget=forms.CheckboxInput(attrs={"class": "form-check-input"}))
+
+    def clean_skills(self):
+        names = _split(self.cleaned_data.get("skills"))
+        resolved = skills.resolve_many(names, create=False)
+        missing = [name for name in names if skills.skill_key(name) not in resolved]
+        if missing:
+            raise forms.ValidationError(f"Unknown skill(s): {', '.join(missing)}")
+        return [skill.pk for skill in resolved.values()]
+
+    def to_query(self):
+        data = self.cleaned_data
+        return TalentQuery(
+            branches=_split(data.get("branches")),
+            years=_split(data.get("years")),
+            graduation_years=[data["graduation_year"]] if data.get("graduation_year") else [],
+            skill_ids=data.get("skills") or [],
+            min_cgpa=data.get("min_cgpa"),
+            eligible_only=data.get("eligible_only", False),
+            exclude_placed=data.get("exclude_placed", False),
+        )
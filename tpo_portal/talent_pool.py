@@ -0,0 +1,27 @@
+"""
+Talent-pool search page context, shared by the TPO and recruiter portals.
+
+The search itself runs against the in-memory bitmap index in
+student_portal.talent_pool; this module only turns GET filters into a
+TalentQuery and a page of results.
+"""
+from django.http import HttpRequest
+
+from student_portal import talent_pool
+
+from .forms import TalentPoolSearchForm
+
+
+def talent_pool_context(request: HttpRequest) -> dict:
+    """Run the talent-pool search for the GET filters."""
+    form = TalentPoolSearchForm(request.GET or None)
+    results = None
+    if form.is_bound and form.is_valid():
+        try:
+            page = max(int(request.GET.get("page", 1)), 1)
+        except ValueError:
+            page = 1
+        results = talent_pool.search(form.to_query(), page=page)
+    query_string = request.GET.copy()
+    query_string.pop("page", None)
+    return {"form": form, "results": results, "query_string": query_string.urlencode()}
@@ -1,3 +1,117 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.urls import reverse
+
+from accounts.models import Profile
+from accounts.testing import QueryBudgetMixin
+from student_portal import skills, talent_pool
+from student_portal.models import Application, JobPosting, Skill, StudentProfile
+from student_portal.talent_pool import TalentQuery, iter_ids
+
+
+class TalentPoolTests(TestCase):
+    """Bitmap filters, and the signals that keep the process-wide index current."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.python = skills.resolve("python")
+        cls.sql = skills.resolve("sql")
+
+        def student(username, skill_list=(), **fields):
+            profile = StudentProfile.objects.create(user=User.objects.create_user(username), **fields)
+            for skill in skill_list:
+                Skill.objects.create(student=profile, name=skill.name, canonical=skill)
+            return profile
+
+        cls.ada = student("ada", [cls.python, cls.sql], branch="CSE", year="4th", cgpa=Decimal("9.10"), graduation_year=2026)
+        cls.bob = student("bob", [cls.python], branch="ece", year="4th", cgpa=Decimal("7.50"), graduation_year=2026)
+        cls.cy = student("cy", [cls.sql], branch="IT", year="3rd", cgpa=Decimal("8.00"), placement_eligible=False)
+        cls.dee = student("dee", branch="CSE", year="3rd", graduation_year=2027)
+        recruiter = User.objects.create_user("pool_recruiter")
+        cls.job = JobPosting.objects.create(
+            title="Engineer", company_name="Acme", description="d", requirements="r", posted_by=recruiter,
+        )
+
+    def setUp(self):
+        talent_pool.index.rebuild()
+        self.addCleanup(setattr, talent_pool.index, "built_at", None)
+
+    def ids(self, **filters):
+        return set(iter_ids(talent_pool.index.query(TalentQuery(**filters))))
+
+    def test_no_filters_match_everyone(self):
+        self.assertEqual(self.ids(), {self.ada.pk, self.bob.pk, self.cy.pk, self.dee.pk})
+
+    def test_branches_are_or_and_case_insensitive(self):
+        self.assertEqual(self.ids(branches=["cse", "ECE"]), {self.ada.pk, self.bob.pk, self.dee.pk})
+
+    def test_skills_are_and(self):
+        self.assertEqual(self.ids(skill_ids=[self.python.pk]), {self.ada.pk, self.bob.pk})
+        self.assertEqual(self.ids(skill_ids=[self.python.pk, self.sql.pk]), {self.ada.pk})
+
+    def test_facets_combine_with_and(self):
+        self.assertEqual(self.ids(years=["4th"], min_cgpa=Decimal("8.00")), {self.ada.pk})
+        self.assertEqual(self.ids(min_cgpa=Decimal("8.00")), {self.ada.pk, self.cy.pk})
+        self.assertEqual(self.ids(graduation_years=[2027]), {self.dee.pk})
+        self.assertEqual(self.ids(skill_ids=[self.sql.pk], eligible_only=True), {self.ada.pk})
+
+    def test_facet_counts(self):
+        result = talent_pool.search(TalentQuery(years=["4th", "3rd"]))
+        self.assertEqual(result["total"], 4)
+        self.assertEqual(dict(result["branch_counts"]), {"CSE": 2, "ECE": 1, "IT": 1})
+        self.assertEqual([s.pk for s in result["students"]], sorted([self.ada.pk, self.bob.pk, self.cy.pk, self.dee.pk]))
+
+    def test_profile_and_skill_changes_patch_the_index(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dee.branch = "IT"
+            self.dee.save()
+            Skill.objects.create(student=self.dee, name="py", canonical=self.python)
+        self.assertEqual(self.ids(branches=["IT"], skill_ids=[self.python.pk]), {self.dee.pk})
+        with self.captureOnCommitCallbacks(execute=True):
+            Skill.objects.filter(student=self.ada, canonical=self.sql).get().delete()
+        self.assertEqual(self.ids(skill_ids=[self.sql.pk]), {self.cy.pk})
+
+    def test_accepted_offer_and_its_removal_patch_the_index(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            application = Application.objects.create(student=self.bob, job=self.job, status="accepted")
+        self.assertNotIn(self.bob.pk, self.ids(exclude_placed=True))
+        with self.captureOnCommitCallbacks(execute=True):
+            application.delete()
+        self.assertIn(self.bob.pk, self.ids(exclude_placed=True))
+
+    def test_deleted_student_leaves_the_index(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cy.delete()
+        self.assertEqual(self.ids(branches=["IT"]), set())
+        self.assertNotIn(self.cy.pk, self.ids())
+
+    def test_search_pages_share_the_context(self):
+        for namespace, role in (("tpo", Profile.Role.TPO), ("recruiter", Profile.Role.RECRUITER)):
+            user = User.objects.create_user(f"{namespace}_searcher")
+            Profile.objects.filter(user=user).update(role=role)
+            self.client.force_login(user)
+            response = self.client.get(reverse(f"{namespace}:talent_pool"), {"skills": "Python, SQL"})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([s.pk for s in response.context["results"]["students"]], [self.ada.pk])
+            response = self.client.get(reverse(f"{namespace}:talent_pool"), {"skills": "Cobol"})
+            self.assertIsNone(response.context["results"])
+            self.assertFormError(response.context["form"], "skills", "Unknown skill(s): Cobol")
+
 
-# Create your tests here.
+class TpoQueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Queries per TPO page; each must stay the same from 10 to 1,000 rows."""
+    namespace = "tpo"
+    budgets = {
+        "tpo:dashboard": 11,
+        "tpo:student_list": 7,
+        "tpo:student_detail": 6,
+        "tpo:talent_pool": 3,
+        "tpo:application_list": 5,
+        "tpo:application_detail": 10,
+        "tpo:job_list": 5,
+        "tpo:announcement_list": 5,
+        "tpo:reports": 12,
+        "tpo:report_placement_pdf": 9,
+    }
@@ -8,9 +8,11 @@ urlpatterns = [
     path("", views.dashboard, name="dashboard"),
     path("students/", views.student_list, name="student_list"),
     path("students/<int:pk>/", views.student_detail, name="student_detail"),
+    path("talent-pool/", views.talent_pool_search, name="talent_pool"),
     path("applications/", views.application_list, name="application_list"),
     path("applications/<int:pk>/", views.application_detail, name="application_detail"),
     path("jobs/", views.job_list, name="job_list"),
+    path("announcements/", views.announcement_list, name="announcement_list"),
     path("reports/", views.reports, name="reports"),
     path("reports/placement-pdf/", views.report_placement_pdf, name="report_placement_pdf"),
 ]
@@ -9,15 +9,24 @@ from django.db.models import Q
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 
+from accounts.db import write_atomic
 from accounts.models import Profile
+from accounts.replicas import read_replica
 from student_portal.models import (
+    Announcement,
     StudentProfile,
     JobPosting,
     Application,
     Interview,
 )
 
-from .forms import ApplicationStatusForm, InterviewScheduleForm, StudentEligibilityForm
+from .forms import (
+    AnnouncementForm,
+    ApplicationStatusForm,
+    InterviewScheduleForm,
+    StudentEligibilityForm,
+)
+from .talent_pool import talent_pool_context
 
 
 def _tpo_required(view_func):
@@ -31,6 +40,7 @@ def _tpo_required(view_func):
 
 @login_required
 @_tpo_required
+@read_replica
 def dashboard(request: HttpRequest) -> HttpResponse:
     """Dashboard with real stats: students, recruiters, jobs, applications."""
     from django.contrib.auth import get_user_model
@@ -125,6 +135,13 @@ def student_detail(request: HttpRequest, pk: int) -> HttpResponse:
     return render(request, "tpo_portal/student_detail.html", context)
 
 
+@login_required
+@_tpo_required
+def talent_pool_search(request: HttpRequest) -> HttpResponse:
+    """Boolean search over all students (branch, year, skills, CGPA, eligibility, placement)."""
+    return render(request, "tpo_portal/talent_pool.html", talent_pool_context(request))
+
+
 @login_required
 @_tpo_required
 def application_list(request: HttpRequest) -> HttpResponse:
@@ -141,6 +158,7 @@ def application_list(request: HttpRequest) -> HttpResponse:
 
 @login_required
 @_tpo_required
+@write_atomic()
 def application_detail(request: HttpRequest, pk: int) -> HttpResponse:
     """View application and update status / schedule interview (TPO can do for any application)."""
     application = get_object_or_404(Application, pk=pk)
@@ -203,6 +221,27 @@ def job_list(request: HttpRequest) -> HttpResponse:
 
 @login_required
 @_tpo_required
+def announcement_list(request: HttpRequest) -> HttpResponse:
+    """Post a campus announcement and list previous ones."""
+    if request.method == "POST":
+        form = AnnouncementForm(request.POST)
+        if form.is_valid():
+            announcement = form.save(commit=False)
+            announcement.created_by = request.user
+            announcement.save()
+            messages.success(request, "Announcement published.")
+            return redirect("tpo:announcement_list")
+        messages.error(request, "Please correct the errors below.")
+    else:
+        form = AnnouncementForm()
+    paginator = Paginator(Announcement.objects.select_related("created_by"), 20)
+    page_obj = paginator.get_page(request.GET.get("page"))
+    return render(request, "tpo_portal/announcement_list.html", {"form": form, "page_obj": page_obj})
+
+
+@login_required
+@_tpo_required
+@read_replica
 def reports(request: HttpRequest) -> HttpResponse:
     """Reports and analytics dashboard."""
     from django.db.models import Count
@@ -253,6 +292,7 @@ def reports(request: HttpRequest) -> HttpResponse:
 
 @login_required
 @_tpo_required
+@read_replica
 def report_placement_pdf(request: HttpRequest) -> HttpResponse:
     """Placement report as HTML for print/PDF (Save as PDF from browser)."""
     from django.db.models import Count